@@ -0,0 +1,72 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+# Scaling of compile_files with the number of files and of worker processes: a batch of generated programs, spread
+# over folders with sources of the same name, is compiled through the semantic step (which writes the .ic files)
+# with a shared output path, once for each number of files and of jobs. The time per file should stay flat as the
+# batch grows, and the time of a batch should fall with the jobs up to the number of cpus.
+#     python -m benchmarks.benchmark_batch_compiler [files] [jobs]
+
+from components.batch_compiler import compile_files
+
+import os
+import sys
+import tempfile
+import time
+
+_FOLDERS_ = 4
+_STATEMENTS_ = 40
+
+
+def _program(index):
+    statements = ["  v{0} := v{1} * {2} + {3}".format(i % 3 + 1, (i + 1) % 3 + 1, index + 1, i)
+                  for i in range(_STATEMENTS_)]
+    return "PROGRAM p{0};\nVAR v1, v2, v3 : INTEGER;\nBEGIN\n{1}\nEND.\n".format(index, ";\n".join(statements))
+
+
+def _sources(directory, files):
+    """
+    writes files programs in _FOLDERS_ folders, named the same in every folder, and returns their file names.
+    """
+    file_names = []
+    for index in range(files):
+        folder = os.path.join(directory, "folder{0}".format(index % _FOLDERS_))
+        os.makedirs(folder, exist_ok=True)
+        file_name = os.path.join(folder, "program{0}.pas".format(index // _FOLDERS_))
+        with open(file_name, "w") as file:
+            file.write(_program(index))
+        file_names.append(file_name)
+    return file_names
+
+
+def _batch_time(file_names, jobs):
+    with tempfile.TemporaryDirectory() as output_path:
+        start = time.perf_counter()
+        results = list(compile_files(file_names, jobs=jobs, steps="SEMANTIC", output_path=output_path))
+        seconds = time.perf_counter() - start
+        artefacts = {i.artefacts["ic"] for i in results}
+    assert all(i.succeeded for i in results), [i.diagnostics["ERROR"] for i in results if not i.succeeded]
+    assert len(artefacts) == len(file_names), "artefacts were overwritten"
+    return seconds
+
+
+def main(files=64, jobs=None):
+    jobs = jobs or os.cpu_count() or 1
+    print("{0} cpus".format(os.cpu_count()))
+    print("{0:>8} {1:>6} {2:>10} {3:>12}".format("files", "jobs", "seconds", "ms per file"))
+    with tempfile.TemporaryDirectory() as directory:
+        file_names = _sources(directory, files)
+        sizes = sorted({max(1, files // 4), max(1, files // 2), files})
+        job_counts = sorted({1, max(1, jobs // 2), jobs})
+        for size in sizes:
+            for job_count in job_counts:
+                seconds = _batch_time(file_names[:size], job_count)
+                print("{0:8} {1:6} {2:10.3f} {3:12.1f}".format(size, job_count, seconds, seconds / size * 1000))
+
+
+if __name__ == "__main__":
+    main(*[int(i) for i in sys.argv[1:3]])
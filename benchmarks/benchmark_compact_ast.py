@@ -0,0 +1,86 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+# Memory held by the AST and time to walk it, lark Tree/Token against the compact nodes.
+#     python -m benchmarks.benchmark_compact_ast [lines]
+
+from components.deft_pascal_parser_3 import DeftPascalParser, Tree
+from components.compact_ast import Node, lower
+
+import gc
+import sys
+import time
+import tracemalloc
+
+_PROCEDURE_ = """PROCEDURE p{0};
+VAR x : INTEGER;
+BEGIN
+  x := {0} + v1;
+  IF x > 2 THEN v1 := x ELSE v1 := 0;
+  FOR x := 1 TO 10 DO v1 := v1 + x;
+  WHILE v1 > 100 DO v1 := v1 - 1;
+  v2 := v1 * 2
+END;
+"""
+
+
+def generate_program(lines):
+    procedures = [_PROCEDURE_.format(i) for i in range(max(lines // _PROCEDURE_.count("\n"), 1))]
+    return "PROGRAM benchmark;\nVAR v1 : INTEGER;\n    v2 : INTEGER;\n{0}BEGIN\n  p0\nEND.\n".format("".join(procedures))
+
+
+def _walk(ast, tree_class):
+    count = 0
+    pending = [ast]
+    while pending:
+        node = pending.pop()
+        count += 1
+        if isinstance(node, tree_class):
+            pending.extend(node.children)
+    return count
+
+
+def _measure_walk(ast, tree_class, repetitions):
+    timings = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        count = _walk(ast, tree_class)
+        timings.append(time.perf_counter() - start)
+    return count, min(timings)
+
+
+def main(lines=50000, repetitions=3):
+    program = generate_program(lines)
+    parser = DeftPascalParser()
+
+    tracemalloc.start()
+    ast, error_list = parser.parse_tree(program)
+    assert not error_list, error_list
+    gc.collect()
+    lark_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    lark_count, lark_walk = _measure_walk(ast, Tree, repetitions)
+
+    # only what is allocated from here on is traced, that is the compact tree and the lowering itself
+    tracemalloc.start()
+    compact_ast = lower(ast)
+    compact_memory, lowering_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    lower(ast)
+    lowering_time = time.perf_counter() - start
+    compact_count, compact_walk = _measure_walk(compact_ast, Node, repetitions)
+    assert lark_count == compact_count
+
+    print("program: {0} lines, {1} tree nodes and tokens".format(program.count("\n"), compact_count))
+    print("{0:<24} {1:>10.1f} MB   walk {2:8.4f}s".format("lark Tree/Token", lark_memory / 2 ** 20, lark_walk))
+    print("{0:<24} {1:>10.1f} MB   walk {2:8.4f}s".format("compact Node/Leaf", compact_memory / 2 ** 20, compact_walk))
+    print("lowering: {0:.4f}s, {1:.1f} MB at peak".format(lowering_time, lowering_peak / 2 ** 20))
+
+
+if __name__ == "__main__":
+    main(*[int(i) for i in sys.argv[1:2]])
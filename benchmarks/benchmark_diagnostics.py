@@ -0,0 +1,72 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+# Time of the semantic phase (DeftPascalCompiler.compile) when only errors are collected, when debug messages are
+# collected too, and when debug messages are also logged. The same ast is compiled again and again, so parsing is not
+# measured.
+#     python -m benchmarks.benchmark_diagnostics [statements] [compilations]
+
+from components.deft_pascal_compiler import DeftPascalCompiler
+
+import gc
+import logging
+import sys
+import time
+
+# the intermediate code holds up to 1000 actions, each statement below takes one or two
+_STATEMENTS_ = ["v1 := (v2 + {0}) * v3 - v1 DIV 7",
+                "IF (v1 > {0}) AND b1 THEN v2 := v1 * 2 + v3 ELSE v2 := v3 - {0}",
+                "WHILE v3 < {0} DO v3 := v3 + v1 * 2",
+                "FOR v2 := 1 TO {0} DO v1 := v1 + v2 * v3",
+                "REPEAT v1 := v1 - {0} UNTIL (v1 < v2) OR b1"]
+
+
+def _program(statements):
+    body = ";\n".join("  " + _STATEMENTS_[i % len(_STATEMENTS_)].format(i) for i in range(statements))
+    return "PROGRAM bench;\nVAR v1, v2, v3 : INTEGER; b1 : BOOLEAN;\nBEGIN\n{0}\nEND.\n".format(body)
+
+
+def _best_time(compiler, ast, compilations):
+    timings = []
+    for _ in range(compilations):
+        gc.collect()
+        start = time.perf_counter()
+        result = compiler.compile(ast)
+        timings.append(time.perf_counter() - start)
+        assert result.succeeded, result["ERROR"]
+    return min(timings), len(result.diagnostics)
+
+
+def main(statements=400, compilations=20):
+    program = _program(statements)
+    compiler = DeftPascalCompiler()
+    assert compiler.check_syntax(program).succeeded
+    ast = compiler.ast
+    logger = logging.getLogger("deft_pascal_reborn")
+    print("{0} statements, best of {1} compilations".format(statements, compilations))
+    baseline = None
+    for name, severity, log_level in [("errors only", "ERROR", logging.WARNING),
+                                      ("debug collected", "DEBUG", logging.WARNING),
+                                      ("debug collected and logged", "DEBUG", logging.DEBUG)]:
+        logger.setLevel(log_level)
+        # messages that are logged go to a handler that drops them, so printing is not measured
+        logger.propagate = log_level == logging.WARNING
+        handler = logging.NullHandler()
+        logger.addHandler(handler)
+        try:
+            elapsed, diagnostics = _best_time(DeftPascalCompiler(severity=severity), ast, compilations)
+        finally:
+            logger.removeHandler(handler)
+            logger.propagate = True
+            logger.setLevel(logging.NOTSET)
+        baseline = baseline or elapsed
+        print("    {0:<28} {1:8.2f} ms {2:6} diagnostics {3:6.2f}x".format(name, elapsed * 1000, diagnostics,
+                                                                        elapsed / baseline))
+
+
+if __name__ == "__main__":
+    main(*[int(i) for i in sys.argv[1:3]])
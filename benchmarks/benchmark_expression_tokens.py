@@ -0,0 +1,103 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+# Time of the semantic phase (DeftPascalCompiler.compile) on programs made of long expressions, with the tokens of
+# the expressions classified by DeftPascalCompiler._EXPRESSION_TOKENS and with every token looked up as before the
+# table: by value, then by type in the symbol table, then by type in the operator table. The number of lookups in
+# the symbol and operator tables is shown too.
+#     python -m benchmarks.benchmark_expression_tokens [terms] [compilations]
+
+from components.deft_pascal_compiler import DeftPascalCompiler, _NUMERIC_TOKENS_, _STRING_TOKENS_
+
+import gc
+import sys
+import time
+
+_STATEMENTS_ = 40
+_TERMS_ = ["v1", "{0}", "v2", "({0} + v3)", "v3", "(v1 - {0})"]
+_OPERATORS_ = ["+", "*", "-", "DIV", "+", "MOD"]
+
+
+class _LookupChainCompiler(DeftPascalCompiler):
+    """
+    turns every token of an expression into a symbol as the compiler did before the table.
+    """
+
+    _EXPRESSION_TOKENS = {}
+
+    def _expression_other(self, action_name, token):
+        a_symbol = self._symbol_table.retrieve(token.value, equal_level_only=False)
+        if not a_symbol:
+            a_symbol = self._symbol_table.retrieve(token.type, equal_level_only=False)
+            if not a_symbol:
+                a_symbol = self._operator_table.retrieve(token.type, equal_level_only=False)
+                if not a_symbol:
+                    if token.type in _NUMERIC_TOKENS_:
+                        a_symbol = self._expression_numeric_literal(action_name, token)
+                    elif token.type in _STRING_TOKENS_:
+                        a_symbol = self._expression_string_literal(action_name, token)
+        return a_symbol
+
+
+def _lookups(compiler_class, ast):
+    """
+    returns the number of lookups in the symbol and operator tables made by a compilation of ast.
+    """
+    lookups = []
+
+    class CountingCompiler(compiler_class):
+        def _reset(self):
+            super()._reset()
+            for table in (self._symbol_table, self._operator_table):
+                table.retrieve = counted(table.retrieve)
+
+    def counted(retrieve):
+        def counted_retrieve(name, equal_level_only=True):
+            lookups.append(name)
+            return retrieve(name, equal_level_only)
+        return counted_retrieve
+
+    CountingCompiler(severity="ERROR").compile(ast)
+    return len(lookups)
+
+
+def _program(terms):
+    statements = []
+    for statement in range(_STATEMENTS_):
+        expression = ["v{0}".format(statement % 3 + 1)]
+        for i in range(1, terms):
+            expression += [_OPERATORS_[(statement + i) % len(_OPERATORS_)],
+                           _TERMS_[(statement + i) % len(_TERMS_)].format(i + 1)]
+        statements.append("  v{0} := {1}".format(statement % 3 + 1, " ".join(expression)))
+    body = ";\n".join(statements)
+    return "PROGRAM bench;\nVAR v1, v2, v3 : INTEGER;\nBEGIN\n{0}\nEND.\n".format(body)
+
+
+def _best_time(compiler, ast, compilations):
+    timings = []
+    for _ in range(compilations):
+        gc.collect()
+        start = time.perf_counter()
+        result = compiler.compile(ast)
+        timings.append(time.perf_counter() - start)
+        assert result.succeeded, result["ERROR"]
+    return min(timings)
+
+
+def main(terms=24, compilations=20):
+    compiler = DeftPascalCompiler()
+    assert compiler.check_syntax(_program(terms)).succeeded
+    ast = compiler.ast
+    print("{0} statements of {1} terms, best of {2} compilations".format(_STATEMENTS_, terms, compilations))
+    for name, compiler_class in [("classification table", DeftPascalCompiler),
+                                 ("lookup chain", _LookupChainCompiler)]:
+        elapsed = _best_time(compiler_class(severity="ERROR"), ast, compilations)
+        print("    {0:<22} {1:8.2f} ms {2:8} table lookups".format(name, elapsed * 1000, _lookups(compiler_class, ast)))
+
+
+if __name__ == "__main__":
+    main(*[int(i) for i in sys.argv[1:3]])
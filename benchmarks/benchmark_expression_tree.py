@@ -0,0 +1,104 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+# Number of operator type checks (evaluate_to_type) and time of the semantic phase (DeftPascalCompiler.compile) on
+# programs of assignments and FOR statements, with the typed tree of each expression built once and reused by the
+# compiler and the intermediate code, and with the expressions analysed again, as before the tree: the right side of
+# every assignment and FOR statement analysed a second time, and the tree built again each time it is asked for.
+#     python -m benchmarks.benchmark_expression_tree [statements] [compilations]
+
+from components.deft_pascal_compiler import DeftPascalCompiler
+from components.symbols.base_symbols import BaseExpression, ExpressionNode
+from components.symbols.operator_symbols import BinaryOperator, UnaryOperator
+
+import contextlib
+import gc
+import sys
+import time
+
+
+@contextlib.contextmanager
+def _reanalysing():
+    """
+    makes from_node analyse its expression list again and tree build the tree again each time it is asked for.
+    """
+    from_node, tree = vars(BaseExpression)["from_node"], BaseExpression.tree
+
+    def reanalysed_from_node(cls, node, expression_list):
+        return from_node.__func__(cls, ExpressionNode.from_infix(expression_list) or node, expression_list)
+
+    BaseExpression.from_node = classmethod(reanalysed_from_node)
+    BaseExpression.tree = property(lambda self: ExpressionNode.from_infix(self.value))
+    try:
+        yield
+    finally:
+        BaseExpression.from_node, BaseExpression.tree = from_node, tree
+
+
+@contextlib.contextmanager
+def _counted(counts):
+    evaluations = [(operator_class, operator_class.evaluate_to_type) for operator_class in (BinaryOperator,
+                                                                                            UnaryOperator)]
+
+    def counted(evaluate_to_type):
+        def counted_evaluate_to_type(*args, **kwargs):
+            counts.append(None)
+            return evaluate_to_type(*args, **kwargs)
+        return counted_evaluate_to_type
+
+    for operator_class, evaluate_to_type in evaluations:
+        operator_class.evaluate_to_type = counted(evaluate_to_type)
+    try:
+        yield
+    finally:
+        for operator_class, evaluate_to_type in evaluations:
+            operator_class.evaluate_to_type = evaluate_to_type
+
+
+def _program(statements):
+    lines = []
+    for statement in range(statements):
+        lines.append("  i{0} := (i{1} + {0}) * 2 - i{2} DIV (3 + i{0})".format(statement % 4, (statement + 1) % 4,
+                                                                              (statement + 2) % 4))
+        lines.append("  FOR i{0} := i{1} * 2 + 1 TO (i{2} - {0}) * 4 DO b := (i{0} > {0}) AND NOT b".format(
+            statement % 4, (statement + 1) % 4, (statement + 2) % 4))
+    body = ";\n".join(lines)
+    return "PROGRAM bench;\nVAR i0, i1, i2, i3 : INTEGER;\n    b : BOOLEAN;\nBEGIN\n{0}\nEND.\n".format(body)
+
+
+def _best_time(compiler, ast, compilations):
+    timings = []
+    for _ in range(compilations):
+        gc.collect()
+        start = time.perf_counter()
+        result = compiler.compile(ast)
+        timings.append(time.perf_counter() - start)
+        assert result.succeeded, result["ERROR"]
+    return min(timings)
+
+
+def _type_checks(compiler, ast):
+    counts = []
+    with _counted(counts):
+        compiler.compile(ast)
+    return len(counts)
+
+
+def main(statements=50, compilations=20):
+    compiler = DeftPascalCompiler(severity="ERROR")
+    assert compiler.check_syntax(_program(statements)).succeeded
+    ast = compiler.ast
+    print("{0} statements, best of {1} compilations".format(statements * 2, compilations))
+    for name, context in [("tree built once", contextlib.nullcontext), ("analysed again", _reanalysing)]:
+        with context():
+            elapsed = _best_time(compiler, ast, compilations)
+            checks = _type_checks(compiler, ast)
+        print("    {0:<16} {1:8.2f} ms {2:8} type checks".format(name, elapsed * 1000, checks))
+
+
+if __name__ == "__main__":
+    main(*[int(i) for i in sys.argv[1:3]])
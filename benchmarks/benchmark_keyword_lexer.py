@@ -0,0 +1,56 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+# Tokens per second of the KeywordLexer against lark's lexers, on a corpus of programs generated from the grammar.
+# The lexers are timed on their own (lark's basic lexer, as there is no parser state) and then inside a full parse
+# (lark's contextual lexer).
+#     python -m benchmarks.benchmark_keyword_lexer [lines]
+
+from components.deft_pascal_parser_3 import DeftPascalParser
+from components.keyword_lexer import KeywordLexer
+from utils.program_generator import ProgramGenerator
+
+import gc
+import sys
+import time
+
+
+def _best_time(function, repetitions):
+    timings = []
+    for _ in range(repetitions):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(lines=20000, repetitions=3):
+    programs = [ProgramGenerator(depth=depth, expression_length=length, seed=lines).generate(lines // 4)
+                for depth, length in [(1, 1), (2, 2), (3, 3), (4, 2)]]
+    corpus = "".join(programs)
+    lark_parser = DeftPascalParser._shared_parser()
+    keyword_lexer = KeywordLexer(lark_parser.lexer_conf)
+    tokens = len(list(keyword_lexer.lex(keyword_lexer.make_lexer_state(corpus))))
+    assert tokens == len(list(lark_parser.lex(corpus)))
+    print("corpus: {0} lines, {1:.1f} MB, {2} tokens".format(corpus.count("\n"), len(corpus) / 2 ** 20, tokens))
+
+    print("lexing only")
+    for name, function in [("lark basic lexer", lambda: list(lark_parser.lex(corpus))),
+                           ("KeywordLexer", lambda: list(keyword_lexer.lex(keyword_lexer.make_lexer_state(corpus))))]:
+        elapsed = _best_time(function, repetitions)
+        print("    {0:<24} {1:8.3f}s {2:>12.0f} tokens/s".format(name, elapsed, tokens / elapsed))
+
+    print("parsing")
+    for name, parser in [("lark contextual lexer", DeftPascalParser()),
+                         ("KeywordLexer", DeftPascalParser(lexer=KeywordLexer))]:
+        elapsed = _best_time(lambda: [parser.parse_tree(program) for program in programs], repetitions)
+        print("    {0:<24} {1:8.3f}s {2:>12.0f} tokens/s".format(name, elapsed, tokens / elapsed))
+
+
+if __name__ == "__main__":
+    main(*[int(i) for i in sys.argv[1:2]])
@@ -0,0 +1,103 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+# Parse time, throughput and peak memory of DeftPascalParser on programs generated from the grammar, growing in size
+# from 1k to 200k lines, and the same for programs of growing nesting depth and expression length.
+# For a given shape of program the parse time should grow like the number of tokens. The scaling exponent of each
+# case is log(time ratio) / log(tokens ratio) against the smallest program of the same shape, and a case whose
+# exponent is above _SUPERLINEAR_EXPONENT_ is flagged. The exit status is 1 when any case was flagged.
+#     python -m benchmarks.benchmark_parser_scaling [largest size in lines]
+
+from components.deft_pascal_parser_3 import DeftPascalParser
+from utils.program_generator import ProgramGenerator
+
+import gc
+import math
+import sys
+import time
+import tracemalloc
+
+_SIZES_ = (1000, 2000, 5000, 10000, 20000, 50000, 100000, 200000)
+_DEPTHS_ = (1, 2, 3, 4, 5, 6)
+_EXPRESSION_LENGTHS_ = (1, 2, 4, 8)
+# the depth and expression length cases are measured at these sizes and reported at the largest
+_SWEEP_SIZES_ = (2000, 8000)
+_SUPERLINEAR_EXPONENT_ = 1.15
+# small cases are parsed again until this time is spent and the best time is kept
+_MINIMUM_TIME_ = 1.0
+_SEED_ = 2020
+
+
+def _measure(parser, program):
+    timings = []
+    while sum(timings) < _MINIMUM_TIME_:
+        gc.collect()
+        start = time.perf_counter()
+        ast, error_list = parser.parse_tree(program)
+        timings.append(time.perf_counter() - start)
+        assert not error_list, error_list
+        del ast
+    gc.collect()
+    # the peak is taken on a second parse, tracing would distort the timing of the first
+    tracemalloc.start()
+    parser.parse_tree(program)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(timings), peak
+
+
+def _scaling(sizes, **shape):
+    """
+    parses programs of the given shape at each size and yields (lines, tokens, seconds, peak memory, exponent).
+    """
+    parser = DeftPascalParser()
+    first = None
+    for size in sizes:
+        program = ProgramGenerator(seed=_SEED_, **shape).generate(size)
+        tokens = len(DeftPascalParser.tokenize(program))
+        elapsed, peak = _measure(parser, program)
+        exponent = math.log(elapsed / first[1]) / math.log(tokens / first[0]) if first else None
+        first = first or (tokens, elapsed)
+        yield program.count("\n"), tokens, elapsed, peak, exponent
+
+
+def _report(title, cases):
+    """
+    prints one line per (label, measurement) of cases and returns the labels of the superlinear cases.
+    """
+    print(title)
+    print("    {0:>10} {1:>8} {2:>9} {3:>9} {4:>11} {5:>11} {6:>9} {7:>9}".format(
+        "case", "lines", "tokens", "seconds", "lines/s", "tokens/s", "peak MB", "exponent"))
+    flagged = []
+    for label, (lines, tokens, elapsed, peak, exponent) in cases:
+        superlinear = exponent is not None and exponent > _SUPERLINEAR_EXPONENT_
+        if superlinear:
+            flagged.append("{0} {1}".format(title, label))
+        print("    {0:>10} {1:>8} {2:>9} {3:>9.3f} {4:>11.0f} {5:>11.0f} {6:>9.1f} {7:>9}{8}".format(
+            label, lines, tokens, elapsed, lines / elapsed, tokens / elapsed, peak / 2 ** 20,
+            "" if exponent is None else "{0:.2f}".format(exponent), " SUPERLINEAR" if superlinear else ""))
+    return flagged
+
+
+def _largest(measurements):
+    return list(measurements)[-1]
+
+
+def main(largest=_SIZES_[-1]):
+    sizes = [size for size in _SIZES_ if size <= largest]
+    flagged = _report("program size", zip(sizes, _scaling(sizes, depth=3, expression_length=2)))
+    flagged += _report("nesting depth", [(depth, _largest(_scaling(_SWEEP_SIZES_, depth=depth, expression_length=2)))
+                                         for depth in _DEPTHS_])
+    flagged += _report("expression length", [(length, _largest(_scaling(_SWEEP_SIZES_, depth=2, expression_length=length)))
+                                             for length in _EXPRESSION_LENGTHS_])
+    if flagged:
+        print("superlinear: {0}".format(", ".join(flagged)))
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(i) for i in sys.argv[1:2]]))
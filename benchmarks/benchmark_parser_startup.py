@@ -0,0 +1,64 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+# First-compile latency of the parser.
+# Each measurement runs in a fresh interpreter so nothing is shared between runs.
+#     python -m benchmarks.benchmark_parser_startup
+
+from components.deft_pascal_parser_3 import _STANDALONE_
+
+import os
+import subprocess
+import sys
+import tempfile
+
+_PROGRAM_ = "PROGRAM benchmark; VAR v1 : INTEGER; BEGIN v1 := 1 + 2 * 3 END."
+
+_SNIPPET_GRAMMAR_ = """
+import time
+start = time.perf_counter()
+from lark import Lark
+from components.deft_pascal_parser_3 import DeftPascalParser
+parser = Lark(DeftPascalParser._grammar(), parser='lalr', debug=False)
+parser.parse({0!r})
+print(time.perf_counter() - start)
+"""
+
+_SNIPPET_TABLES_ = """
+import time
+start = time.perf_counter()
+from components.deft_pascal_parser_3 import DeftPascalParser
+parser = DeftPascalParser()
+assert parser.parse({0!r}) == []
+print(time.perf_counter() - start)
+"""
+
+
+def _run(snippet, environment, repetitions):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    timings = []
+    for _ in range(repetitions):
+        output = subprocess.run([sys.executable, "-c", snippet.format(_PROGRAM_)], cwd=root, env=environment,
+                                capture_output=True, text=True, check=True).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return min(timings), sum(timings) / len(timings)
+
+
+def main(repetitions=5):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        environment = dict(os.environ, DEFT_PASCAL_CACHE_DIR=cache_dir)
+        results = [("grammar analysis (no tables)", _run(_SNIPPET_GRAMMAR_, environment, repetitions))]
+        # the first run populates the cache, the following ones load from it
+        _run(_SNIPPET_TABLES_, environment, 1)
+        label = "standalone parser" if _STANDALONE_ else "cached parse tables"
+        results.append((label, _run(_SNIPPET_TABLES_, environment, repetitions)))
+    for label, (best, mean) in results:
+        print("{0:<32} best {1:8.4f}s   mean {2:8.4f}s".format(label, best, mean))
+
+
+if __name__ == "__main__":
+    main()
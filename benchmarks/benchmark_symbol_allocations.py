@@ -0,0 +1,137 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+# Number of symbols created by one compilation (DeftPascalCompiler.compile), by class, and the time of a compilation,
+# with the builtin types, constants, procedures and operators shared by all compilations, and with them created again
+# by each compilation and by each evaluation of an operator, as the compiler did before they were shared. the types of
+# the literals are the shared ones in both cases.
+#     python -m benchmarks.benchmark_symbol_allocations [statements] [compilations]
+
+from components.deft_pascal_compiler import DeftPascalCompiler
+from components.symbols.base_symbols import BaseSymbol
+from components.symbols.identifier_symbols import InBuiltProcedureWrite
+from components.symbols.literals_symbols import BooleanLiteral, NilLiteral
+from components.symbols.operator_symbols import BinaryOperator, UnaryOperator, NeutralOperator
+from components.symbols.type_symbols import BasicType, StringType, PointerType, RESERVED_TYPES
+
+import collections
+import gc
+import sys
+import time
+
+# the factories of the builtin types, by index
+_TYPE_FACTORIES_ = (BasicType.reserved_type_integer, BasicType.reserved_type_real, BasicType.reserved_type_set,
+                    BasicType.reserved_type_char, StringType.reserved_type_string, BasicType.reserved_type_boolean,
+                    PointerType.reserved_type_pointer, BasicType.reserved_type_text, BasicType.reserved_type_array,
+                    BasicType.reserved_type_null)
+
+# the factories of the builtin symbols and operators, by name
+_FACTORIES_ = {factory().name: factory for factory in (
+    BooleanLiteral.true, BooleanLiteral.false, NilLiteral.nil,
+    BasicType.reserved_type_integer, BasicType.reserved_type_real, BasicType.reserved_type_boolean,
+    BasicType.reserved_type_char, StringType.reserved_type_string, BasicType.reserved_type_text,
+    InBuiltProcedureWrite.in_built_procedure_write, InBuiltProcedureWrite.in_built_procedure_writeln,
+    *[getattr(operator_class, name) for operator_class in (BinaryOperator, UnaryOperator, NeutralOperator)
+      for name in sorted(vars(operator_class)) if name.startswith("operator_")])}
+
+
+def _fresh_result(evaluate_to_type):
+    def fresh_evaluate_to_type(*args, **kwargs):
+        result = evaluate_to_type(*args, **kwargs)
+        if any(result is i for i in RESERVED_TYPES):
+            result = _TYPE_FACTORIES_[result.index]()
+        return result
+    return fresh_evaluate_to_type
+
+
+def _fresh_append(append):
+    def fresh_append(symbol):
+        if symbol._frozen:
+            symbol = _FACTORIES_[symbol.name]()
+        append(symbol)
+    return fresh_append
+
+
+class _FreshSymbolsCompiler(DeftPascalCompiler):
+    """
+    creates its builtin symbols and operators for each compilation, and a new type for each evaluation of an operator.
+    """
+
+    def _reset(self):
+        super()._reset()
+        for table in (self._symbol_table, self._operator_table):
+            table.append = _fresh_append(table.append)
+
+    def compile(self, *args, **kwargs):
+        # the operators have no instance dictionary, so their classes are patched for the compilation
+        evaluations = [(operator_class, operator_class.evaluate_to_type)
+                       for operator_class in (BinaryOperator, UnaryOperator)]
+        for operator_class, evaluate_to_type in evaluations:
+            operator_class.evaluate_to_type = _fresh_result(evaluate_to_type)
+        try:
+            return super().compile(*args, **kwargs)
+        finally:
+            for operator_class, evaluate_to_type in evaluations:
+                operator_class.evaluate_to_type = evaluate_to_type
+
+
+def _allocations(compiler, ast):
+    """
+    returns the number of symbols created by a compilation of ast, by class.
+    """
+    counts = collections.Counter()
+    init = BaseSymbol.__init__
+
+    def counted_init(self, *args, **kwargs):
+        counts[type(self).__name__] += 1
+        init(self, *args, **kwargs)
+
+    BaseSymbol.__init__ = counted_init
+    try:
+        compiler.compile(ast)
+    finally:
+        BaseSymbol.__init__ = init
+    return counts
+
+
+def _program(statements):
+    lines = []
+    for statement in range(statements):
+        lines.append("  i{0} := (i{1} + {0}) * 2 - i{2} DIV 3".format(statement % 4, (statement + 1) % 4,
+                                                                      (statement + 2) % 4))
+        lines.append("  b := (i{0} > {0}) AND NOT b OR TRUE".format(statement % 4))
+    body = ";\n".join(lines)
+    return ("PROGRAM bench;\nVAR i0, i1, i2, i3 : INTEGER;\n    b : BOOLEAN;\n    s : STRING(20);\n"
+            "BEGIN\n{0}\nEND.\n".format(body))
+
+
+def _best_time(compiler, ast, compilations):
+    timings = []
+    for _ in range(compilations):
+        gc.collect()
+        start = time.perf_counter()
+        result = compiler.compile(ast)
+        timings.append(time.perf_counter() - start)
+        assert result.succeeded, result["ERROR"]
+    return min(timings)
+
+
+def main(statements=50, compilations=20):
+    compiler = DeftPascalCompiler()
+    assert compiler.check_syntax(_program(statements)).succeeded
+    ast = compiler.ast
+    print("{0} statements, best of {1} compilations".format(statements * 2, compilations))
+    for name, compiler_class in [("shared builtins", DeftPascalCompiler), ("fresh builtins", _FreshSymbolsCompiler)]:
+        elapsed = _best_time(compiler_class(severity="ERROR"), ast, compilations)
+        counts = _allocations(compiler_class(severity="ERROR"), ast)
+        print("    {0:<16} {1:8.2f} ms {2:8} symbols".format(name, elapsed * 1000, sum(counts.values())))
+        for class_name, count in sorted(counts.items()):
+            print("        {0:<24} {1:8}".format(class_name, count))
+
+
+if __name__ == "__main__":
+    main(*[int(i) for i in sys.argv[1:3]])
@@ -0,0 +1,135 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+# Memory of the symbols, traced with tracemalloc: the bytes per symbol of each class of symbol, with its attributes
+# in slots and with the same attributes in an instance dictionary, as the symbols had before they were slotted, and
+# the peak memory of a symbol table that holds the symbols declared by a large synthetic program, in both forms.
+#     python -m benchmarks.benchmark_symbol_memory [declarations]
+
+from components.deft_pascal_compiler import DeftPascalCompiler
+from components.symbol_table import SymbolTable
+from components.symbols.base_symbols import BaseExpression
+from components.symbols.identifier_symbols import Identifier, ConstantIdentifier, TypeIdentifier
+from components.symbols.literals_symbols import NumericLiteral, StringLiteral
+from components.symbols.operator_symbols import BinaryOperator
+from components.symbols.type_symbols import PointerType, RESERVED_TYPES, string_type
+
+import gc
+import sys
+import tracemalloc
+
+_COPIES_ = 10000
+
+
+class _DictSymbol:
+    """
+    holds the attributes of a symbol in an instance dictionary.
+    """
+
+    def __init__(self, symbol):
+        for symbol_class in type(symbol).__mro__:
+            for name in getattr(symbol_class, "__slots__", ()):
+                setattr(self, name, getattr(symbol, name))
+
+    @property
+    def name(self):
+        return self._name
+
+
+def _slotted_copy(symbol):
+    result = object.__new__(type(symbol))
+    for symbol_class in type(symbol).__mro__:
+        for name in getattr(symbol_class, "__slots__", ()):
+            setattr(result, name, getattr(symbol, name))
+    return result
+
+
+def _traced(function, *args):
+    """
+    returns the result of function and the peak of the memory it allocated, in bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        return result, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _bytes_per_symbol(symbol, copy):
+    _, peak = _traced(lambda: [copy(symbol) for _ in range(_COPIES_)])
+    return peak / _COPIES_
+
+
+def _table(symbols, copy):
+    table = SymbolTable()
+    table.increase_level("program")
+    for symbol in symbols:
+        table.append(copy(symbol))
+    return table
+
+
+def _program(declarations):
+    constants = ";\n".join("  c{0} = {0}".format(i) for i in range(declarations))
+    types = ";\n".join("  t{0} = ^INTEGER".format(i) for i in range(declarations))
+    variables = ";\n".join("  i{0}, b{0} : {1};\n  s{0} : STRING({2});\n  p{0} : ^INTEGER".format(
+        i, "INTEGER" if i % 2 else "BOOLEAN", 10 + i % 70) for i in range(declarations))
+    return "PROGRAM memory;\nCONST\n{0};\nTYPE\n{1};\nVAR\n{2};\nBEGIN\nEND.\n".format(constants, types, variables)
+
+
+def _declared_symbols(declarations):
+    """
+    returns the symbols that a compilation of the synthetic program puts in its symbol table.
+    """
+    symbols = []
+
+    class RecordingCompiler(DeftPascalCompiler):
+        def _reset(self):
+            super()._reset()
+            append = self._symbol_table.append
+
+            def recorded_append(symbol):
+                symbols.append(symbol)
+                append(symbol)
+
+            self._symbol_table.append = recorded_append
+
+    compiler = RecordingCompiler(severity="ERROR")
+    assert compiler.check_syntax(_program(declarations)).succeeded
+    result = compiler.compile()
+    assert result.succeeded, result["ERROR"]
+    return symbols
+
+
+def main(declarations=1000):
+    integer = RESERVED_TYPES[0]
+    samples = [Identifier("v1", integer, None),
+               TypeIdentifier("t1", PointerType.for_type(integer)),
+               ConstantIdentifier("c1", BaseExpression("c1", None, [NumericLiteral.from_value("1", "INTEGER")])),
+               NumericLiteral.from_value("1", "INTEGER"),
+               StringLiteral.from_value("'abc'", "STRING_VALUE"),
+               BinaryOperator.operator_plus(),
+               BaseExpression("e1", integer, []),
+               PointerType.for_type(integer),
+               string_type(20)]
+    print("bytes per symbol, traced over {0} copies".format(_COPIES_))
+    print("    {0:<20} {1:>8} {2:>10}".format("class", "slots", "dictionary"))
+    for symbol in samples:
+        print("    {0:<20} {1:8.1f} {2:10.1f}".format(type(symbol).__name__,
+                                                      _bytes_per_symbol(symbol, _slotted_copy),
+                                                      _bytes_per_symbol(symbol, _DictSymbol)))
+
+    symbols = _declared_symbols(declarations)
+    print("peak memory of a symbol table of {0} symbols".format(len(symbols)))
+    for name, copy in [("slots", _slotted_copy), ("dictionary", _DictSymbol)]:
+        _, peak = _traced(_table, symbols, copy)
+        print("    {0:<20} {1:10.1f} KiB {2:8.1f} bytes per symbol".format(name, peak / 1024, peak / len(symbols)))
+
+
+if __name__ == "__main__":
+    main(*[int(i) for i in sys.argv[1:2]])
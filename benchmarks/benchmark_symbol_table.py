@@ -0,0 +1,80 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+# Time of SymbolTable.retrieve(name, equal_level_only=False) for a name declared at the outermost level, a name
+# declared at the innermost level and a name that is not declared, at nesting depths up to 32. The same lookups are
+# timed on a table that walks down the levels one at a time, as SymbolTable did before it kept a binding stack per
+# name, and the time of leaving a level is shown too.
+#     python -m benchmarks.benchmark_symbol_table [lookups]
+
+from components.symbol_table import SymbolTable
+from components.symbols.base_symbols import BaseSymbol
+
+import sys
+import time
+
+_DEPTHS_ = [1, 2, 4, 8, 16, 32]
+_SYMBOLS_PER_LEVEL_ = 20
+
+
+class _LevelWalkSymbolTable(SymbolTable):
+    """
+    looks a name up level by level, from the current level down to the outermost one.
+    """
+
+    def retrieve(self, name, equal_level_only=True):
+        level = self.current_level
+        result = self._retrieve_from_level(name, level)
+        if equal_level_only:
+            return result
+        while not result and level > 0:
+            level = level - 1
+            result = self._retrieve_from_level(name, level)
+        return result
+
+
+def _table(table_class, depth):
+    table = table_class()
+    for level in range(depth):
+        table.increase_level("level_{0}".format(level))
+        for i in range(_SYMBOLS_PER_LEVEL_):
+            table.append(BaseSymbol("symbol_{0}_{1}".format(level, i), "INTEGER", i))
+    return table
+
+
+def _lookup_time(table, name, lookups):
+    retrieve = table.retrieve
+    start = time.perf_counter()
+    for _ in range(lookups):
+        retrieve(name, equal_level_only=False)
+    return (time.perf_counter() - start) / lookups
+
+
+def _exit_time(table_class, depth):
+    # one level more, so the innermost level has a level to go back to
+    table = _table(table_class, depth + 1)
+    start = time.perf_counter()
+    table.decrease_level()
+    return time.perf_counter() - start
+
+
+def main(lookups=100000):
+    print("{0} lookups, {1} symbols per level, time per lookup in ns".format(lookups, _SYMBOLS_PER_LEVEL_))
+    print("    {0:>5} {1:>9} {2:>9} {3:>9} {4:>9} {5:>9} {6:>9} {7:>9}".format(
+        "depth", "outer", "inner", "missing", "walk out", "walk in", "walk miss", "exit us"))
+    for depth in _DEPTHS_:
+        names = ["symbol_0_0", "symbol_{0}_0".format(depth - 1), "undeclared"]
+        table = _table(SymbolTable, depth)
+        walk = _table(_LevelWalkSymbolTable, depth)
+        timings = [_lookup_time(table, name, lookups) for name in names]
+        timings += [_lookup_time(walk, name, lookups) for name in names]
+        print("    {0:>5} {1} {2:9.2f}".format(depth, " ".join("{0:9.1f}".format(i * 1e9) for i in timings),
+                                            _exit_time(SymbolTable, depth) * 1e6))
+
+
+if __name__ == "__main__":
+    main(*[int(i) for i in sys.argv[1:2]])
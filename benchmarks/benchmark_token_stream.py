@@ -0,0 +1,58 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+# Lexing throughput and memory of the array backed TokenStream against a list of lark Tokens,
+# on generated table driven programs of growing size.
+#     python -m benchmarks.benchmark_token_stream
+
+from components.deft_pascal_parser_3 import DeftPascalParser
+
+import gc
+import time
+import tracemalloc
+
+
+def generate_program(size):
+    constants = []
+    length = 0
+    index = 0
+    while length < size:
+        constant = "  C{0} = &H{1:04X};\n".format(index, index % 65536)
+        constants.append(constant)
+        length += len(constant)
+        index += 1
+    return "PROGRAM table;\nCONST\n{0}BEGIN\nEND.\n".format("".join(constants))
+
+
+def _measure(tokenize, program):
+    gc.collect()
+    start = time.perf_counter()
+    tokens = tokenize(program)
+    elapsed = time.perf_counter() - start
+    del tokens
+    gc.collect()
+    tracemalloc.start()
+    tokens = tokenize(program)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return len(tokens), elapsed, memory
+
+
+def main(sizes=(1, 2, 4, 8)):
+    lark_parser = DeftPascalParser._shared_parser()
+    for size in sizes:
+        program = generate_program(size * 2 ** 20)
+        count, stream_time, stream_memory = _measure(DeftPascalParser.tokenize, program)
+        lark_count, lark_time, lark_memory = _measure(lambda text: list(lark_parser.lex(text)), program)
+        assert count == lark_count
+        print("{0} MB, {1} tokens".format(size, count))
+        print("    {0:<20} {1:8.3f}s {2:8.2f} MB/s {3:10.1f} MB".format("TokenStream", stream_time, size / stream_time, stream_memory / 2 ** 20))
+        print("    {0:<20} {1:8.3f}s {2:8.2f} MB/s {3:10.1f} MB".format("lark Tokens", lark_time, size / lark_time, lark_memory / 2 ** 20))
+
+
+if __name__ == "__main__":
+    main()
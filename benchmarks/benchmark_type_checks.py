@@ -0,0 +1,125 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+# Throughput of the type checks of the binary operators, with the results looked up in the CompatibilityTensor and
+# with the _compatible list of the operator scanned for each check, as BinaryOperator did before the tensor:
+# BinaryOperator.evaluate_to_type on every pair of types and DeftPascalCompiler.compile on a program made of long
+# expressions.
+#     python -m benchmarks.benchmark_type_checks [rounds] [compilations]
+
+from components.deft_pascal_compiler import DeftPascalCompiler
+from components.symbols.operator_symbols import BinaryOperator
+from components.symbols.type_symbols import RESERVED_TYPES, PointerType
+
+import contextlib
+import gc
+import sys
+import time
+
+_STATEMENTS_ = 60
+_TERMS_ = 24
+
+
+def _scan_as_type(self, symbol_right, symbol_left):
+    result = [t for t in self._compatible if t[0] == symbol_left.index and t[1] == symbol_right.index]
+    if len(result) > 1:
+        raise KeyError("unexpected multiple results in method")
+    return result[0] if result else None
+
+
+def _scan_is_compatible(self, symbol_right, symbol_left):
+    return True if _scan_as_type(self, symbol_right, symbol_left) else False
+
+
+def _scan_evaluate_to_type(self, symbol_right, symbol_left):
+    result = _scan_as_type(self, symbol_right, symbol_left)
+    if result == (6, 6, 6):
+        result = _scan_as_type(self, symbol_right.type, symbol_left.type)
+    return RESERVED_TYPES[result[2]] if result else None
+
+
+@contextlib.contextmanager
+def _scanning():
+    """
+    makes the binary operators scan their _compatible lists, as they did before the tensor.
+    """
+    methods = BinaryOperator.is_compatible, BinaryOperator.evaluate_to_type
+    BinaryOperator.is_compatible, BinaryOperator.evaluate_to_type = _scan_is_compatible, _scan_evaluate_to_type
+    try:
+        yield
+    finally:
+        BinaryOperator.is_compatible, BinaryOperator.evaluate_to_type = methods
+
+
+def _operators():
+    return [getattr(BinaryOperator, i)() for i in sorted(vars(BinaryOperator)) if i.startswith("operator_")]
+
+
+def _types():
+    return list(RESERVED_TYPES[:6]) + [PointerType.for_type(RESERVED_TYPES[0])] + list(RESERVED_TYPES[7:])
+
+
+def _evaluations(operators, types, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for operator in operators:
+            evaluate_to_type = operator.evaluate_to_type
+            for left in types:
+                for right in types:
+                    evaluate_to_type(right, left)
+    return time.perf_counter() - start
+
+
+def _program():
+    operators = ["+", "*", "-", "DIV", "+", "MOD"]
+    statements = []
+    for statement in range(_STATEMENTS_):
+        terms = ["v{0}".format((statement + i) % 3 + 1) if i % 2 else str(i + 1) for i in range(_TERMS_)]
+        expression = terms[0]
+        for i, term in enumerate(terms[1:]):
+            expression += " {0} {1}".format(operators[(statement + i) % len(operators)], term)
+        statements.append("  v{0} := {1}".format(statement % 3 + 1, expression))
+        statements.append("  b := (v{0} > {1}) AND (v{2} <= v{0}) OR NOT b".format(statement % 3 + 1, statement,
+                                                                                   (statement + 1) % 3 + 1))
+    return "PROGRAM bench;\nVAR v1, v2, v3 : INTEGER;\n    b : BOOLEAN;\nBEGIN\n{0}\nEND.\n".format(
+        ";\n".join(statements))
+
+
+def _compile_time(compiler, ast, compilations):
+    timings = []
+    for _ in range(compilations):
+        gc.collect()
+        start = time.perf_counter()
+        result = compiler.compile(ast)
+        timings.append(time.perf_counter() - start)
+        assert result.succeeded, result["ERROR"]
+    return min(timings)
+
+
+def main(rounds=200, compilations=20):
+    operators = _operators()
+    types = _types()
+    checks = rounds * len(operators) * len(types) * len(types)
+    print("{0} binary operators, {1} types, {2} rounds".format(len(operators), len(types), rounds))
+    tensor = _evaluations(operators, types, rounds)
+    with _scanning():
+        scan = _evaluations(operators, types, rounds)
+    print("    evaluate_to_type    tensor {0:8.0f} ns   scan {1:8.0f} ns   per check".format(
+        tensor / checks * 1e9, scan / checks * 1e9))
+
+    compiler = DeftPascalCompiler(severity="ERROR")
+    assert compiler.check_syntax(_program()).succeeded
+    ast = compiler.ast
+    tensor = _compile_time(compiler, ast, compilations)
+    with _scanning():
+        scan = _compile_time(compiler, ast, compilations)
+    print("    compile, {0} statements, best of {1}: tensor {2:8.2f} ms   scan {3:8.2f} ms".format(
+        _STATEMENTS_ * 2, compilations, tensor * 1000, scan * 1000))
+
+
+if __name__ == "__main__":
+    main(*[int(i) for i in sys.argv[1:3]])
@@ -0,0 +1,189 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+from components.deft_pascal_parser_3 import DeftPascalParser
+from components.compact_ast import Node, Leaf, node_class
+from array import array
+import hashlib
+import logging
+import marshal
+import os
+import sys
+import tempfile
+import zlib
+
+_MODULE_LOGGER_ = logging.getLogger("deft_pascal_reborn")
+
+# bump when the layout written by _encode, or the values of the leaves, change
+_FORMAT_VERSION_ = 3
+
+_FILE_SUFFIX_ = ".ast"
+
+
+def _encode(ast):
+    """
+    flattens ast in pre-order into a list of names, a list of token values and an array of integers:
+    a node is (name index * 2, number of children) and a leaf is (name index * 2 + 1, value index, line, column).
+    """
+    names, values = {}, {}
+    codes = array("I")
+    pending = [ast]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, Node):
+            codes.extend((names.setdefault(item.data, len(names)) * 2, len(item.children)))
+            pending.extend(reversed(item.children))
+        else:
+            codes.extend((names.setdefault(item.type, len(names)) * 2 + 1,
+                          values.setdefault(item.value, len(values)),
+                          item.line or 0,
+                          item.column or 0))
+    return _FORMAT_VERSION_, list(names), list(values), codes.tobytes()
+
+
+def _decode(data):
+    version, names, values, code_bytes = data
+    if version != _FORMAT_VERSION_:
+        raise ValueError("unknown ast cache format {0}".format(version))
+    codes = array("I")
+    codes.frombytes(code_bytes)
+    classes = [node_class(name) for name in names]
+
+    # each entry of pending is a node still missing children and how many
+    root = None
+    pending = []
+    index = 0
+    while index < len(codes):
+        code = codes[index]
+        if code & 1:
+            line, column = codes[index + 2], codes[index + 3]
+            item = Leaf(names[code >> 1], values[codes[index + 1]], line or None, column or None)
+            index += 4
+            count = 0
+        else:
+            count = codes[index + 1]
+            item = classes[code >> 1]([])
+            index += 2
+        if pending:
+            parent = pending[-1]
+            parent[0].children.append(item)
+            parent[1] -= 1
+            if not parent[1]:
+                pending.pop()
+        else:
+            root = item
+        if count:
+            pending.append([item, count])
+    if pending or not isinstance(root, Node):
+        raise ValueError("truncated ast cache entry")
+    return root
+
+
+class AstCache:
+    """
+    content addressed store of compact parse trees, each one flattened by _encode, marshalled and compressed.
+    an entry is keyed by the hash of the source, the grammar and the python version, so a stale entry can never be
+    returned. entries that cannot be read are deleted and count as misses. once the entries take more than max_bytes
+    the least recently used are removed. the size of the entries is counted from the directory at the first store and
+    then kept by adding the size of each entry stored, so the directory is only listed again to evict. entries stored
+    by other processes sharing the directory are only counted from that listing.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._salt = "{0}|{1}|{2}|".format(_FORMAT_VERSION_, sys.version_info[:2], DeftPascalParser.grammar_hash())
+        self._size = None
+        self.hits = 0
+        self.misses = 0
+
+    def _file_name(self, source):
+        key = hashlib.sha256((self._salt + source).encode("utf-8")).hexdigest()
+        return os.path.join(self._directory, key + _FILE_SUFFIX_)
+
+    def load(self, source):
+        """
+        returns the cached tree for source or None.
+        """
+        file_name = self._file_name(source)
+        try:
+            with open(file_name, "rb") as file:
+                ast = _decode(marshal.loads(zlib.decompress(file.read())))
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as error:
+            _MODULE_LOGGER_.debug("ast cache entry '{0}' discarded: {1}".format(file_name, error))
+            self._remove(file_name)
+            self.misses += 1
+            return None
+        # the modification time records the last use for the eviction
+        try:
+            os.utime(file_name)
+        except OSError:
+            pass
+        self.hits += 1
+        return ast
+
+    def store(self, source, ast):
+        """
+        stores ast as the tree of source. a cache that cannot be written is ignored.
+        """
+        file_name = self._file_name(source)
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            data = zlib.compress(marshal.dumps(_encode(ast)), 1)
+            # an entry written again for the same source replaces the previous one, whose size is no longer counted
+            try:
+                replaced_size = os.stat(file_name).st_size
+            except FileNotFoundError:
+                replaced_size = 0
+            handle, temp_name = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+            try:
+                with os.fdopen(handle, "wb") as file:
+                    file.write(data)
+                os.replace(temp_name, file_name)
+            except BaseException:
+                self._remove(temp_name)
+                raise
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += len(data) - replaced_size
+            if self._size > self._max_bytes:
+                self._evict()
+        except OSError as error:
+            _MODULE_LOGGER_.debug("ast cache not written to '{0}': {1}".format(self._directory, error))
+
+    def _entries(self):
+        """
+        returns the (modification time, size, file name) of the entries in the directory.
+        """
+        entries = []
+        with os.scandir(self._directory) as iterator:
+            for entry in iterator:
+                if entry.name.endswith(_FILE_SUFFIX_):
+                    status = entry.stat()
+                    entries.append((status.st_mtime, status.st_size, entry.path))
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, file_name in entries:
+            if total <= self._max_bytes:
+                break
+            self._remove(file_name)
+            total -= size
+        self._size = total
+
+    @staticmethod
+    def _remove(file_name):
+        try:
+            os.remove(file_name)
+        except OSError:
+            pass
@@ -0,0 +1,194 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+from components.deft_pascal_compiler import DeftPascalCompiler
+from components.diagnostics import Diagnostic, CompilationResult
+from components.source_files import ArtefactWriter, read_source
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import glob
+import os
+import time
+
+STEPS = ("SYNTAX", "SEMANTIC", "INTERMEDIATE")
+_SOURCE_EXTENSION_ = ".pas"
+
+# the compiler of a worker process, built once by _initialise_worker and used for every file sent to the worker
+_WORKER_ = None
+
+
+def find_sources(patterns):
+    """
+    returns the sorted file names matched by patterns, without repetitions. a pattern is a file name, a directory, in
+    which case every .pas file under it is taken, or a glob such as src/**/*.pas.
+    """
+    file_names = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "**", "*" + _SOURCE_EXTENSION_)
+        file_names.update(i for i in glob.glob(pattern, recursive=True) if os.path.isfile(i))
+    return sorted(file_names)
+
+
+class FileResult:
+    """
+    the outcome of compiling one file of a batch: the diagnostics of every step run, as a CompilationResult, the file
+    name of each artefact written by extension, and the time taken.
+    """
+
+    def __init__(self, file_name, diagnostics, artefacts, seconds):
+        self.file_name = file_name
+        self.diagnostics = diagnostics
+        self.artefacts = artefacts
+        self.seconds = seconds
+
+    def __repr__(self):
+        return "FileResult({0!r}, {1} errors)".format(self.file_name, len(self.diagnostics["ERROR"]))
+
+    @property
+    def succeeded(self):
+        return self.diagnostics.succeeded
+
+
+def compile_source(compiler, source_code, file_name, steps, writer, save_steps=True):
+    """
+    runs the steps of the compilation of source_code with compiler, up to steps (SYNTAX, SEMANTIC or INTERMEDIATE),
+    and writes the artefacts with writer, an ArtefactWriter. the .ast and .ic are only written with save_steps.
+    returns the CompilationResult of the steps run and the file name of each artefact written, by extension.
+    an exception raised by the compiler is returned as an internal error, so one source does not stop the others.
+    """
+    last_step = STEPS.index(steps)
+    diagnostics = []
+    artefacts = {}
+    try:
+        result = compiler.check_syntax(source_code, file_name)
+        diagnostics += result.diagnostics
+        if result.succeeded and save_steps:
+            artefacts["ast"] = writer.write(compiler.ast.pretty(), "ast")
+
+        if result.succeeded and last_step >= STEPS.index("SEMANTIC"):
+            result = compiler.compile()
+            diagnostics += result.diagnostics
+            if result.succeeded and save_steps:
+                artefacts["ic"] = writer.write(compiler.intermediate_code, "ic")
+
+            if result.succeeded and last_step >= STEPS.index("INTERMEDIATE"):
+                output_code = compiler.generate()
+                if output_code:
+                    artefacts["c"] = writer.write(output_code, "c")
+    except Exception as error:
+        diagnostics.append(Diagnostic("internal compiler error: {0!r}".format(error), "ERROR", "internal", file_name))
+    return CompilationResult(diagnostics), artefacts
+
+
+def _artefact_path(file_name, output_path, source_root):
+    """
+    returns the folder of the artefacts of file_name: the folder of the source or, with output_path, the folder of the
+    source relative to source_root mirrored under output_path, so sources of the same name in different folders do
+    not overwrite each other's artefacts.
+    """
+    if not output_path:
+        return os.path.dirname(file_name)
+    relative_path = os.path.relpath(os.path.dirname(os.path.abspath(file_name)), source_root)
+    return os.path.normpath(os.path.join(output_path, relative_path))
+
+
+def _check_artefact_names(file_names, output_path, source_root):
+    """
+    raises ValueError if two different sources would write their artefacts to the same files, as x.pas and x.v2.pas
+    in the same folder do.
+    """
+    sources = {}
+    for file_name in file_names:
+        writer = ArtefactWriter(file_name, output_path=_artefact_path(file_name, output_path, source_root))
+        artefact = os.path.normcase(os.path.abspath(writer.file_name("ast")))
+        source = os.path.abspath(file_name)
+        if sources.setdefault(artefact, source) != source:
+            raise ValueError("{0} and {1} would write the same artefacts".format(sources[artefact], file_name))
+
+
+class _Worker:
+    """
+    compiles files one after the other with the same compiler, so the parser and the caches stay warm.
+    """
+
+    def __init__(self, steps, output_path, source_root, overwrite, save_steps, compiler_options):
+        self._compiler = DeftPascalCompiler(**compiler_options)
+        self._steps = steps
+        self._output_path = output_path
+        self._source_root = source_root
+        self._overwrite = overwrite
+        self._save_steps = save_steps
+
+    def compile_file(self, file_name):
+        start = time.perf_counter()
+        artefact_path = _artefact_path(file_name, self._output_path, self._source_root)
+        if self._output_path:
+            os.makedirs(artefact_path, exist_ok=True)
+        writer = ArtefactWriter(file_name, output_path=artefact_path, overwrite=self._overwrite)
+        try:
+            source_code = read_source(file_name)
+        except OSError as error:
+            result = CompilationResult([Diagnostic("cannot read {0}: {1}".format(file_name, error), "ERROR", "internal",
+                                                   file_name)])
+            return FileResult(file_name, result, {}, time.perf_counter() - start)
+        result, artefacts = compile_source(self._compiler, source_code, file_name, self._steps, writer,
+                                           self._save_steps)
+        return FileResult(file_name, result, artefacts, time.perf_counter() - start)
+
+
+def _initialise_worker(*arguments):
+    global _WORKER_
+    _WORKER_ = _Worker(*arguments)
+
+
+def _compile_in_worker(file_name):
+    return _WORKER_.compile_file(file_name)
+
+
+def compile_files(file_names, jobs=None, steps="INTERMEDIATE", output_path=None, overwrite=True, save_steps=True,
+                  **compiler_options):
+    """
+    compiles file_names on jobs worker processes (one per cpu by default) and yields a FileResult for each file as
+    soon as it is done, so in no particular order.
+    steps is the last step run: SYNTAX, SEMANTIC or INTERMEDIATE (which writes the .c file). the artefacts are
+    written next to each source or, with output_path, in the folders of the sources mirrored under output_path from
+    their common folder. compiler_options are given to the DeftPascalCompiler of each worker and must be picklable, e.g. cmoc, max_errors, preprocessor, ast_cache, lexer and severity.
+    with jobs=1 the files are compiled in the calling process.
+    the arguments are checked before the first file is compiled: raises ValueError if they are wrong or if two
+    sources would write the same artefacts.
+    """
+    if steps not in STEPS:
+        raise ValueError("steps must be one of {0}".format(", ".join(STEPS)))
+    jobs = jobs or os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+    file_names = list(file_names)
+    source_root = None
+    if output_path and file_names:
+        source_root = os.path.commonpath([os.path.dirname(os.path.abspath(i)) for i in file_names])
+    _check_artefact_names(file_names, output_path, source_root)
+    arguments = (steps, output_path, source_root, overwrite, save_steps, compiler_options)
+    return _compile_files(file_names, jobs, arguments)
+
+
+def _compile_files(file_names, jobs, arguments):
+    if jobs == 1:
+        worker = _Worker(*arguments)
+        for file_name in file_names:
+            yield worker.compile_file(file_name)
+        return
+
+    with ProcessPoolExecutor(jobs, initializer=_initialise_worker, initargs=arguments) as executor:
+        futures = [executor.submit(_compile_in_worker, file_name) for file_name in file_names]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # when the caller stops early the files not yet started are dropped
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,145 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+from components.deft_pascal_parser_3 import DeftPascalParser, Tree
+import re
+import sys
+
+
+class Node:
+    """
+    compact replacement for the lark Tree. there is one subclass per grammar rule and the rule name is held by the
+    class, so each instance only stores its children.
+    """
+
+    __slots__ = ("children",)
+
+    data = None
+
+    def __init__(self, children):
+        self.children = children
+
+    def __repr__(self):
+        return "{0}({1!r}, {2!r})".format(type(self).__name__, self.data, self.children)
+
+    def __eq__(self, other):
+        # declaration lists nest one level per declaration, so large programs are too deep for recursion
+        pending = [(self, other)]
+        while pending:
+            node, other_node = pending.pop()
+            if not isinstance(other_node, Node) or node.data != other_node.data or \
+                    len(node.children) != len(other_node.children):
+                return False
+            for child, other_child in zip(node.children, other_node.children):
+                if isinstance(child, Node):
+                    pending.append((child, other_child))
+                elif child != other_child:
+                    return False
+        return True
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def pretty(self, indent_str="  "):
+        """
+        same layout as lark's Tree.pretty so saved ast files do not change.
+        """
+        lines = []
+        pending = [(self, 0)]
+        while pending:
+            node, level = pending.pop()
+            if not isinstance(node, Node):
+                lines += [indent_str * level, "{0}".format(node), "\n"]
+            elif len(node.children) == 1 and not isinstance(node.children[0], Node):
+                lines += [indent_str * level, node.data, "\t", "{0}".format(node.children[0]), "\n"]
+            else:
+                lines += [indent_str * level, node.data, "\n"]
+                pending.extend((child, level + 1) for child in reversed(node.children))
+        return "".join(lines)
+
+
+class Leaf:
+    """
+    compact replacement for the lark Token. the value is an interned string, so every occurrence of an identifier
+    spelt the same way shares the same string object, and only the line and column of the source position are kept.
+    identifiers keep the spelling of the source. the symbol table folds them, see symbol_table.intern_identifier.
+    """
+
+    __slots__ = ("type", "value", "line", "column")
+
+    def __init__(self, a_type, a_value, a_line=None, a_column=None):
+        self.type = sys.intern(a_type)
+        self.value = sys.intern(a_value)
+        self.line = a_line
+        self.column = a_column
+
+    def __str__(self):
+        return self.value
+
+    def __repr__(self):
+        return "Leaf({0!r}, {1!r})".format(self.type, self.value)
+
+    def __eq__(self, other):
+        # a lark Token compares equal to its text, and so does a Leaf
+        if isinstance(other, Leaf):
+            return self.type == other.type and self.value == other.value
+        return self.value == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.value)
+
+
+def _class_name(rule_name):
+    return "".join(part.capitalize() for part in rule_name.split("_"))
+
+
+def _grammar_rules():
+    # rules starting with _ or ? are inlined by lark and never appear in the tree
+    return re.findall(r"^\s*([a-z][a-z0-9_]*)\s*:", DeftPascalParser._grammar(), re.MULTILINE)
+
+
+NODE_CLASSES = {}
+
+
+def node_class(rule_name):
+    """
+    returns the Node subclass for rule_name, creating it the first time the rule is seen.
+    """
+    result = NODE_CLASSES.get(rule_name)
+    if result is None:
+        result = type(_class_name(rule_name), (Node,), {"__slots__": (), "data": rule_name, "__module__": __name__})
+        NODE_CLASSES[rule_name] = result
+    return result
+
+
+for _rule_name in _grammar_rules():
+    node_class(_rule_name)
+
+
+def lower(ast):
+    """
+    returns the compact equivalent of the lark tree ast.
+    the tree is walked with an explicit stack, so the depth of the program is not limited by the recursion limit.
+    """
+    root = node_class(ast.data)([])
+    pending = [(ast, root)]
+    while pending:
+        tree, node = pending.pop()
+        children = node.children
+        for child in tree.children:
+            if isinstance(child, Tree):
+                new_node = node_class(child.data)([])
+                pending.append((child, new_node))
+                children.append(new_node)
+            else:
+                children.append(Leaf(child.type, str(child), child.line, child.column))
+    return root
@@ -0,0 +1,52 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+# The client of components.compile_server. It does not import the compiler, nor lark, so it starts quickly.
+
+from components.diagnostics import Diagnostic, CompilationResult
+
+import json
+import os
+import socket
+
+_RECEIVE_SIZE_ = 64 * 1024
+
+
+def compile_remote(socket_path, source_code, file_name=None, steps="INTERMEDIATE", save_steps=True, timeout=None,
+                   **options):
+    """
+    compiles source_code on the compile server listening at socket_path, up to steps (SYNTAX, SEMANTIC or
+    INTERMEDIATE). options are the compiler options: cmoc, max_errors, lexer ('LARK' or 'KEYWORD'), include_path,
+    define and severity. file_name and the include paths are made absolute, since the server runs in its own folder.
+    returns the CompilationResult and the contents of the artefacts (ast, ic and c) by extension.
+    the request is sent as JSON, followed by the end of the output of the connection. the response comes back as
+    JSON on the same connection. a request the server rejects raises ValueError. OSError is raised when the server
+    cannot be reached.
+    """
+    if "include_path" in options:
+        options["include_path"] = [os.path.abspath(i) for i in options["include_path"]]
+    request = {"source": source_code,
+               "file_name": os.path.abspath(file_name) if file_name else None,
+               "steps": steps,
+               "save_steps": save_steps,
+               "options": options}
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        connection.connect(socket_path)
+        connection.sendall(json.dumps(request).encode("utf-8"))
+        connection.shutdown(socket.SHUT_WR)
+        chunks = []
+        chunk = connection.recv(_RECEIVE_SIZE_)
+        while chunk:
+            chunks.append(chunk)
+            chunk = connection.recv(_RECEIVE_SIZE_)
+
+    response = json.loads(b"".join(chunks).decode("utf-8"))
+    if "error" in response:
+        raise ValueError(response["error"])
+    return CompilationResult(Diagnostic(*i) for i in response["diagnostics"]), response["artefacts"]
@@ -0,0 +1,150 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+# A long running compile server. It listens on a Unix domain socket and keeps its compilers, with the parser and the
+# include caches, warm between requests, so a compilation costs only the time to compile.
+#     python -m components.compile_server socket_path [-ast_cache folder] [-v]
+# components.compile_client sends it the requests, see compile_remote for the protocol.
+
+from components.ast_cache import AstCache
+from components.batch_compiler import STEPS, compile_source
+from components.deft_pascal_compiler import DeftPascalCompiler
+from components.keyword_lexer import KeywordLexer
+from components.preprocessor import Preprocessor
+from components.source_files import ArtefactWriter
+
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+
+_MODULE_LOGGER_ = logging.getLogger("deft_pascal_reborn")
+
+_LEXERS_ = {"LARK": None, "KEYWORD": KeywordLexer}
+
+# the compiler options a request can give, with their defaults
+_OPTIONS_ = {"cmoc": False, "max_errors": 1, "lexer": "LARK", "include_path": [], "define": [], "severity": "DEBUG"}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        """
+        reads one request up to the end of the input and answers it.
+        """
+        try:
+            response = self.server.compile(json.loads(self.rfile.read().decode("utf-8")))
+        except (ValueError, TypeError, KeyError) as error:
+            response = {"error": "bad request: {0}".format(error)}
+        self.wfile.write(json.dumps(response).encode("utf-8"))
+
+
+class CompileServer(socketserver.UnixStreamServer):
+    """
+    compiles the sources sent on the Unix domain socket socket_path. requests are served one at a time.
+    a compiler is built for each set of options the first time it is asked for and kept for the next requests. the
+    parser, and the lark grammar, are built once for the whole server.
+    """
+
+    def __init__(self, socket_path, ast_cache=None):
+        """
+        ast_cache is an optional AstCache shared by all the compilers.
+        a socket file left behind by a server that is no longer running is replaced. raises FileExistsError if
+        socket_path is a file that is not a socket.
+        """
+        self._ast_cache = ast_cache
+        self._compilers = {}
+        if os.path.exists(socket_path) and not _is_listening(socket_path):
+            if not stat.S_ISSOCK(os.stat(socket_path).st_mode):
+                raise FileExistsError("'{0}' exists and is not a socket".format(socket_path))
+            os.unlink(socket_path)
+        super().__init__(socket_path, _RequestHandler)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+    def _compiler(self, options):
+        unknown = set(options) - set(_OPTIONS_)
+        if unknown:
+            raise ValueError("unknown options {0}".format(", ".join(sorted(unknown))))
+        options = dict(_OPTIONS_, **options)
+        key = (bool(options["cmoc"]), int(options["max_errors"]), options["lexer"], tuple(options["include_path"]),
+               tuple(options["define"]), options["severity"])
+        compiler = self._compilers.get(key)
+        if compiler is None:
+            _MODULE_LOGGER_.info("compile server: new compiler for {0}".format(key))
+            compiler = DeftPascalCompiler(cmoc=key[0],
+                                          max_errors=key[1],
+                                          ast_cache=self._ast_cache,
+                                          preprocessor=Preprocessor(key[3], key[4]),
+                                          lexer=_LEXERS_[key[2]],
+                                          severity=key[5])
+            self._compilers[key] = compiler
+        return compiler
+
+    def compile(self, request):
+        """
+        request is a dictionary with the source, its file_name (or None), the last of the steps to run, save_steps and
+        the compiler options. returns the diagnostics, each one a list of its message, severity, code and span, and
+        the contents of the artefacts by extension.
+        """
+        steps = request.get("steps", "INTERMEDIATE")
+        if steps not in STEPS:
+            raise ValueError("steps must be one of {0}".format(", ".join(STEPS)))
+        compiler = self._compiler(request.get("options", {}))
+        file_name = request.get("file_name")
+        writer = ArtefactWriter(file_name or "", in_memory=True)
+        result, _ = compile_source(compiler, request["source"], file_name, steps, writer,
+                                   request.get("save_steps", True))
+        return {"diagnostics": [[str(i), i.severity, i.code, *i.span] for i in result.diagnostics],
+                "artefacts": writer.contents}
+
+
+def _is_listening(socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DEFT PASCAL REBORN compile server. Compiles the sources sent by deft_pascal_reborn.py -server on a Unix domain socket")
+    parser.add_argument("socket_path", help="file name of the Unix domain socket to listen on")
+    parser.add_argument("-ast_cache", help="folder where parse trees are cached between runs. if not provided, nothing is cached")
+    parser.add_argument("-ast_cache_size", type=int, default=256, help="size limit of the parse tree cache in megabytes")
+    parser.add_argument("-v", "--verbosity", action="count", default=0, help="verbosity levels")
+    arguments = parser.parse_args()
+
+    logging.basicConfig(level=max(logging.WARNING - 10 * arguments.verbosity, logging.DEBUG))
+    ast_cache = None
+    if arguments.ast_cache:
+        ast_cache = AstCache(arguments.ast_cache, arguments.ast_cache_size * 1024 * 1024)
+
+    try:
+        server = CompileServer(arguments.socket_path, ast_cache)
+    except FileExistsError as error:
+        parser.error(str(error))
+    # build the parser now rather than on the first request
+    server._compiler({})
+    print("compile server listening on {0}".format(arguments.socket_path))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+# evaluation, at compilation, of the parts of an expression tree (see ExpressionNode) made of literals and constants
+# only. the values follow the 6809: integers are 16 bit two's complement numbers, the arithmetic wraps around (the
+# operations that do are reported, see fold), DIV truncates towards zero and MOD takes the sign of the dividend.
+# strings are limited to 80 characters. real numbers, sets and pointers are not evaluated. AND and OR are logical, as
+# the emitter writes them.
+
+from components.symbols.base_symbols import ExpressionNode, BaseType
+from components.symbols.literals_symbols import NumericLiteral, StringLiteral, BooleanLiteral
+from components.symbols.type_symbols import RESERVED_TYPES
+
+import operator
+
+# the indexes of the types that are evaluated
+_INTEGER_ = 0
+_CHAR_ = 3
+_STRING_ = 4
+_BOOLEAN_ = 5
+_EVALUATED_TYPES_ = (_INTEGER_, _CHAR_, _STRING_, _BOOLEAN_)
+
+_STRING_LIMIT_ = 80
+
+
+def _div(left, right):
+    if right == 0:
+        raise ValueError("division by zero")
+    quotient = abs(left) // abs(right)
+    return quotient if (left < 0) == (right < 0) else -quotient
+
+
+def _mod(left, right):
+    return left - right * _div(left, right)
+
+
+def _power(left, right):
+    if right < 0:
+        raise ValueError("negative exponent in integer power")
+    return left ** right
+
+
+def _and(left, right):
+    # as the emitter writes it, the && of c: 1 when both operands are not zero, also for integers
+    return int(bool(left) and bool(right))
+
+
+def _or(left, right):
+    # as the emitter writes it, the || of c: 1 when either operand is not zero, also for integers
+    return int(bool(left) or bool(right))
+
+
+_BINARY_OPERATIONS_ = {"OPERATOR_PLUS": operator.add,
+                       "OPERATOR_MINUS": operator.sub,
+                       "OPERATOR_MULTIPLY": operator.mul,
+                       "OPERATOR_DIV": _div,
+                       "OPERATOR_MOD": _mod,
+                       "OPERATOR_STARSTAR": _power,
+                       "OPERATOR_AND": _and,
+                       "OPERATOR_OR": _or,
+                       "OPERATOR_EQUAL_TO": operator.eq,
+                       "OPERATOR_NOT_EQUAL_TO": operator.ne,
+                       "OPERATOR_LESS_THAN": operator.lt,
+                       "OPERATOR_GREATER_THAN": operator.gt,
+                       "OPERATOR_LESS_OR_EQUAL_TO": operator.le,
+                       "OPERATOR_GREATER_OR_EQUAL_TO": operator.ge}
+
+_UNARY_OPERATIONS_ = {"OPERATOR_ARITHMETIC_NEGATION": operator.neg,
+                      "OPERATOR_ARITHMETIC_NEUTRAL": operator.pos,
+                      "OPERATOR_ABS": abs,
+                      "OPERATOR_NOT": operator.not_}
+
+
+def _to_16_bits(value):
+    return ((value + 0x8000) & 0xFFFF) - 0x8000
+
+
+def _type_index(node):
+    # identifiers of procedures and such have no BaseType
+    return node.type.index if isinstance(node.type, BaseType) else None
+
+
+def _leaf_value(symbol):
+    """
+    returns the value of a literal or a constant, None if it is not evaluated.
+    """
+    category = symbol.category
+    if category == "ConstantIdentifier":
+        tree = symbol.value.tree
+        literal = fold(tree) if tree else None
+        return _leaf_value(literal) if literal else None
+
+    if category == "NumericLiteral" and symbol.type.index == _INTEGER_:
+        return _to_16_bits(symbol.integer_value)
+
+    if category == "StringLiteral":
+        return symbol.value
+
+    if category == "BooleanLiteral":
+        return bool(symbol.value)
+
+    return None
+
+
+def _node_value(node, values, overflows):
+    """
+    returns the value of node, from the values of its operands, None if it is not evaluated.
+    raises ValueError if the value does not fit the limits of the 6809.
+    """
+    if _type_index(node) not in _EVALUATED_TYPES_:
+        return None
+
+    if not node.operands:
+        return _leaf_value(node.symbol)
+
+    if node.symbol is None:
+        return None
+
+    operands = [values.get(id(i)) for i in node.operands]
+    if None in operands or any(_type_index(i) not in _EVALUATED_TYPES_ for i in node.operands):
+        return None
+
+    if len(operands) == 2:
+        operation = _BINARY_OPERATIONS_.get(node.symbol.type)
+    else:
+        operation = _UNARY_OPERATIONS_.get(node.symbol.type)
+    if operation is None:
+        return None
+
+    result = operation(*operands)
+    if _type_index(node) == _INTEGER_:
+        wrapped = _to_16_bits(result)
+        if wrapped != result and overflows is not None:
+            overflows.append((result, wrapped))
+        result = wrapped
+    elif _type_index(node) in (_CHAR_, _STRING_) and len(result) > _STRING_LIMIT_:
+        raise ValueError("string longer than {0} characters".format(_STRING_LIMIT_))
+    return result
+
+
+def _values(tree, overflows):
+    """
+    returns the values of the nodes of tree that are evaluated, by the id of the node.
+    the operands of a node are evaluated before the node.
+    """
+    values = {}
+    pending = [(tree, False)]
+    while pending:
+        node, operands_done = pending.pop()
+        if node.operands and not operands_done:
+            pending.append((node, True))
+            pending.extend((i, False) for i in node.operands)
+        else:
+            value = _node_value(node, values, overflows)
+            if value is not None:
+                values[id(node)] = value
+    return values
+
+
+def _literal(value, node):
+    if _type_index(node) == _BOOLEAN_:
+        return BooleanLiteral.true() if value else BooleanLiteral.false()
+    if _type_index(node) == _INTEGER_:
+        return NumericLiteral.from_value(str(value), "INTEGER")
+    return StringLiteral(value, RESERVED_TYPES[_CHAR_] if _type_index(node) == _CHAR_ else RESERVED_TYPES[_STRING_],
+                         value)
+
+
+def fold(tree, overflows=None):
+    """
+    returns the literal of the value of the expression of tree, None if the expression has variables or values that
+    are not evaluated at compilation.
+    overflows, a list, gets a (value, wrapped value) pair for each integer operation whose value leaves
+    -32768..32767 and wraps around.
+    raises ValueError if the value does not fit the limits of the 6809: a division by zero, a string longer than
+    80 characters.
+    """
+    values = _values(tree, overflows)
+    return _literal(values[id(tree)], tree) if id(tree) in values else None
+
+
+def fold_operations(tree, overflows=None):
+    """
+    returns tree with each operation on literals and constants only replaced by the literal of its value, as the
+    emitter should see it. tree itself is not changed, the nodes on the way to a replaced operation are copied.
+    fills overflows and raises ValueError as fold does.
+    """
+    values = _values(tree, overflows)
+    folded = {}
+    pending = [(tree, False)]
+    while pending:
+        node, operands_done = pending.pop()
+        if id(node) in values and node.operands and node.symbol is not None:
+            folded[id(node)] = ExpressionNode(_literal(values[id(node)], node), (), node.type)
+        elif node.operands and not operands_done:
+            pending.append((node, True))
+            pending.extend((i, False) for i in node.operands)
+        elif any(folded[id(i)] is not i for i in node.operands):
+            copy = ExpressionNode(node.symbol, tuple(folded[id(i)] for i in node.operands), node.type)
+            copy.parentheses = node.parentheses
+            folded[id(node)] = copy
+        else:
+            folded[id(node)] = node
+    return folded[id(tree)]
@@ -5,43 +5,77 @@ DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original D
 HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
 """
 
-from lark import Tree, Token
-from components.deft_pascal_parser_3 import DeftPascalParser
+from components.deft_pascal_parser_3 import DeftPascalParser, Tree
+from components.compact_ast import Node, Leaf, lower
 from components.symbol_table import SymbolTable
 from components.symbols.base_symbols import BaseKeyword, BaseExpression
 from components.symbols.operator_symbols import Operator, BinaryOperator, UnaryOperator, NeutralOperator
 from components.symbols.identifier_symbols import Identifier, TypeIdentifier, ProcedureIdentifier, InBuiltProcedureWrite, ProcedureExternalIdentifier, ProcedureForwardIdentifier, ConstantIdentifier
 from components.symbols.literals_symbols import BooleanLiteral, NilLiteral, NumericLiteral, StringLiteral
-from components.symbols.type_symbols import PointerType, BasicType, StringType
+from components.symbols.type_symbols import PointerType, BasicType, RESERVED_TYPES, string_type
 from components.symbols.expression_symbols import ConstantExpression, IntegerExpression, BooleanExpression
 from components.intermediate_code import IntermediateCode
 from components.parameters import ActualParameter, FormalParameter
+from components.diagnostics import Diagnostics, DiagnosticsHandler
 
-import copy
 import logging
 
 
-_LOG_ROLL_ = {"ERROR": [],
-              "WARNING": [],
-              "INFO": [],
-              "DEBUG": []
-              }
-
-
-class LogRequestsHandler(logging.Handler):
-    def emit(self, record):
-        """Record any errors raised by the compiler.
-        """
-        msg = record.getMessage()
-        _LOG_ROLL_[record.levelname.upper()].append(msg)
-
-        #if record.levelname.upper() == "ERROR":
-        #    _LOG_ROLL_["error"].append(msg)
-
-
 _MODULE_LOGGER_ = logging.getLogger("deft_pascal_reborn")
-_MODULE_LOGGER_.addHandler(LogRequestsHandler())
-_MODULE_LOGGER_.setLevel(logging.DEBUG)
+# messages logged by other modules during a compilation go to the Diagnostics of that compilation
+_MODULE_LOGGER_.addHandler(DiagnosticsHandler())
+
+# the operators of the operator table, which keys each of them by the type of its token. they are frozen and shared
+# by all compilations
+_OPERATORS_ = tuple(operator().freeze() for operator in (
+               BinaryOperator.operator_multiply,
+               BinaryOperator.operator_plus,
+               BinaryOperator.operator_minus,
+               BinaryOperator.operator_divide,
+               BinaryOperator.operator_div,
+               BinaryOperator.operator_mod,
+               BinaryOperator.operator_assignment,
+               BinaryOperator.operator_equal_to,
+               BinaryOperator.operator_not_equal_to,
+               BinaryOperator.operator_starstar,
+               BinaryOperator.operator_in,
+               BinaryOperator.operator_and,
+               BinaryOperator.operator_or,
+               BinaryOperator.operator_greater_than,
+               BinaryOperator.operator_greater_or_equal_to,
+               BinaryOperator.operator_less_than,
+               BinaryOperator.operator_less_or_equal_to,
+               UnaryOperator.operator_not,
+               UnaryOperator.operator_abs,
+               UnaryOperator.operator_arithmetic_negation,
+               UnaryOperator.operator_arithmetic_neutral,
+               UnaryOperator.operator_uparrow,
+               NeutralOperator.operator_left_parentheses,
+               NeutralOperator.operator_right_parentheses))
+
+# the system constants, by the type of their token. they are kept out of the symbol table, where names are not case
+# sensitive, so that a variable named constant_true does not find TRUE, and are frozen and shared by all compilations
+_BUILTIN_CONSTANTS_ = {symbol.name: symbol.freeze() for symbol in (BooleanLiteral.true(),
+                                                                   BooleanLiteral.false(),
+                                                                   NilLiteral.nil())}
+
+# the base types and the in-built procedures of the symbol table, frozen and shared by all compilations too. the base
+# types are the ones the operators evaluate to
+_BUILTIN_SYMBOLS_ = tuple(symbol.freeze() for symbol in (
+                    RESERVED_TYPES[0],
+                    RESERVED_TYPES[1],
+                    RESERVED_TYPES[5],
+                    RESERVED_TYPES[3],
+                    RESERVED_TYPES[4],
+                    RESERVED_TYPES[7],
+                    InBuiltProcedureWrite.in_built_procedure_write(),
+                    InBuiltProcedureWrite.in_built_procedure_writeln()))
+
+_OPERATOR_TOKENS_ = tuple(operator.name for operator in _OPERATORS_)
+_CONSTANT_TOKENS_ = tuple(_BUILTIN_CONSTANTS_)
+_NUMERIC_TOKENS_ = ("UNSIGNED_DECIMAL", "SIGNED_DECIMAL", "NUMBER_BINARY", "NUMBER_OCTAL", "NUMBER_HEXADECIMAL",
+                    "UNSIGNED_REAL", "SIGNED_REAL")
+_STRING_TOKENS_ = ("CHARACTER", "STRING_VALUE")
 
 
 class DeftPascalCompiler:
@@ -51,14 +85,22 @@ class DeftPascalCompiler:
     _GLB_BLOCK_BEGIN = "RESERVED_STRUCTURE_BEGIN_BLOCK"
     _GLB_BLOCK_END = "RESERVED_STRUCTURE_END_BLOCK"
 
-    def __init__(self, cmoc=False):
-        self._parser = DeftPascalParser()
+    def __init__(self, cmoc=False, max_errors=1, ast_cache=None, preprocessor=None, lexer=None, severity="DEBUG"):
+        """
+        ast_cache is an optional AstCache. check_syntax then reuses the tree of a source that was parsed before.
+        preprocessor is an optional Preprocessor that expands include and conditional directives.
+        lexer is an optional lexer class for the parser, see DeftPascalParser.
+        severity is the lowest severity of the messages returned by check_syntax and compile. errors are always
+        returned. messages below it are not even formatted, unless the deft_pascal_reborn logger is enabled for them.
+        """
+        self._parser = DeftPascalParser(max_errors, preprocessor, lexer)
+        self._ast_cache = ast_cache
         self._ast = None
-        self._symbol_table = SymbolTable()
-        self._symbol_table.increase_level("symbol_table_root")
-        self._operator_table = SymbolTable()
-        self._operator_table.increase_level("operator_table_root")
-        self._ic = IntermediateCode(cmoc)
+        self._line_map = None
+        self._severity = severity
+        self._diagnostics = Diagnostics(severity=severity)
+        self._cmoc = cmoc
+        self._reset()
 
         self._context = 0
 
@@ -96,39 +138,68 @@ class DeftPascalCompiler:
                          }
 
 
-    def check_syntax(self, input_program):
-        error_list = self._parser.parse(input_program)
-        if not error_list:
-            self._ast = self._parser.ast
-        else:
-            self._ast = None
-
-        _LOG_ROLL_["ERROR"].clear()
-        _LOG_ROLL_["WARNING"].clear()
-        _LOG_ROLL_["DEBUG"].clear()
-        _LOG_ROLL_["INFO"].clear()
-
-        _LOG_ROLL_["ERROR"] = error_list
+    def _reset(self):
+        """
+        starts the symbol tables and the intermediate code afresh, so each call to compile starts from the same state.
+        """
+        self._symbol_table = SymbolTable()
+        self._symbol_table.increase_level("symbol_table_root")
+        self._operator_table = SymbolTable()
+        self._operator_table.increase_level("operator_table_root")
+        self._ic = IntermediateCode(self._cmoc)
 
-        return _LOG_ROLL_
+    def check_syntax(self, input_program, file_name=None):
+        """
+        file_name is the file input_program was read from, used to find its includes.
+        returns the CompilationResult with the syntax errors.
+        """
+        # the cache is keyed by the preprocessed text so a change to an include is not missed
+        source = self._parser.preprocess(input_program, file_name)
+        self._ast = self._ast_cache.load(source.text) if self._ast_cache and not source.errors else None
+        error_list = []
+        if not self._ast:
+            ast, error_list = self._parser.parse_preprocessed(source)
+            self._ast = lower(ast) if ast else None
+            if self._ast and self._ast_cache:
+                self._ast_cache.store(source.text, self._ast)
+        self._line_map = source.line_map
+
+        # the parser logs the errors it returns, so collecting starts after parsing
+        diagnostics = Diagnostics(source.line_map, self._severity)
+        with diagnostics.collecting():
+            for error in error_list:
+                diagnostics.add(error, "ERROR", "syntax")
+            if self._ast_cache:
+                diagnostics.info("ast cache: {0} hits, {1} misses", self._ast_cache.hits, self._ast_cache.misses)
+
+        return diagnostics.result()
 
     def compile(self, ast=None):
+        """
+        the ast is only read, never changed, so the same ast can be compiled again.
+        returns the CompilationResult with the messages raised while compiling. each compilation collects its own
+        messages, so compilations can run at the same time in different threads.
+        """
         if not ast and not self._ast:
             raise ValueError("AST is not yet defined")
 
         if not ast and self._ast:
             ast = self._ast
 
-        _LOG_ROLL_["ERROR"].clear()
-        _LOG_ROLL_["WARNING"].clear()
-        _LOG_ROLL_["DEBUG"].clear()
-        _LOG_ROLL_["INFO"].clear()
+        # spans are mapped to the original files only for the ast of the source checked by check_syntax
+        line_map = self._line_map if ast is self._ast else None
 
-        # _LOG_ROLL_.clear()
-        for i in ast.children:
-            self._internal_compile(i, [])
+        if isinstance(ast, Tree):
+            ast = lower(ast)
 
-        return _LOG_ROLL_
+        self._reset()
+
+        self._diagnostics = Diagnostics(line_map, self._severity)
+        with self._diagnostics.collecting():
+            for i in ast.children:
+                self._internal_compile(i, [])
+
+        return self._diagnostics.result()
 
     @property
     def ast(self):
@@ -164,7 +235,7 @@ class DeftPascalCompiler:
             method_to_call = getattr(DeftPascalCompiler, "_" + action_name.lower())
             return method_to_call(self, action_name, a_tree.children, working_stack)
         else:
-            _MODULE_LOGGER_.error("action '{0}' not yet implemented for tree {1}".format(a_tree.data.upper(), a_tree))
+            self._diagnostics.error("action '{0}' not yet implemented for tree {1}", a_tree.data.upper(), a_tree)
             return working_stack
 
 
@@ -174,19 +245,26 @@ class DeftPascalCompiler:
             method_to_call = getattr(DeftPascalCompiler, "_" + action_name.lower())
             return method_to_call(self, action_name, a_token, working_stack)
         else:
-            _MODULE_LOGGER_.error("action '{0}' not yet implemented for token {1}".format(a_token.type.upper(), a_token.value.upper()))
+            self._diagnostics.error("action '{0}' not yet implemented for token {1}", a_token.type.upper(), a_token.value.upper())
             return working_stack
 
 
     def _internal_compile(self, ast, working_stack):
-        if isinstance(ast, Tree):
+        if not isinstance(ast, (Node, Leaf)):
+            self._diagnostics.error('Error - unknown AST object {0}', ast)
+            raise TypeError
+
+        # messages raised while compiling ast are reported at its span
+        diagnostics = self._diagnostics
+        outer_node = diagnostics.node
+        diagnostics.node = ast
+        try:
+            if isinstance(ast, Leaf):
+                return self._compile_token(ast, working_stack)
             if len(ast.children) > 0:
                 return self._compile_tree(ast, working_stack)
-        elif isinstance(ast, Token):
-            return self._compile_token(ast, working_stack)
-        else:
-            _MODULE_LOGGER_.error('Error - unknown AST object {0}'.format(ast))
-            raise TypeError
+        finally:
+            diagnostics.node = outer_node
 
 
     def _increase_scope(self, scope_label=None):
@@ -212,48 +290,13 @@ class DeftPascalCompiler:
         identifier = token_list[1].value
         self._increase_scope(identifier)
 
-        # add the system constants to the symbol table
-        self._symbol_table.append(BooleanLiteral.true())
-        self._symbol_table.append(BooleanLiteral.false())
-        self._symbol_table.append(NilLiteral.nil())
-
-        # add the base types to the symbol table
-        self._symbol_table.append(BasicType.reserved_type_integer())
-        self._symbol_table.append(BasicType.reserved_type_real())
-        self._symbol_table.append(BasicType.reserved_type_boolean())
-        self._symbol_table.append(BasicType.reserved_type_char())
-        self._symbol_table.append(StringType.reserved_type_string())
-        self._symbol_table.append(BasicType.reserved_type_text())
-
-        # add the in-built procedures to the symbol table
-        self._symbol_table.append(InBuiltProcedureWrite.in_built_procedure_write())
-        self._symbol_table.append(InBuiltProcedureWrite.in_built_procedure_writeln())
+        # add the base types and the in-built procedures to the symbol table
+        for symbol in _BUILTIN_SYMBOLS_:
+            self._symbol_table.append(symbol)
 
         # add all operators to the operator table
-        self._operator_table.append(BinaryOperator.operator_multiply())
-        self._operator_table.append(BinaryOperator.operator_plus())
-        self._operator_table.append(BinaryOperator.operator_minus())
-        self._operator_table.append(BinaryOperator.operator_divide())
-        self._operator_table.append(BinaryOperator.operator_div())
-        self._operator_table.append(BinaryOperator.operator_mod())
-        self._operator_table.append(BinaryOperator.operator_assignment())
-        self._operator_table.append(BinaryOperator.operator_equal_to())
-        self._operator_table.append(BinaryOperator.operator_not_equal_to())
-        self._operator_table.append(BinaryOperator.operator_starstar())
-        self._operator_table.append(BinaryOperator.operator_in())
-        self._operator_table.append(BinaryOperator.operator_and())
-        self._operator_table.append(BinaryOperator.operator_or())
-        self._operator_table.append(BinaryOperator.operator_greater_than())
-        self._operator_table.append(BinaryOperator.operator_greater_or_equal_to())
-        self._operator_table.append(BinaryOperator.operator_less_than())
-        self._operator_table.append(BinaryOperator.operator_less_or_equal_to())
-        self._operator_table.append(UnaryOperator.operator_not())
-        self._operator_table.append(UnaryOperator.operator_abs())
-        self._operator_table.append(UnaryOperator.operator_arithmetic_negation())
-        self._operator_table.append(UnaryOperator.operator_arithmetic_neutral())
-        self._operator_table.append(UnaryOperator.operator_uparrow())
-        self._operator_table.append(NeutralOperator.operator_left_parentheses())
-        self._operator_table.append(NeutralOperator.operator_right_parentheses())
+        for operator in _OPERATORS_:
+            self._operator_table.append(operator)
 
 
         # initialize the control stack for BEGIN and END
@@ -269,7 +312,7 @@ class DeftPascalCompiler:
         self._ic.flush()
 
         if len(token_list) > 2:
-            _MODULE_LOGGER_.warning("[{0}] variables detected - all will be ignored".format(action_name))
+            self._diagnostics.warning("[{0}] variables detected - all will be ignored", action_name)
 
 
     def _compound_statement(self, action_name, input_list, working_stack):
@@ -277,8 +320,8 @@ class DeftPascalCompiler:
         COMPOUND_STATEMENT
         input_list -> BEGIN Tree() Tree() Tree() ... END
         """
-        while input_list:
-            self._internal_compile(input_list.pop(0), working_stack)
+        for statement in input_list:
+            self._internal_compile(statement, working_stack)
 
 
     def _reserved_structure_begin(self, action_name, input_token, working_stack):
@@ -317,7 +360,7 @@ class DeftPascalCompiler:
 
         if action == self._GLB_MAIN_END:
             for i in self._symbol_table.instances_of(ProcedureForwardIdentifier):
-                _MODULE_LOGGER_.error("unresolved forward reference to '{0}'".format(i))
+                self._diagnostics.error("unresolved forward reference to '{0}'", i)
 
 
     def _constant_definition_part(self, action_name, input_list, working_stack):
@@ -328,11 +371,8 @@ class DeftPascalCompiler:
         # initialise the intermediate_code engine
         self._ic.init(action_name)
 
-        # discard reserved word CONST
-        input_list.pop(0)
-
-        # process declarations
-        for constant_definition in input_list:
+        # process declarations, skipping the reserved word CONST
+        for constant_definition in input_list[1:]:
 
             self._internal_compile(constant_definition, [])
 
@@ -352,31 +392,40 @@ class DeftPascalCompiler:
                       ]
         """
         # extract the identifier
-        constant_identifier = input_list.pop(0).value
+        constant_identifier = input_list[0].value
 
         # identifier - it must not exist in the symbol_table yet
         if self._symbol_table.contains(constant_identifier, equal_level_only=False):
-            _MODULE_LOGGER_.error("[{0}] constant identifier '{1}' already declared ".format(action_name, constant_identifier))
+            self._diagnostics.error("[{0}] constant identifier '{1}' already declared ", action_name, constant_identifier)
 
         else:
-            # discard the operator =
-            input_list.pop(0)
-
-            # process the constant_expression (literals)
-            stack = self._internal_compile(input_list.pop(0), [])
+            # process the constant_expression (literals), after the operator =
+            stack = self._internal_compile(input_list[2], [])
             if stack:
                 expression = ConstantExpression.from_list(stack)
                 if expression is None:
                     msg = "[{0}] incompatible types in expression: {1}"
-                    _MODULE_LOGGER_.error(msg.format(action_name, expression))
+                    self._diagnostics.error(msg, action_name, expression)
 
                 else:
+                    # the expression is folded to the literal of its value, when it can be evaluated now
+                    overflows = []
+                    try:
+                        expression = expression.folded(overflows)
+                    except ValueError as error:
+                        msg = "[{0}] constant expression '{1}' cannot be evaluated: {2}"
+                        self._diagnostics.error(msg, action_name, constant_identifier, error)
+                        return working_stack
+                    for value, wrapped in overflows:
+                        msg = "[{0}] constant expression '{1}' overflows 16 bits: {2} wraps around to {3}"
+                        self._diagnostics.warning(msg, action_name, constant_identifier, value, wrapped)
+
                     new_constant = ConstantIdentifier(constant_identifier, expression)
 
                     # constant - its value must not exceed the types available in the target environment
                     compliant = new_constant.complies_to_type_restrictions()
                     if compliant is None:
-                        _MODULE_LOGGER_.warning("[{0}] constant expression '{1}' cannot be validated at compilation".format(action_name, constant_identifier))
+                        self._diagnostics.warning("[{0}] constant expression '{1}' cannot be validated at compilation", action_name, constant_identifier)
                         compliant = True
 
                     if compliant:
@@ -387,13 +436,13 @@ class DeftPascalCompiler:
                         self._ic.push(new_constant)
 
                         # log successful declaration
-                        _MODULE_LOGGER_.debug("[{0}] new constant declared : {1}".format(action_name, new_constant))
+                        self._diagnostics.debug("[{0}] new constant declared : {1}", action_name, new_constant)
 
                     else:
-                        _MODULE_LOGGER_.error("[{0}] constant '{1}' not compatible with type limitations".format(action_name, new_constant))
+                        self._diagnostics.error("[{0}] constant '{1}' not compatible with type limitations", action_name, new_constant)
 
             else:
-                _MODULE_LOGGER_.error("[{0}] invalid expression in definition of constant '{1}'".format(action_name, constant_identifier))
+                self._diagnostics.error("[{0}] invalid expression in definition of constant '{1}'", action_name, constant_identifier)
 
         return working_stack
 
@@ -430,7 +479,7 @@ class DeftPascalCompiler:
 
         else:
             msg = "[{0}] :  Reference to undeclared constant '{1}'"
-            _MODULE_LOGGER_.error(msg.format(action_name, identifier_name))
+            self._diagnostics.error(msg, action_name, identifier_name)
 
         return working_stack
 
@@ -443,11 +492,8 @@ class DeftPascalCompiler:
         # initialise the intermediate_code engine
         self._ic.init(action_name)
 
-        # discard reserved word VAR
-        input_list.pop(0)
-
-        # process declarations
-        for variable_declaration in input_list:
+        # process declarations, skipping the reserved word VAR
+        for variable_declaration in input_list[1:]:
 
             self._internal_compile(variable_declaration, [])
 
@@ -466,38 +512,39 @@ class DeftPascalCompiler:
         - (special case) the TYPE might be a string with a specific dimension. 
             In this case, there are following tokens after type: '(' 'NUMBER' ')'
             We detect the special case based on the '(' presence
-            pop the 3 of them and let the default case code continue.
+            skip the 3 of them and let the default case code continue.
         - (default case) the TYPE is at the end of the input list. 
-            In this case, pop it out and collect the value.
+            In this case, collect the value and skip it.
+        end marks the tokens not yet processed, the identifiers are those before it.
         """
+        end = len(input_list)
         string_dimension = None
         if input_list[-1].type == "RIGHT_PARENTHESES":    # handling the string with dimension special case
-            input_list.pop()    # discard the )
-            string_dimension = input_list.pop()
-            input_list.pop()    # discard the (
+            string_dimension = input_list[-2]
+            end = end - 3    # skip ( dimension )
 
-        # type_identifier = input_list.pop().value.upper()
-        type_identifier = input_list.pop()
+        # type_identifier = input_list[end - 1].value.upper()
+        type_identifier = input_list[end - 1]
+        end = end - 1
         if type_identifier.type == "IDENTIFIER":
-            # identifier is of a custom type and their definition is case sensitive/relevant
+            # identifier is of a custom type, stored under its identifier key
             type_identifier = type_identifier.value
         else:
             # identifier is a basic type and those are stored in the symbol table as uppercase
             type_identifier = type_identifier.value.upper()
 
-        # check if a pointer is being declared - if so, pop it out
+        # check if a pointer is being declared - if so, skip it
         is_pointer = False
-        if input_list[-1].type == "OPERATOR_UPARROW":
+        if input_list[end - 1].type == "OPERATOR_UPARROW":
             is_pointer = True
-            input_list.pop()
+            end = end - 1
 
         type_symbol = self._symbol_table.retrieve(type_identifier, equal_level_only=False)
 
         if type_symbol:
 
             if string_dimension:
-                type_symbol = copy.copy(type_symbol)
-                type_symbol.dimension = string_dimension
+                type_symbol = string_type(string_dimension)
 
             if is_pointer:
                 aux = type_symbol
@@ -505,7 +552,7 @@ class DeftPascalCompiler:
                 # type_symbol.type = aux
 
             # process each identifier for the given variable_type
-            for token in input_list:
+            for token in input_list[:end]:
 
                 if not token.type == "COMMA":
 
@@ -515,7 +562,7 @@ class DeftPascalCompiler:
                     if self._symbol_table.contains(identifier, equal_level_only=False):
 
                         msg = "[{0}] identifier '{1}' already declared."
-                        _MODULE_LOGGER_.error(msg.format(action_name, identifier))
+                        self._diagnostics.error(msg, action_name, identifier)
 
                     else:
 
@@ -528,12 +575,12 @@ class DeftPascalCompiler:
                         self._ic.push(new_variable)
 
                         # log successful declaration
-                        _MODULE_LOGGER_.debug("[{0}] new identifier declared : {1}".format(action_name, new_variable))
+                        self._diagnostics.debug("[{0}] new identifier declared : {1}", action_name, new_variable)
 
         else:
 
             msg = "[{0}] unknown type '{1}' reference in declaration."
-            _MODULE_LOGGER_.error(msg.format(action_name, type_identifier))
+            self._diagnostics.error(msg, action_name, type_identifier)
 
 
     def _variable_access(self, action_name, input_list, working_stack):
@@ -558,7 +605,7 @@ class DeftPascalCompiler:
             operator_symbol = self._operator_table.retrieve(operator_name, equal_level_only=False)
 
         else:
-            _MODULE_LOGGER_.error('Error - unknown AST object {0}'.format(input_list))
+            self._diagnostics.error('Error - unknown AST object {0}', input_list)
             raise TypeError
 
         # identifier - it must exist in the symbol table
@@ -571,7 +618,7 @@ class DeftPascalCompiler:
 
         else:
             msg = "[{0}] :  Reference to undeclared variable '{1}'"
-            _MODULE_LOGGER_.error(msg.format(action_name, identifier_name))
+            self._diagnostics.error(msg, action_name, identifier_name)
 
         return working_stack
 
@@ -580,7 +627,7 @@ class DeftPascalCompiler:
         """
         process LABEL_DECLARATION_PART
         """
-        _MODULE_LOGGER_.warning("[{0}] - all will be ignored".format(action_name))
+        self._diagnostics.warning("[{0}] - all will be ignored", action_name)
 
 
     def _assignment_statement(self, action_name, input_list, working_stack):
@@ -590,7 +637,7 @@ class DeftPascalCompiler:
         token_list -> identifier := expression
         """
         # process the identifier
-        working_stack = self._internal_compile(input_list.pop(0), [])
+        working_stack = self._internal_compile(input_list[0], [])
 
         if working_stack:
 
@@ -600,27 +647,28 @@ class DeftPascalCompiler:
 
             # check the identifier receiving the assignment is variable.
             if isinstance(identifier, ConstantIdentifier):
-                _MODULE_LOGGER_.error("[{0}] : invalid assignment to constant '{1}'".format(action_name, working_stack))
+                self._diagnostics.error("[{0}] : invalid assignment to constant '{1}'", action_name, working_stack)
 
-            # consume the operator :=
-            token = input_list.pop(0)
+            # process the operator :=
+            token = input_list[1]
             operator = self._operator_table.retrieve(token.type, equal_level_only=False)
             if not operator:
                 raise SystemError("Operator table not working correctly")
             working_stack.append(operator)
 
             # process the expression
-            expression_stack = self._internal_compile(input_list.pop(), [])
+            expression_stack = self._internal_compile(input_list[-1], [])
 
             if expression_stack:
 
                 expression = BaseExpression.from_list(working_stack + expression_stack)
                 if expression is None:
                     msg = "[{0}] incompatible types in expression: {1}"
-                    _MODULE_LOGGER_.error(msg.format(action_name, expression))
+                    self._diagnostics.error(msg, action_name, expression)
 
                 else:
-                    expression = BaseExpression.from_list(expression_stack)
+                    # the right side of the assignment, reusing the tree of the whole assignment
+                    expression = BaseExpression.from_node(expression.tree.operands[1], expression_stack)
                     # check type compatibility
                     # expression_type = self._perform_type_check(action_name, working_stack + expression_stack)
 
@@ -636,7 +684,7 @@ class DeftPascalCompiler:
                     self._ic.push(working_stack)
                     self._ic.flush()
 
-                    _MODULE_LOGGER_.debug("[{0}] : {1}".format(action_name, working_stack))
+                    self._diagnostics.debug("[{0}] : {1}", action_name, working_stack)
 
         return working_stack
 
@@ -646,42 +694,67 @@ class DeftPascalCompiler:
         # this is called from other actions and therefore it does not create its own action on the intermediate code
         # it also does not need to flush the intermediate code. this will be done in another action.
         for token in token_list:
-            if isinstance(token, Tree):
+            if isinstance(token, Node):
                 working_stack = self._internal_compile(token, working_stack)
 
-            elif isinstance(token, Token):
-                a_symbol = self._symbol_table.retrieve(token.value, equal_level_only=False)
-                if not a_symbol:
-
-                    a_symbol = self._symbol_table.retrieve(token.type, equal_level_only=False)
-                    if not a_symbol:
-
-                        a_symbol = self._operator_table.retrieve(token.type, equal_level_only=False)
-                        if not a_symbol:
-
-                            if token.type in ["UNSIGNED_DECIMAL", "SIGNED_DECIMAL", "NUMBER_BINARY", "NUMBER_OCTAL",
-                                              "NUMBER_HEXADECIMAL", "UNSIGNED_REAL", "SIGNED_REAL"]:
-                                a_symbol = NumericLiteral.from_token(token)
-                                if not a_symbol:
-                                    _MODULE_LOGGER_.error("[{0}] literal '{1}' not compatible with type limitations".format(action_name, token))
-
-                            elif token.type in ["CHARACTER", "STRING_VALUE"]:
-                                a_symbol = StringLiteral.from_token(token)
-                                if not a_symbol:
-                                    _MODULE_LOGGER_.error("[{0}] literal '{1}' not compatible with type limitations".format(action_name, token))
-
-                            else:
-                                msg = "[{0}] unknown symbol '{1}' used in expression"
-                                _MODULE_LOGGER_.error(msg.format(action_name, token.type))
-
+            elif isinstance(token, Leaf):
+                # one dispatch on the type of the token, see _EXPRESSION_TOKENS
+                handler = self._EXPRESSION_TOKENS.get(token.type)
+                if handler:
+                    a_symbol = handler(self, action_name, token)
+                else:
+                    a_symbol = self._expression_other(action_name, token)
                 if a_symbol:
                     working_stack.append(a_symbol)
 
             else:
-                raise NotImplementedError("expected a Token or a Tree but received '{0}'".format(token))
+                raise NotImplementedError("expected a Leaf or a Node but received '{0}'".format(token))
 
         return working_stack
 
+    def _expression_identifier(self, action_name, token):
+        return self._found_in_expression(action_name, token, self._symbol_table.retrieve(token.value, equal_level_only=False))
+
+    def _expression_constant(self, action_name, token):
+        return self._found_in_expression(action_name, token, _BUILTIN_CONSTANTS_.get(token.type))
+
+    def _expression_operator(self, action_name, token):
+        return self._found_in_expression(action_name, token, self._operator_table.retrieve(token.type, equal_level_only=False))
+
+    def _found_in_expression(self, action_name, token, a_symbol):
+        if not a_symbol:
+            self._diagnostics.error("[{0}] unknown symbol '{1}' used in expression", action_name, token.type)
+        return a_symbol
+
+    def _expression_numeric_literal(self, action_name, token):
+        a_symbol = NumericLiteral.from_token(token)
+        if not a_symbol:
+            self._diagnostics.error("[{0}] literal '{1}' not compatible with type limitations", action_name, token)
+        return a_symbol
+
+    def _expression_string_literal(self, action_name, token):
+        a_symbol = StringLiteral.from_token(token)
+        if not a_symbol:
+            self._diagnostics.error("[{0}] literal '{1}' not compatible with type limitations", action_name, token)
+        return a_symbol
+
+    def _expression_other(self, action_name, token):
+        # a token the table does not know is looked up as the expressions were before the table
+        a_symbol = self._symbol_table.retrieve(token.value, equal_level_only=False)
+        if not a_symbol:
+            a_symbol = _BUILTIN_CONSTANTS_.get(token.type)
+            if not a_symbol:
+                a_symbol = self._operator_table.retrieve(token.type, equal_level_only=False)
+        return self._found_in_expression(action_name, token, a_symbol)
+
+    # how _expression turns a token into a symbol, by the type of the token, built once. apart from
+    # _expression_other, for the types not listed, a handler does at most one lookup in the symbol or operator table
+    _EXPRESSION_TOKENS = {"IDENTIFIER": _expression_identifier}
+    _EXPRESSION_TOKENS.update(dict.fromkeys(_CONSTANT_TOKENS_, _expression_constant))
+    _EXPRESSION_TOKENS.update(dict.fromkeys(_OPERATOR_TOKENS_, _expression_operator))
+    _EXPRESSION_TOKENS.update(dict.fromkeys(_NUMERIC_TOKENS_, _expression_numeric_literal))
+    _EXPRESSION_TOKENS.update(dict.fromkeys(_STRING_TOKENS_, _expression_string_literal))
+
 
     def _repeat_statement(self, action_name, input_list, working_stack):
         """
@@ -697,19 +770,19 @@ class DeftPascalCompiler:
         # generate the intermediate code
         self._ic.init(action_name)
         working_stack = []
+        children = iter(input_list)
 
         # process reserved word REPEAT
-        keyword = BaseKeyword.from_token(input_list.pop(0))
+        keyword = BaseKeyword.from_token(next(children))
         working_stack.append(keyword)
         self._ic.push(working_stack)
         self._ic.flush()
-        _MODULE_LOGGER_.debug("[{0}] {1}".format(action_name, working_stack))
+        self._diagnostics.debug("[{0}] {1}", action_name, working_stack)
 
         # process statements
         working_stack = []
-        while True:
-            token = input_list.pop(0)
-            if isinstance(token, Token) and token.type == "RESERVED_STATEMENT_UNTIL":
+        for token in children:
+            if isinstance(token, Leaf) and token.type == "RESERVED_STATEMENT_UNTIL":
                 keyword = BaseKeyword.from_token(token)
                 working_stack.append(keyword)
                 break
@@ -720,12 +793,12 @@ class DeftPascalCompiler:
         action_name = action_name + "_UNTIL"
 
         # process expression after UNTIL
-        expression_stack = self._internal_compile(input_list.pop(0), [])
+        expression_stack = self._internal_compile(next(children), [])
         expression = BooleanExpression.from_list(expression_stack)
 
         if expression is None:
             msg = "[{0}] expected boolean expression but found: {1}"
-            _MODULE_LOGGER_.error(msg.format(action_name, expression_stack))
+            self._diagnostics.error(msg, action_name, expression_stack)
 
         else:
             working_stack.append(expression)
@@ -735,7 +808,7 @@ class DeftPascalCompiler:
             self._ic.push(working_stack)
             self._ic.flush()
 
-            _MODULE_LOGGER_.debug("[{0}] {1}".format(action_name, working_stack))
+            self._diagnostics.debug("[{0}] {1}", action_name, working_stack)
 
         return working_stack
 
@@ -747,17 +820,18 @@ class DeftPascalCompiler:
         assignment_statement is a Tree of multiple objects
         """
         working_stack = []
+        children = iter(input_list)
 
         # process reserved word FOR
-        keyword = BaseKeyword.from_token(input_list.pop(0))
+        keyword = BaseKeyword.from_token(next(children))
         working_stack.append(keyword)
 
         # process the control variable (or expression)
-        control_variable_stack = self._internal_compile(input_list.pop(0), [])
+        control_variable_stack = self._internal_compile(next(children), [])
         working_stack = working_stack + control_variable_stack
 
-        # consume the operator :=
-        token = input_list.pop(0)
+        # process the operator :=
+        token = next(children)
         operator = self._operator_table.retrieve(token.type, equal_level_only=False)
         if not operator:
             raise SystemError("Operator table not working correctly")
@@ -766,35 +840,35 @@ class DeftPascalCompiler:
         working_stack.append(operator)
 
         # process the 'initial_value' (or expression) on the for
-        expression_stack = self._internal_compile(input_list.pop(0), [])
+        expression_stack = self._internal_compile(next(children), [])
         expression = IntegerExpression.from_list(control_variable_stack + expression_stack)
 
         if expression is None:
             msg = "[{0}] expected integer expression but found: {1}"
-            _MODULE_LOGGER_.error(msg.format(action_name, expression_stack))
+            self._diagnostics.error(msg, action_name, expression_stack)
 
         else:
-            expression = IntegerExpression.from_list(expression_stack)
+            expression = IntegerExpression.from_node(expression.tree.operands[1], expression_stack)
             working_stack.append(expression)
 
         # emit reserved word to / downto
-        keyword = BaseKeyword.from_token(input_list.pop(0))
+        keyword = BaseKeyword.from_token(next(children))
         working_stack.append(keyword)
 
         # process the 'final_value' on the for
-        expression_stack = self._internal_compile(input_list.pop(0), [])
+        expression_stack = self._internal_compile(next(children), [])
         expression = IntegerExpression.from_list(control_variable_stack + expression_stack)
 
         if expression is None:
             msg = "[{0}] expected integer expression but found: {1}"
-            _MODULE_LOGGER_.error(msg.format(action_name, expression_stack))
+            self._diagnostics.error(msg, action_name, expression_stack)
 
         else:
-            expression = IntegerExpression.from_list(expression_stack)
+            expression = IntegerExpression.from_node(expression.tree.operands[1], expression_stack)
             working_stack.append(expression)
 
         # emit reserved word do
-        keyword = BaseKeyword.from_token(input_list.pop(0))
+        keyword = BaseKeyword.from_token(next(children))
         working_stack.append(keyword)
 
         # generate the intermediate code
@@ -802,11 +876,11 @@ class DeftPascalCompiler:
         self._ic.push(working_stack)
         self._ic.flush()
 
-        _MODULE_LOGGER_.debug("[{0}] {1}".format(action_name, working_stack))
+        self._diagnostics.debug("[{0}] {1}", action_name, working_stack)
 
         # process statements nested inside the for
         self._increase_scope(action_name)
-        result = self._internal_compile(input_list.pop(0), [])
+        result = self._internal_compile(next(children), [])
         self._decrease_scope()
         return result
 
@@ -818,17 +892,18 @@ class DeftPascalCompiler:
         assignment_statement is a Tree of multiple objects
         """
         working_stack = []
+        children = iter(input_list)
 
         # process reserved word FOR
-        keyword = BaseKeyword.from_token(input_list.pop(0))
+        keyword = BaseKeyword.from_token(next(children))
         working_stack.append(keyword)
 
         # process the control variable (or expression)
-        control_variable_stack = self._internal_compile(input_list.pop(0), [])
+        control_variable_stack = self._internal_compile(next(children), [])
         working_stack = working_stack + control_variable_stack
 
-        # consume the operator :=
-        token = input_list.pop(0)
+        # process the operator :=
+        token = next(children)
         operator = self._operator_table.retrieve(token.type, equal_level_only=False)
         if not operator:
             raise SystemError("Operator table not working correctly")
@@ -837,35 +912,35 @@ class DeftPascalCompiler:
         working_stack.append(operator)
 
         # process the 'initial_value' (or expression) on the for
-        expression_stack = self._internal_compile(input_list.pop(0), [])
+        expression_stack = self._internal_compile(next(children), [])
         expression = IntegerExpression.from_list(control_variable_stack + expression_stack)
 
         if expression is None:
             msg = "[{0}] expected integer expression but found: {1}"
-            _MODULE_LOGGER_.error(msg.format(action_name, expression_stack))
+            self._diagnostics.error(msg, action_name, expression_stack)
 
         else:
-            expression = IntegerExpression.from_list(expression_stack)
+            expression = IntegerExpression.from_node(expression.tree.operands[1], expression_stack)
             working_stack.append(expression)
 
         # emit reserved word to / downto
-        keyword = BaseKeyword.from_token(input_list.pop(0))
+        keyword = BaseKeyword.from_token(next(children))
         working_stack.append(keyword)
 
         # process the 'final_value' on the for
-        expression_stack = self._internal_compile(input_list.pop(0), [])
+        expression_stack = self._internal_compile(next(children), [])
         expression = IntegerExpression.from_list(control_variable_stack + expression_stack)
 
         if expression is None:
             msg = "[{0}] expected integer expression but found: {1}"
-            _MODULE_LOGGER_.error(msg.format(action_name, expression_stack))
+            self._diagnostics.error(msg, action_name, expression_stack)
 
         else:
-            expression = IntegerExpression.from_list(expression_stack)
+            expression = IntegerExpression.from_node(expression.tree.operands[1], expression_stack)
             working_stack.append(expression)
 
         # emit reserved word do
-        keyword = BaseKeyword.from_token(input_list.pop(0))
+        keyword = BaseKeyword.from_token(next(children))
         working_stack.append(keyword)
 
         # generate the intermediate code
@@ -873,11 +948,11 @@ class DeftPascalCompiler:
         self._ic.push(working_stack)
         self._ic.flush()
 
-        _MODULE_LOGGER_.debug("[{0}] {1}".format(action_name, working_stack))
+        self._diagnostics.debug("[{0}] {1}", action_name, working_stack)
 
         # process statements nested inside the for
         self._increase_scope(action_name)
-        result = self._internal_compile(input_list.pop(0), [])
+        result = self._internal_compile(next(children), [])
         self._decrease_scope()
         return result
 
@@ -889,24 +964,25 @@ class DeftPascalCompiler:
         compound_statement is a Tree of multiple objects
         """
         working_stack = []
+        children = iter(input_list)
 
         # process reserved word WHILE
-        keyword = BaseKeyword.from_token(input_list.pop(0))
+        keyword = BaseKeyword.from_token(next(children))
         working_stack.append(keyword)
 
         # process control expression
-        expression_stack = self._internal_compile(input_list.pop(0), [])
+        expression_stack = self._internal_compile(next(children), [])
         expression = BooleanExpression.from_list(expression_stack)
 
         if expression is None:
             msg = "[{0}] expected boolean expression but found: {1}"
-            _MODULE_LOGGER_.error(msg.format(action_name, expression_stack))
+            self._diagnostics.error(msg, action_name, expression_stack)
 
         else:
             working_stack.append(expression)
 
         # emit reserved word do
-        keyword = BaseKeyword.from_token(input_list.pop(0))
+        keyword = BaseKeyword.from_token(next(children))
         working_stack.append(keyword)
 
         # generate the intermediate code
@@ -914,11 +990,11 @@ class DeftPascalCompiler:
         self._ic.push(working_stack)
         self._ic.flush()
 
-        _MODULE_LOGGER_.debug("[{0}] {1}".format(action_name, working_stack))
+        self._diagnostics.debug("[{0}] {1}", action_name, working_stack)
 
         # process statements nested inside the while
         self._increase_scope(action_name)
-        result = self._internal_compile(input_list.pop(0), [])
+        result = self._internal_compile(next(children), [])
         self._decrease_scope()
         return result
 
@@ -932,11 +1008,8 @@ class DeftPascalCompiler:
         # initialise the intermediate code engine
         self._ic.init(action_name)
 
-        # discard reserved word TYPE
-        input_list.pop(0)
-
-        # process declarations
-        for type_definition in input_list:
+        # process declarations, skipping the reserved word TYPE
+        for type_definition in input_list[1:]:
 
             self._internal_compile(type_definition, [])
 
@@ -964,7 +1037,7 @@ class DeftPascalCompiler:
         # identifier - it must NOT exist in the symbol_table yet
         if self._symbol_table.contains(identifier, equal_level_only=False):
             msg = "[{0}] identifier '{1}' already declared in current scope"
-            _MODULE_LOGGER_.error(msg.format(action_name, identifier))
+            self._diagnostics.error(msg, action_name, identifier)
 
         else:
             # type_identifier - it must exist in the symbol table
@@ -993,12 +1066,12 @@ class DeftPascalCompiler:
                 self._ic.push(new_type_symbol)
 
                 # log successful declaration
-                _MODULE_LOGGER_.debug("[{0}] new type defined {1}".format(action_name, new_type_symbol))
+                self._diagnostics.debug("[{0}] new type defined {1}", action_name, new_type_symbol)
 
             else:
 
                 msg = "[{0}] reference to unknown type '{1}'"
-                _MODULE_LOGGER_.error(msg.format(action_name, type_identifier))
+                self._diagnostics.error(msg, action_name, type_identifier)
 
         return working_stack
 
@@ -1010,36 +1083,31 @@ class DeftPascalCompiler:
         working_stack = []
 
         # retrieve the actual procedure identifier from the symbol_table
-        token = input_list.pop(0)
+        procedure_name = input_list[0].value
 
-        # ensure in built procedures use a lowercase name
-        if token.value.upper() in ["WRITE", "WRITELN"]:
-            token.value = token.value.lower()
-
-        identifier = self._symbol_table.retrieve(token.value, equal_level_only=False)
+        identifier = self._symbol_table.retrieve(procedure_name, equal_level_only=False)
         if identifier:
             # push the identifier to the working stack
             working_stack.append(identifier)
 
-            # discard the open and close parentheses operands
-            input_list.pop(0)
-            input_list.pop(-1)
+            # skip the open and close parentheses operands
+            parameter_list = input_list[2:-1]
 
             # calculate the number of parameters in the procedure call
-            parameters_counter = len(input_list) - input_list.count(",")
+            parameters_counter = len(parameter_list) - parameter_list.count(",")
             if not identifier.accepts_parameters_count(parameters_counter):
                 msg = "[{0}] :  '{1}' parameters passed to procedure {2} but '{3}' expected."
-                _MODULE_LOGGER_.error(msg.format(action_name, parameters_counter, identifier.name, identifier.argument_counter))
+                self._diagnostics.error(msg, action_name, parameters_counter, identifier.name, identifier.argument_counter)
 
             # process each parameter expression, discard the commas used as separators
             parameter_index = 0
-            for token in input_list:
-                if isinstance(token, Token):
+            for token in parameter_list:
+                if isinstance(token, Leaf):
                     if not token.type == "COMMA":
                         msg = "[{0}] :  Unknown token '{1}' passed in procedure parameter."
-                        _MODULE_LOGGER_.error(msg.format(action_name, token))
+                        self._diagnostics.error(msg, action_name, token)
 
-                elif isinstance(token, Tree):
+                elif isinstance(token, Node):
                     parameter_index = parameter_index + 1
 
                     value_to_print_stack = self._internal_compile(token.children[0], [])
@@ -1058,7 +1126,7 @@ class DeftPascalCompiler:
 
                     if (expression_field_width or expression_decimal_field) and identifier.name.upper() not in ["WRITE", "WRITELN"]:
                         msg = "[{0}] Formatting parameters incompatible with {1}}. Formatting will be ignored."
-                        _MODULE_LOGGER_.warning(msg.format(action_name, identifier.name))
+                        self._diagnostics.warning(msg, action_name, identifier.name)
                         expression_field_width = None
                         expression_decimal_field = None
 
@@ -1067,7 +1135,7 @@ class DeftPascalCompiler:
 
                     if not identifier.is_parameter_compatible(parameter, parameter_index):
                         msg = "[{0}] :  Incompatible parameter '{1}' passed to procedure {2}"
-                        _MODULE_LOGGER_.error(msg.format(action_name, parameter, identifier))
+                        self._diagnostics.error(msg, action_name, parameter, identifier)
 
                     else:
                         # push to the working stack
@@ -1075,19 +1143,19 @@ class DeftPascalCompiler:
 
                 else:
                     msg = "[{0}] :  Unknown parameter '{1}' passed to procedure {2}"
-                    _MODULE_LOGGER_.error(msg.format(action_name, token, identifier))
+                    self._diagnostics.error(msg, action_name, token, identifier)
 
             # generate the intermediate code
             self._ic.init(action_name)
             self._ic.push(working_stack)
             self._ic.flush()
 
-            _MODULE_LOGGER_.debug("[{0}] {1} {2} {3}".format(action_name, identifier, parameters_counter, working_stack))
+            self._diagnostics.debug("[{0}] {1} {2} {3}", action_name, identifier, parameters_counter, working_stack)
 
         else:
 
             msg = "[{0}] {1} :  Unknown procedure '{1}' referenced."
-            _MODULE_LOGGER_.error(msg.format(action_name, token.value))
+            self._diagnostics.error(msg, action_name, procedure_name)
 
         return working_stack
 
@@ -1105,11 +1173,9 @@ class DeftPascalCompiler:
         # initialise the intermediate code engine
         self._ic.init(action_name)
 
-        # discard the reserved word PROCEDURE
-        input_list.pop(0)
-
-        # retrieve the identifier for the new procedure
-        identifier = input_list.pop(0).value
+        # retrieve the identifier for the new procedure, after the reserved word PROCEDURE
+        identifier = input_list[1].value
+        input_list = input_list[2:]
 
         # the procedure declaration in hand can be an external, a forward or a standard one
         # this is identified by the token after the identifier. it can be a proc_or_func_directive or a procedure_block
@@ -1120,7 +1186,7 @@ class DeftPascalCompiler:
                 pi_class = ProcedureExternalIdentifier
             else:
                 raise KeyError("unexpected keyword '{0}' in proc_or_func_directive".format(input_list[0].value))
-            input_list.pop(-1)
+            input_list = input_list[:-1]
 
         else:
             pi_class = ProcedureIdentifier
@@ -1131,16 +1197,16 @@ class DeftPascalCompiler:
         symbol = self._symbol_table.retrieve(identifier, equal_level_only=False)
         if not symbol:
             self._symbol_table.append(pi)
-            _MODULE_LOGGER_.debug("[{0}] new procedure defined {1}".format(action_name, pi))
+            self._diagnostics.debug("[{0}] new procedure defined {1}", action_name, pi)
 
         elif isinstance(symbol, ProcedureForwardIdentifier):
             # replace in the symbol_table a forward declaration with the actual declaration
             self._symbol_table.replace(identifier, pi)
-            _MODULE_LOGGER_.debug("[{0}] forward procedure '{1}' resolved".format(action_name, identifier))
+            self._diagnostics.debug("[{0}] forward procedure '{1}' resolved", action_name, identifier)
 
         else:
             msg = "[{0}] identifier '{1}' already declared"
-            _MODULE_LOGGER_.error(msg.format(action_name, identifier))
+            self._diagnostics.error(msg, action_name, identifier)
 
         self._ic.push(pi)
         self._ic.flush()
@@ -1149,20 +1215,18 @@ class DeftPascalCompiler:
 
         # process the procedure parameters if those are present
         if len(input_list) > 0 and input_list[0].data.upper() == "FORMAL_PARAMETER_LIST":
-            argument_list = input_list.pop(0).children
-
-            # discard open and close parameters characters -> (  )
-            argument_list.pop(0)
-            argument_list.pop(-1)
+            # skip open and close parameters characters -> (  )
+            argument_list = input_list[0].children[1:-1]
+            input_list = input_list[1:]
 
             # process each argument
             for ast in argument_list:
                 if ast.data.upper() == "VALUE_PARAMETER_SPECIFICATION":
 
                     # process the type of the argument list
-                    token = ast.children.pop(-1)
+                    token = ast.children[-1]
                     if token.type == "IDENTIFIER":
-                        # identifier is of a custom type and their definition is case sensitive/relevant
+                        # identifier is of a custom type, stored under its identifier key
                         type_identifier = self._symbol_table.retrieve(token.value, equal_level_only=False)
                     else:
                         # identifier is a basic type and those are stored in the symbol table as uppercase
@@ -1170,7 +1234,7 @@ class DeftPascalCompiler:
 
                     if type_identifier:
                         # process the arguments
-                        for token in ast.children:
+                        for token in ast.children[:-1]:
                             if token.type == "IDENTIFIER":
                                 # create the variables using the parameter_type
                                 new_variable = Identifier(token.value, type_identifier, None)
@@ -1185,20 +1249,19 @@ class DeftPascalCompiler:
                                 pi.add_argument(argument)
                     else:
                         msg = "[{0}] unknown type '{1}' reference in procedure declaration."
-                        _MODULE_LOGGER_.error(msg.format(action_name, identifier))
+                        self._diagnostics.error(msg, action_name, identifier)
 
                 else:
-                    _MODULE_LOGGER_.warning("parameter class '{0}' not yet supported".format(ast))
+                    self._diagnostics.warning("parameter class '{0}' not yet supported", ast)
 
         if len(input_list) > 0 and input_list[0].data.upper() == "PROCEDURE_BLOCK":
             # process the procedure body -> PROCEDURE_BLOCK
             for ast in input_list[0].children:
                 if ast.data.upper() == "PROCEDURE_DECLARATION" and len(ast.children) > 0:
                     msg = "nested procedure or function definition is currently not supported. '{0}' will be ignored."
-                    _MODULE_LOGGER_.warning(msg.format(ast.children[1]))
+                    self._diagnostics.warning(msg, ast.children[1])
                 else:
                     self._internal_compile(ast, [])
-            input_list.pop(0)
 
         self._decrease_scope()
 
@@ -1217,38 +1280,39 @@ class DeftPascalCompiler:
                       ]
         """
         working_stack = []
+        children = iter(input_list)
 
         # process reserved word IF
-        keyword = BaseKeyword.from_token(input_list.pop(0))
+        keyword = BaseKeyword.from_token(next(children))
         working_stack.append(keyword)
 
         # process boolean expression
-        expression_stack = self._internal_compile(input_list.pop(0), [])
+        expression_stack = self._internal_compile(next(children), [])
         expression = BaseExpression.from_list(expression_stack)
 
         if expression is None:
             msg = "[{0}] incompatible types in expression: {1}"
-            _MODULE_LOGGER_.error(msg.format(action_name, expression))
+            self._diagnostics.error(msg, action_name, expression)
 
         elif not expression.type == "RESERVED_TYPE_BOOLEAN":
             msg = "[{0}] expected boolean expression but found: {1}"
-            _MODULE_LOGGER_.error(msg.format(action_name, expression.type))
+            self._diagnostics.error(msg, action_name, expression.type)
 
         else:
             working_stack.append(expression)
 
         # process reserved word THEN
-        keyword = BaseKeyword.from_token(input_list.pop(0))
+        keyword = BaseKeyword.from_token(next(children))
         working_stack.append(keyword)
 
         # generate the intermediate code
         self._ic.init(action_name)
         self._ic.push(working_stack)
         self._ic.flush()
-        _MODULE_LOGGER_.debug("[{0}] {1}".format(action_name, working_stack))
+        self._diagnostics.debug("[{0}] {1}", action_name, working_stack)
 
         # process statements after IF and before ELSE
-        token = input_list.pop(0)
+        token = next(children)
         self._increase_scope(action_name)
         self._internal_compile(token, [])
         self._decrease_scope()
@@ -1258,17 +1322,17 @@ class DeftPascalCompiler:
 
         # process reserved word ELSE
         working_stack = []
-        keyword = BaseKeyword.from_token(input_list.pop(0))
+        keyword = BaseKeyword.from_token(next(children))
         working_stack.append(keyword)
 
         # generate the intermediate code
         self._ic.init(action_name)
         self._ic.push(working_stack)
         self._ic.flush()
-        _MODULE_LOGGER_.debug("[{0}] {1}".format(action_name, working_stack))
+        self._diagnostics.debug("[{0}] {1}", action_name, working_stack)
 
         # process statements after ELSE
-        token = input_list.pop(0)
+        token = next(children)
         self._increase_scope(action_name)
         self._internal_compile(token, [])
         self._decrease_scope()
@@ -1287,38 +1351,39 @@ class DeftPascalCompiler:
                       ]
         """
         working_stack = []
+        children = iter(input_list)
 
         # process reserved word IF
-        keyword = BaseKeyword.from_token(input_list.pop(0))
+        keyword = BaseKeyword.from_token(next(children))
         working_stack.append(keyword)
 
         # process boolean expression
-        expression_stack = self._internal_compile(input_list.pop(0), [])
+        expression_stack = self._internal_compile(next(children), [])
         expression = BaseExpression.from_list(expression_stack)
 
         if expression is None:
             msg = "[{0}] incompatible types in expression: {1}"
-            _MODULE_LOGGER_.error(msg.format(action_name, expression))
+            self._diagnostics.error(msg, action_name, expression)
 
         elif not expression.type == "RESERVED_TYPE_BOOLEAN":
             msg = "[{0}] expected boolean expression but found: {1}"
-            _MODULE_LOGGER_.error(msg.format(action_name, expression.type))
+            self._diagnostics.error(msg, action_name, expression.type)
 
         else:
             working_stack.append(expression)
 
         # process reserved word THEN
-        keyword = BaseKeyword.from_token(input_list.pop(0))
+        keyword = BaseKeyword.from_token(next(children))
         working_stack.append(keyword)
 
         # generate the intermediate code
         self._ic.init(action_name)
         self._ic.push(working_stack)
         self._ic.flush()
-        _MODULE_LOGGER_.debug("[{0}] {1}".format(action_name, working_stack))
+        self._diagnostics.debug("[{0}] {1}", action_name, working_stack)
 
         # process statements after IF and before ELSE
-        token = input_list.pop(0)
+        token = next(children)
         self._increase_scope(action_name)
         self._internal_compile(token, [])
         self._decrease_scope()
@@ -5,14 +5,55 @@ DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original D
 HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
 """
 
-from lark import Lark, UnexpectedCharacters, UnexpectedToken
+import copy
+import hashlib
+import importlib
 import logging
+import os
+import tempfile
+import threading
 
 _MODULE_LOGGER_ = logging.getLogger("deft_pascal_reborn")
 
+# parse tables shipped with the compiler (read-only) and the per-user cache (read-write)
+_PREBUILT_TABLES_PATH_ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "parse_tables")
+_CACHED_TABLES_PATH_ = os.environ.get("DEFT_PASCAL_CACHE_DIR",
+                                      os.path.join(os.path.expanduser("~"), ".cache", "deft_pascal_reborn"))
+
+# module generated by 'python -m utils.build_parser -standalone'. when present, lark itself is not imported
+_STANDALONE_MODULE_ = "components.deft_pascal_standalone"
+
+# the Lark instance is built once per process and shared by every DeftPascalParser
+_SHARED_LARK_ = None
+_RECOVERY_LARK_ = None
+_STREAM_LEXER_ = None
+_LEXER_LARKS_ = {}
+_SHARED_LARK_LOCK_ = threading.Lock()
+
 
 class DeftPascalParser:
 
+    # rules that can be parsed on their own. the extra start symbols let a single procedure or function be reparsed.
+    _START_RULE = "start"
+    _INCREMENTAL_RULES = ["procedure_declaration", "function_declaration"]
+
+    # after a syntax error the input is skipped up to one of these tokens, where parsing resumes
+    _SYNCHRONISING_TOKENS = {"_SEMICOLON",
+                             "RESERVED_STRUCTURE_END",
+                             "RESERVED_DECLARATION_CONST",
+                             "RESERVED_DECLARATION_VAR",
+                             "RESERVED_DECLARATION_LABEL",
+                             "RESERVED_DECLARATION_TYPE",
+                             "RESERVED_DECLARATION_PROCEDURE",
+                             "RESERVED_DECLARATION_FUNCTION"
+                             }
+
+    # changes in these would produce different parse tables, so they are part of the grammar hash
+    _LARK_OPTIONS = {"parser": "lalr",
+                     "propagate_positions": True,
+                     "start": [_START_RULE] + _INCREMENTAL_RULES
+                     }
+
     @staticmethod
     def _grammar():
         specification = """
@@ -117,47 +158,55 @@ class DeftPascalParser:
 
         // PROCEDURE AND FUNCTION DECLARATION
         
-        procedure_and_function_declaration_part : proc_or_func_declaration_list _SEMICOLON
-                                                |
+        _procedure_and_function_declaration_part : _proc_or_func_declaration_list _SEMICOLON
+                                                 |
 
-        proc_or_func_declaration_list : proc_or_func_declaration_list _SEMICOLON proc_or_func_declaration
-                                      | proc_or_func_declaration
+        _proc_or_func_declaration_list : _proc_or_func_declaration_list _SEMICOLON _proc_or_func_declaration
+                                       | _proc_or_func_declaration
  
-        proc_or_func_declaration : procedure_declaration
-                                 | function_declaration
+        _proc_or_func_declaration : procedure_declaration
+                                  | function_declaration
                                  
-        procedure_declaration : procedure_heading _SEMICOLON directive
-                              | procedure_heading _SEMICOLON procedure_block
+        procedure_declaration : _procedure_heading _SEMICOLON proc_or_func_directive
+                              | _procedure_heading _SEMICOLON procedure_block
  
-        procedure_heading : procedure_identification
-                          | procedure_identification formal_parameter_list
+        _procedure_heading : _procedure_identification
+                           | _procedure_identification formal_parameter_list
  
-        directive : RESERVED_STATEMENT_FORWARD
-                  | RESERVED_STATEMENT_EXTERNAL
+        proc_or_func_directive : RESERVED_STATEMENT_FORWARD
+                               | RESERVED_STATEMENT_EXTERNAL
 
-        formal_parameter_list : LEFT_PARENTHESES formal_parameter_section_list RIGHT_PARENTHESES
+        formal_parameter_list : LEFT_PARENTHESES _formal_parameter_section_list RIGHT_PARENTHESES
  
-        formal_parameter_section_list : formal_parameter_section_list _SEMICOLON formal_parameter_section
-                                      | formal_parameter_section
+        _formal_parameter_section_list : _formal_parameter_section_list _SEMICOLON _formal_parameter_section
+                                       | _formal_parameter_section
+
+        _formal_parameter_section : value_parameter_specification
+                                  | variable_parameter_specification
+                                  | procedural_parameter_specification
+                                  | functional_parameter_specification
 
-        formal_parameter_section : value_parameter_specification
-                                 | variable_parameter_specification
-                                 | procedural_parameter_specification
-                                 | functional_parameter_specification
+        value_parameter_specification : _identifier_list _COLON _parameter_type
 
-        value_parameter_specification : _identifier_list _COLON IDENTIFIER
+        variable_parameter_specification : RESERVED_DECLARATION_VAR _identifier_list _COLON _parameter_type
 
-        variable_parameter_specification : RESERVED_DECLARATION_VAR _identifier_list _COLON IDENTIFIER
+        _parameter_type : RESERVED_TYPE_REAL
+                        | RESERVED_TYPE_BOOLEAN
+                        | RESERVED_TYPE_CHAR
+                        | RESERVED_TYPE_INTEGER
+                        | RESERVED_TYPE_STRING
+                        | RESERVED_TYPE_TEXT
+                        | IDENTIFIER
 
-        procedural_parameter_specification : procedure_heading
+        procedural_parameter_specification : _procedure_heading
 
         functional_parameter_specification : function_heading                 
  
-        procedure_identification : RESERVED_DECLARATION_PROCEDURE IDENTIFIER
+        _procedure_identification : RESERVED_DECLARATION_PROCEDURE IDENTIFIER
 
         procedure_block : _block
         
-        function_declaration : function_heading _SEMICOLON directive
+        function_declaration : function_heading _SEMICOLON proc_or_func_directive
                              | function_identification _SEMICOLON function_block
                              | function_heading _SEMICOLON function_block
         
@@ -479,23 +528,460 @@ class DeftPascalParser:
         """
         return specification
 
-    def __init__(self):
-        parser = Lark(self._grammar(), parser='lalr', debug=False)
-        self._parser = parser.parse
+    @classmethod
+    def grammar_hash(cls):
+        specification = "{0}|{1}".format(sorted(cls._LARK_OPTIONS.items()), cls._grammar())
+        return hashlib.sha256(specification.encode("utf8")).hexdigest()
+
+    @classmethod
+    def _tables_file_name(cls):
+        """
+        the parse tables depend only on the grammar text and on the lark version that generated them.
+        both are hashed into the file name so a stale file is never picked up.
+        """
+        import lark
+        key = hashlib.sha256("{0}|{1}".format(lark.__version__, cls.grammar_hash()).encode("utf8")).hexdigest()
+        return "deft_pascal_{0}.lark".format(key[:32])
+
+    @classmethod
+    def _load_tables(cls, directory):
+        """
+        returns the Lark instance stored in directory, or None if there is no usable file there.
+        """
+        from lark import Lark
+        file_name = os.path.join(directory, cls._tables_file_name())
+        if not os.path.isfile(file_name):
+            return None
+        try:
+            with open(file_name, "rb") as file:
+                parser = Lark.load(file)
+            _MODULE_LOGGER_.debug("parse tables loaded from '{0}'".format(file_name))
+            return parser
+        except Exception as error:
+            # a truncated or incompatible file is ignored and the tables are rebuilt
+            _MODULE_LOGGER_.debug("parse tables at '{0}' ignored: {1}".format(file_name, error))
+            return None
+
+    @classmethod
+    def save_tables(cls, directory, parser=None):
+        """
+        builds (if not given) and stores the parse tables in directory.
+        the file is written under a temporary name and then renamed so concurrent readers never see a partial file.
+        returns the file name or None if the directory is not writable.
+        """
+        if parser is None:
+            parser = cls._compile_grammar()
+        file_name = os.path.join(directory, cls._tables_file_name())
+        try:
+            os.makedirs(directory, exist_ok=True)
+            handle, temp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(handle, "wb") as file:
+                    parser.save(file)
+                os.replace(temp_name, file_name)
+            except BaseException:
+                os.remove(temp_name)
+                raise
+        except OSError as error:
+            # read-only installation or cache location - carry on without persisting the tables
+            _MODULE_LOGGER_.debug("parse tables not saved to '{0}': {1}".format(directory, error))
+            return None
+        return file_name
+
+    @classmethod
+    def _compile_grammar(cls):
+        from lark import Lark
+        return Lark(cls._grammar(), debug=False, **cls._LARK_OPTIONS)
+
+    @classmethod
+    def _build_parser(cls, standalone=True):
+        """
+        the generated standalone parser is preferred, then the prebuilt tables and then the user cache.
+        the grammar is only analysed when none is usable, in which case the result is saved to the user cache.
+        """
+        if standalone and _STANDALONE_:
+            return _STANDALONE_.Lark_StandAlone()
+        for directory in [_PREBUILT_TABLES_PATH_, _CACHED_TABLES_PATH_]:
+            parser = cls._load_tables(directory)
+            if parser:
+                return parser
+        parser = cls._compile_grammar()
+        cls.save_tables(_CACHED_TABLES_PATH_, parser)
+        return parser
+
+    @classmethod
+    def _shared_parser(cls):
+        """
+        returns the process wide Lark instance, building it on first use.
+        Lark keeps no state between calls to parse, so the instance can be used by any number of threads.
+        """
+        global _SHARED_LARK_
+        if _SHARED_LARK_ is None:
+            with _SHARED_LARK_LOCK_:
+                if _SHARED_LARK_ is None:
+                    _SHARED_LARK_ = cls._build_parser()
+        return _SHARED_LARK_
+
+    @classmethod
+    def _recovery_parser(cls):
+        """
+        returns the Lark instance used for error recovery.
+        the standalone parser does not include the interactive parser, so lark itself is needed in that case.
+        """
+        global _RECOVERY_LARK_
+        if not _STANDALONE_:
+            return cls._shared_parser()
+        if _RECOVERY_LARK_ is None:
+            with _SHARED_LARK_LOCK_:
+                if _RECOVERY_LARK_ is None:
+                    _RECOVERY_LARK_ = cls._build_parser(standalone=False)
+        return _RECOVERY_LARK_
+
+    @classmethod
+    def tokenize(cls, a_program):
+        """
+        lexing mode for tools and scans of very large sources: returns a TokenStream, which keeps the tokens in arrays
+        of terminal ids, offsets and lengths instead of one Token object each. a_program can be a str or bytes,
+        including a mmap. the terminals are the ones of the grammar. they are recognised as lark's basic lexer does,
+        without the parser state, so the stream is not meant to be parsed: where the grammar tells terminals apart by
+        that state, the stream gives the terminal lark's basic lexer would.
+        """
+        global _STREAM_LEXER_
+        if _STREAM_LEXER_ is None:
+            # the lark built parser has the terminal definitions, which the standalone one does not expose
+            parser = cls._recovery_parser()
+            with _SHARED_LARK_LOCK_:
+                if _STREAM_LEXER_ is None:
+                    from components.token_stream import StreamLexer
+                    _STREAM_LEXER_ = StreamLexer(parser.terminals, parser.lexer_conf.ignore,
+                                                 parser.lexer_conf.g_regex_flags)
+        return _STREAM_LEXER_.tokenize(a_program)
+
+    @classmethod
+    def _lexer_parser(cls, lexer_class):
+        """
+        returns the process wide Lark instance that tokenizes with lexer_class, building it on first use.
+        lexer_class is given to lark as its lexer option, so it is a lark Lexer. lark itself is needed and the
+        grammar is analysed, as the stored parse tables cannot be loaded with another lexer.
+        """
+        parser = _LEXER_LARKS_.get(lexer_class)
+        if parser is None:
+            with _SHARED_LARK_LOCK_:
+                parser = _LEXER_LARKS_.get(lexer_class)
+                if parser is None:
+                    from lark import Lark
+                    parser = Lark(cls._grammar(), debug=False, lexer=lexer_class, **cls._LARK_OPTIONS)
+                    _LEXER_LARKS_[lexer_class] = parser
+        return parser
+
+    def __init__(self, max_errors=1, preprocessor=None, lexer=None):
+        """
+        max_errors is the number of syntax errors reported before parsing stops.
+        with more than one error allowed the parser recovers from each error and carries on.
+        preprocessor, a components.preprocessor.Preprocessor, expands include and conditional directives before
+        the program is parsed.
+        lexer is a lexer class used instead of lark's contextual lexer, such as components.keyword_lexer.KeywordLexer.
+        error recovery always uses lark's lexer.
+        """
+        if max_errors < 1:
+            raise ValueError("max_errors must be at least 1")
+        if lexer:
+            # a parser with its own lexer is always a lark one, whichever implementation is shared
+            import lark
+            self._parser = self._lexer_parser(lexer).parse
+            self._syntax_errors = (lark.UnexpectedCharacters, lark.UnexpectedToken)
+        else:
+            self._parser = self._shared_parser().parse
+            self._syntax_errors = (UnexpectedCharacters, UnexpectedToken)
+        self._max_errors = max_errors
+        self._preprocessor = preprocessor
         self._ast = None
 
-    def parse(self, a_program):
+    def parse_tree(self, a_program, file_name=None):
+        """
+        thread safe entry point - nothing is stored in the instance.
+        returns a tuple (ast, error_list). ast is None when error_list is not empty.
+        file_name is the file a_program was read from. includes are looked up relative to it.
+        """
+        return self.parse_preprocessed(self.preprocess(a_program, file_name))
+
+    def preprocess(self, a_program, file_name=None):
+        """
+        returns the PreprocessedSource of a_program. without a preprocessor the program is returned unchanged.
+        """
+        from components.preprocessor import PreprocessedSource
+        if self._preprocessor is None:
+            return PreprocessedSource(a_program)
+        return self._preprocessor.process(a_program, file_name)
+
+    def parse_preprocessed(self, source):
+        """
+        parses a PreprocessedSource. errors are reported at their line in the original files.
+        returns a tuple (ast, error_list) as parse_tree does.
+        """
+        ast = None
+        error_list = list(source.errors)
+        if not error_list:
+            try:
+                ast = self._parser(source.text, start=self._START_RULE)
+            except self._syntax_errors as error:
+                if self._max_errors > 1:
+                    error_list = self._collect_errors(source.text, source.line_map)
+                else:
+                    error_list.append(self._error_message(error, source.line_map))
+        for msg in error_list:
+            _MODULE_LOGGER_.error(msg)
+        return ast, error_list
+
+    @staticmethod
+    def _error_message(error, line_map=None):
+        """
+        returns the Diagnostic of error, spanning the unexpected token or character.
+        """
+        from components.diagnostics import Diagnostic
+        file_name, line = line_map.locate(error.line) if line_map else (None, error.line)
+        location = "line {0} column {1}".format(line, error.column)
+        if file_name:
+            location += " in '{0}'".format(file_name)
+        # errors may come from lark or from the standalone parser, so the type is told by its attributes
+        if not hasattr(error, "token"):
+            msg = "syntax error at {0}. unexpected character found. expected {1}".format(location, error.allowed)
+            return Diagnostic(msg, "ERROR", "syntax", file_name, line, error.column, line, error.column + 1)
+        msg = "syntax error at {0}: expected {1}".format(location, error.expected)
+        end_line = getattr(error.token, "end_line", None)
+        end_column = getattr(error.token, "end_column", None)
+        if end_line is not None and line_map:
+            end_line = line_map.locate(end_line)[1]
+        return Diagnostic(msg, "ERROR", "syntax", file_name, line, error.column, end_line, end_column)
+
+    def _collect_errors(self, a_program, line_map=None):
+        """
+        parses a_program again with error recovery and returns the messages of up to max_errors syntax errors.
+        on an error the input is skipped up to a synchronising token and the parser stack is unwound to a state
+        that accepts it. errors found before any real input is consumed after a recovery are knock-on errors and
+        are not reported.
+        the public interactive parser cannot unwind its stack, so the parse table and the parser state are used
+        directly. they are internals of lark, which is why requirements.txt pins the version of lark-parser.
+        """
+        from lark.exceptions import UnexpectedInput
+        from lark.parsers.lalr_analysis import Shift
+
         error_list = []
+        resume_pos = [0]
+
+        def recover(error):
+            if not hasattr(error, "token"):
+                error_pos = error.pos_in_stream
+            else:
+                error_pos = error.token.start_pos if error.token.type != "$END" else len(a_program)
+            if a_program[resume_pos[0]:error_pos].strip() or not error_list:
+                error_list.append(self._error_message(error, line_map))
+                if len(error_list) >= self._max_errors:
+                    return False
+
+            if not hasattr(error, "token"):
+                # lark skips the offending character
+                resume_pos[0] = error_pos + 1
+                return True
+            if error.token.type == "$END":
+                return False
+
+            interactive = error.interactive_parser
+            token = error.token
+            while token.type not in self._SYNCHRONISING_TOKENS:
+                token = self._next_token(interactive.lexer_state)
+                if token is None:
+                    return False
+            resume_pos[0] = token.end_pos
+
+            # unwind the stack to the nearest state that can take the synchronising token. if there is none the
+            # token is dropped and parsing carries on from where the error was found
+            parser_state = interactive.parser_state
+            states = parser_state.parse_conf.states
+            for depth in range(len(parser_state.state_stack), 0, -1):
+                state_stack = parser_state.state_stack[:depth]
+                while token.type in states[state_stack[-1]]:
+                    action, argument = states[state_stack[-1]][token.type]
+                    if action is Shift:
+                        del parser_state.state_stack[depth:]
+                        del parser_state.value_stack[depth - 1:]
+                        parser_state.feed_token(token)
+                        return True
+                    if argument.expansion:
+                        del state_stack[-len(argument.expansion):]
+                    state_stack.append(states[state_stack[-1]][argument.origin.name][1])
+            return True
+
         try:
-            self._ast = self._parser(a_program)
-        except UnexpectedCharacters as error:
-            msg = "syntax error at line {0} column {1}. unexpected character found. expected {2}".format(error.line, error.column, error.allowed)
-            error_list.append(msg)
-            _MODULE_LOGGER_.error(msg)
-        except UnexpectedToken as error:
-            msg = "syntax error at line {0} column {1}: expected {2}".format(error.line, error.column, error.expected)
-            error_list.append(msg)
-            _MODULE_LOGGER_.error(msg)
+            self._recovery_parser().parse(a_program, start=self._START_RULE, on_error=recover)
+        except UnexpectedInput:
+            pass
+        return error_list
+
+    @staticmethod
+    def _next_token(lexer_thread):
+        """
+        returns the next token of the input regardless of the parser state, or None at the end of the input.
+        characters that do not start any token are skipped. like _collect_errors, it relies on internals of the
+        pinned version of lark.
+        """
+        from lark.exceptions import LexError
+        lexer_state = lexer_thread.state
+        while True:
+            try:
+                return lexer_thread.lexer.root_lexer.next_token(lexer_state)
+            except EOFError:
+                return None
+            except LexError:
+                lexer_state.line_ctr.feed(lexer_state.text[lexer_state.line_ctr.char_pos])
+
+    def parse_incremental(self, previous_program, previous_ast, a_program):
+        """
+        reparses a_program reusing previous_ast, the tree produced for previous_program.
+        when the edit is confined to the inside of a procedure or function declaration only that declaration is
+        reparsed. anything else triggers a full parse.
+        returns a tuple (ast, error_list) as parse_tree does. previous_ast is never changed: the new tree shares with
+        it the subtrees and tokens ending before the reparsed declaration, and has copies of the nodes and tokens
+        whose positions move. both trees stay valid, so the previous one can still be used, but they are not to be
+        changed in place by the caller.
+        """
+        # positions in previous_ast refer to the preprocessed text, so with a preprocessor everything is reparsed
+        if previous_ast is None or self._preprocessor is not None:
+            return self.parse_tree(a_program)
+        if previous_program == a_program:
+            return previous_ast, []
+
+        # the edit is the region between the longest common prefix and the longest common suffix
+        edit_start = 0
+        limit = min(len(previous_program), len(a_program))
+        while edit_start < limit and previous_program[edit_start] == a_program[edit_start]:
+            edit_start += 1
+        common_suffix = 0
+        while common_suffix < limit - edit_start and previous_program[-common_suffix - 1] == a_program[-common_suffix - 1]:
+            common_suffix += 1
+        previous_edit_end = len(previous_program) - common_suffix
+        edit_end = len(a_program) - common_suffix
+
+        # comments are matched greedily, so an edit touching a comment delimiter can change the meaning of text
+        # outside the declaration being edited
+        for text in [previous_program[max(edit_start - 1, 0):previous_edit_end + 1],
+                     a_program[max(edit_start - 1, 0):edit_end + 1]]:
+            if "{" in text or "}" in text or "(*" in text or "*)" in text:
+                return self.parse_tree(a_program)
+
+        path = self._enclosing_declaration(previous_ast, edit_start, previous_edit_end)
+        if not path:
+            return self.parse_tree(a_program)
+
+        parent, index = path[-1]
+        declaration = parent.children[index]
+        meta = declaration.meta
+
+        # the lexer depends on the parser state, which is only the same as in the full parse once inside the
+        # declaration. the first and last tokens of the declaration must therefore stay untouched
+        tokens = list(declaration.scan_values(lambda value: isinstance(value, Token)))
+        if not (tokens[0].end_pos < edit_start and previous_edit_end < tokens[-1].start_pos):
+            return self.parse_tree(a_program)
+
+        delta = len(a_program) - len(previous_program)
+        try:
+            new_declaration = self._parser(a_program[meta.start_pos:meta.end_pos + delta], start=declaration.data)
+        except self._syntax_errors:
+            # let the full parse report the error with its position in the whole program
+            return self.parse_tree(a_program)
+
+        # move the new declaration to its place in the program
+        column_offset = meta.column - 1
+        for item in self._positioned(new_declaration):
+            if item.line == 1:
+                item.column += column_offset
+            if item.end_line == 1:
+                item.end_column += column_offset
+            item.start_pos += meta.start_pos
+            item.end_pos += meta.start_pos
+            item.line += meta.line - 1
+            item.end_line += meta.line - 1
+
+        # move everything after the declaration, including the end of the enclosing nodes
+        new_meta = new_declaration.meta
+        line_delta = new_meta.end_line - meta.end_line
+        column_delta = new_meta.end_column - meta.end_column
+        previous_end_pos = meta.end_pos
+        previous_end_line = meta.end_line
+
+        def moved(item):
+            # item is a copy of a meta or token of previous_ast ending at or after the declaration
+            if item.start_pos >= previous_end_pos:
+                if item.line == previous_end_line:
+                    item.column += column_delta
+                item.start_pos += delta
+                item.line += line_delta
+            if item.end_line == previous_end_line:
+                item.end_column += column_delta
+            item.end_pos += delta
+            item.end_line += line_delta
+            return item
+
+        def copied(tree):
+            return Tree(tree.data, [], moved(copy.copy(tree.meta)))
+
+        # the nodes ending before the declaration keep their positions and are shared with previous_ast, the
+        # others are copied. the tree is walked with an explicit stack, as declaration lists nest deeply
+        new_ast = copied(previous_ast)
+        pending = [(previous_ast, new_ast)]
+        while pending:
+            tree, new_tree = pending.pop()
+            for child in tree.children:
+                if child is declaration:
+                    child = new_declaration
+                elif isinstance(child, Tree):
+                    if not child.meta.empty and child.meta.end_pos >= previous_end_pos:
+                        new_child = copied(child)
+                        pending.append((child, new_child))
+                        child = new_child
+                elif isinstance(child, Token) and child.end_pos >= previous_end_pos:
+                    child = moved(Token.new_borrow_pos(child.type, child.value, child))
+                new_tree.children.append(child)
+        return new_ast, []
+
+    @classmethod
+    def _enclosing_declaration(cls, ast, edit_start, edit_end):
+        """
+        returns the path [(parent, child_index), ...] to the innermost procedure or function declaration that
+        strictly contains the region edit_start:edit_end, or None if there is no such declaration.
+        """
+        path = []
+        result = None
+        node = ast
+        while node is not None:
+            next_node = None
+            for index, child in enumerate(node.children):
+                if isinstance(child, Tree) and not child.meta.empty and \
+                        child.meta.start_pos < edit_start and edit_end < child.meta.end_pos:
+                    path.append((node, index))
+                    if child.data in cls._INCREMENTAL_RULES:
+                        result = list(path)
+                    next_node = child
+                    break
+            node = next_node
+        return result
+
+    @staticmethod
+    def _positioned(ast):
+        """
+        yields every node of ast carrying source positions: the meta of non empty trees and the tokens.
+        """
+        for tree in ast.iter_subtrees():
+            if not tree.meta.empty:
+                yield tree.meta
+            for child in tree.children:
+                if isinstance(child, Token):
+                    yield child
+
+    def parse(self, a_program):
+        ast, error_list = self.parse_tree(a_program)
+        if not error_list:
+            self._ast = ast
         return error_list
 
     @property
@@ -504,3 +990,30 @@ class DeftPascalParser:
             return self._ast
         else:
             raise ValueError("AST is not yet defined")
+
+
+def _load_standalone_parser():
+    """
+    returns the generated standalone parser module, or None if it is missing or was generated from another grammar.
+    """
+    try:
+        module = importlib.import_module(_STANDALONE_MODULE_)
+    except ImportError:
+        return None
+    if getattr(module, "GRAMMAR_HASH", None) != DeftPascalParser.grammar_hash():
+        _MODULE_LOGGER_.debug("standalone parser '{0}' is out of date and will be ignored".format(_STANDALONE_MODULE_))
+        return None
+    return module
+
+
+# the tree and exception classes come from whichever implementation builds the parser.
+# the compiler imports Tree from here so both implementations are interchangeable. the symbols only see the compact
+# Leaf the trees are lowered to, so they take lark's Token and do not depend on the parser.
+_STANDALONE_ = _load_standalone_parser()
+if _STANDALONE_:
+    Tree = _STANDALONE_.Tree
+    Token = _STANDALONE_.Token
+    UnexpectedCharacters = _STANDALONE_.UnexpectedCharacters
+    UnexpectedToken = _STANDALONE_.UnexpectedToken
+else:
+    from lark import Tree, Token, UnexpectedCharacters, UnexpectedToken
@@ -0,0 +1,241 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+from collections.abc import Mapping
+from contextlib import contextmanager
+import contextvars
+import logging
+
+_MODULE_LOGGER_ = logging.getLogger("deft_pascal_reborn")
+
+SEVERITIES = ("ERROR", "WARNING", "INFO", "DEBUG")
+_LEVELS_ = {"ERROR": logging.ERROR, "WARNING": logging.WARNING, "INFO": logging.INFO, "DEBUG": logging.DEBUG}
+
+# the Diagnostics of the compilation running in the current thread, or asyncio task
+_COLLECTOR_ = contextvars.ContextVar("deft_pascal_reborn_diagnostics", default=None)
+
+
+class Diagnostic(str):
+    """
+    a message of a compilation with its severity, an error code and the span of source it refers to. a diagnostic is
+    the text of its message, so it can be used where a message was expected before.
+    code is 'syntax' for syntax errors, 'preprocessor' for preprocessor errors and otherwise the grammar rule (or the
+    token) being compiled when the message was raised, or 'compiler' outside of any of them.
+    the span is file_name, line, column, end_line and end_column. any of them is None when it is not known.
+    diagnostics are immutable.
+    """
+
+    _FIELDS = ("severity", "code", "file_name", "line", "column", "end_line", "end_column")
+
+    def __new__(cls, message, severity="ERROR", code=None, file_name=None, line=None, column=None, end_line=None,
+                end_column=None):
+        result = super().__new__(cls, message)
+        for name, value in zip(cls._FIELDS, (severity, code, file_name, line, column, end_line, end_column)):
+            object.__setattr__(result, name, value)
+        return result
+
+    def __setattr__(self, name, value):
+        raise AttributeError("diagnostics are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("diagnostics are immutable")
+
+    def __reduce__(self):
+        return Diagnostic, (str(self),) + tuple(getattr(self, name) for name in self._FIELDS)
+
+    @property
+    def message(self):
+        return str(self)
+
+    @property
+    def span(self):
+        return self.file_name, self.line, self.column, self.end_line, self.end_column
+
+
+class CompilationResult(Mapping):
+    """
+    the diagnostics of one call to check_syntax or compile. it is read only.
+    result[severity] is a new list of the diagnostics of that severity, in the order they were raised, so a result
+    can be used as the dictionary of messages by severity returned before.
+    """
+
+    __slots__ = ("_diagnostics",)
+
+    def __init__(self, diagnostics=()):
+        object.__setattr__(self, "_diagnostics", tuple(diagnostics))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("compilation results are immutable")
+
+    def __getitem__(self, severity):
+        if severity not in SEVERITIES:
+            raise KeyError(severity)
+        return [i for i in self._diagnostics if i.severity == severity]
+
+    def __iter__(self):
+        return iter(SEVERITIES)
+
+    def __len__(self):
+        return len(SEVERITIES)
+
+    def __repr__(self):
+        return "CompilationResult({0!r})".format(dict(self))
+
+    def __reduce__(self):
+        return CompilationResult, (self._diagnostics,)
+
+    @property
+    def diagnostics(self):
+        """
+        all the diagnostics, of every severity, in the order they were raised.
+        """
+        return self._diagnostics
+
+    @property
+    def errors(self):
+        return tuple(self["ERROR"])
+
+    @property
+    def succeeded(self):
+        return not any(i.severity == "ERROR" for i in self._diagnostics)
+
+
+def _edge_leaf(node, last):
+    """
+    returns the first (or the last) token under node, or None when there is none.
+    """
+    pending = [node]
+    while pending:
+        current = pending.pop()
+        children = getattr(current, "children", None)
+        if children is None:
+            return current
+        pending.extend(children if last else reversed(children))
+    return None
+
+
+class Diagnostics:
+    """
+    collects the diagnostics of one compilation.
+    messages are raised with debug, info, warning and error. the message is a format string and its arguments are
+    only formatted when the message is used: when it is collected, or when the deft_pascal_reborn logger is enabled
+    for its severity, in which case it is also logged. when only errors are collected and the logger is not enabled
+    for debug messages, a call to debug returns straight away.
+    while collecting, the messages logged to the deft_pascal_reborn logger by the same thread (or asyncio task) are
+    added to this collector too, so compilations running at the same time do not see each other's messages.
+    node is the ast node being compiled. a message raised while it is set takes its code and its span from it.
+    """
+
+    def __init__(self, line_map=None, severity="DEBUG"):
+        """
+        line_map is the LineMap of the preprocessed source. spans are then given in the original files.
+        severity is the lowest severity collected. errors are always collected.
+        """
+        self._diagnostics = []
+        self._line_map = line_map
+        self._level = min(_LEVELS_[severity], logging.ERROR)
+        # whether a message of each severity is used, worked out once rather than on every message
+        self._debug = self._used(logging.DEBUG)
+        self._info = self._used(logging.INFO)
+        self._warning = self._used(logging.WARNING)
+        self.node = None
+
+    def _used(self, level):
+        return level >= self._level or _MODULE_LOGGER_.isEnabledFor(level)
+
+    def debug(self, msg, *args):
+        if self._debug:
+            self._raise(logging.DEBUG, msg, args)
+
+    def info(self, msg, *args):
+        if self._info:
+            self._raise(logging.INFO, msg, args)
+
+    def warning(self, msg, *args):
+        if self._warning:
+            self._raise(logging.WARNING, msg, args)
+
+    def error(self, msg, *args):
+        self._raise(logging.ERROR, msg, args)
+
+    def _raise(self, level, msg, args):
+        message = msg.format(*args) if args else msg
+        if level >= self._level:
+            self.add(message, logging.getLevelName(level))
+        if _MODULE_LOGGER_.isEnabledFor(level):
+            # the record is marked so DiagnosticsHandler does not collect the message a second time
+            _MODULE_LOGGER_.log(level, message, extra={"collected": True}, stacklevel=3)
+
+    def add(self, message, severity="ERROR", code=None):
+        """
+        adds message. a Diagnostic is added as it is, a plain message gets the code and span of the current node.
+        """
+        if not isinstance(message, Diagnostic):
+            message = self._diagnostic(message, severity, code)
+        self._diagnostics.append(message)
+        return message
+
+    def add_record(self, record):
+        """
+        adds the message of a record logged by another module, when its severity is collected.
+        """
+        if getattr(record, "collected", False) or record.levelno < self._level:
+            return None
+        if record.levelno >= logging.ERROR:
+            severity = "ERROR"
+        elif record.levelno >= logging.WARNING:
+            severity = "WARNING"
+        elif record.levelno >= logging.INFO:
+            severity = "INFO"
+        else:
+            severity = "DEBUG"
+        return self.add(record.getMessage(), severity, getattr(record, "code", None))
+
+    def _diagnostic(self, message, severity, code):
+        node = self.node
+        if node is None:
+            return Diagnostic(message, severity, code or "compiler")
+        code = code or getattr(node, "data", None) or node.type.lower()
+        first = _edge_leaf(node, False)
+        if first is None:
+            return Diagnostic(message, severity, code)
+        last = _edge_leaf(node, True)
+        file_name = None
+        line = first.line
+        end_line = last.line
+        if self._line_map and line is not None:
+            file_name, line = self._line_map.locate(line)
+            end_file_name, end_line = self._line_map.locate(end_line)
+            if end_file_name != file_name:
+                end_line = None
+        return Diagnostic(message, severity, code, file_name, line, first.column, end_line,
+                          None if end_line is None else last.column + len(last.value))
+
+    @contextmanager
+    def collecting(self):
+        """
+        makes this the collector of the messages logged by the current thread until the block ends.
+        """
+        token = _COLLECTOR_.set(self)
+        try:
+            yield self
+        finally:
+            _COLLECTOR_.reset(token)
+
+    def result(self):
+        return CompilationResult(self._diagnostics)
+
+
+class DiagnosticsHandler(logging.Handler):
+
+    def emit(self, record):
+        """
+        adds the record to the Diagnostics collecting in the current thread. it is dropped when there is none.
+        """
+        collector = _COLLECTOR_.get()
+        if collector is not None:
+            collector.add_record(record)
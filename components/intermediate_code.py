@@ -11,6 +11,7 @@ from components.symbols.operator_symbols import Operator, UnaryOperator
 from components.symbols.type_symbols import PointerType, BasicType, StringType
 from components.symbols.identifier_symbols import Identifier, PointerIdentifier, TypeIdentifier, ProcedureForwardIdentifier, ProcedureExternalIdentifier, ProcedureIdentifier
 from components.symbols.literals_symbols import Literal
+from components import constant_folding
 from utils import compiler_utils
 import logging
 from logging import ERROR, WARNING, INFO
@@ -159,8 +160,8 @@ class IntermediateCode:
         for token in token_list:
             assert token.category == "ConstantIdentifier", "ConstantIdentifier expected but found {0}".format(token)
 
-            if token.value.cardinality > 1:
-                self._log(WARNING, "Expression in constant declaration not yet supported and will be ignored. {0}".format(token))
+            if token.value.operand is None:
+                self._log(WARNING, "Constant expression not evaluated at compilation is not yet supported and will be ignored. {0}".format(token))
 
             else:
                 inner_type = token.type.type
@@ -302,6 +303,7 @@ class IntermediateCode:
                 4) string identifier <- expression of cardinality 2+ [mixed string literals, operators and variables]
             """
             expression = input_list.pop(0)
+            folded_literal = self._folded_literal(expression) if expression.operand is None else None
             if expression.cardinality == 1 and expression.value[0].category.upper() == "STRINGLITERAL":
                 # scenario 1
                 self._emiter.emit_assignment_scenario_unary_string_literal(identifier.type.type_to_c,
@@ -312,6 +314,9 @@ class IntermediateCode:
                 # scenario 2
                 self._emiter.emit_assignment_scenario_unary_string_identifier(identifier.name,
                                                                               expression.value[0].name)
+            elif folded_literal:
+                # scenario 3, the literals and constants are concatenated at compilation
+                self._emiter.emit_assignment_scenario_multiple_string_literals(identifier.name, folded_literal.value)
             else:
                 # scenarios 3 and 4
                 # the only operator valid for strings is '+' so the translation
@@ -348,12 +353,35 @@ class IntermediateCode:
             self._emiter.emit_statement_terminator()
 
 
+    def _folded_literal(self, a_generic_expression):
+        """
+        returns the literal of the value of an expression of literals and constants only, None for other expressions.
+        """
+        tree = a_generic_expression.tree
+        try:
+            return constant_folding.fold(tree) if tree else None
+        except ValueError as error:
+            self._log(WARNING, "constant expression left to run time: {0}. {1}".format(error, a_generic_expression))
+            return None
+
     def _expression(self, a_generic_expression):
         # Process the incoming generic EXPRESSION
         assert isinstance(a_generic_expression, BaseExpression), a_generic_expression
 
-        while a_generic_expression.value:
-            token = a_generic_expression.value.pop(0)
+        # the tokens are emitted in the order they are written, from the tree analysed by the compiler, with the
+        # operations on literals and constants replaced by their values
+        tree = a_generic_expression.tree
+        if tree:
+            overflows = []
+            try:
+                tree = constant_folding.fold_operations(tree, overflows)
+            except ValueError as error:
+                self._log(WARNING, "constant expression left to run time: {0}. {1}".format(error, a_generic_expression))
+            for value, wrapped in overflows:
+                self._log(WARNING, "constant expression overflows 16 bits: {0} wraps around to {1}. {2}".format(
+                    value, wrapped, a_generic_expression))
+
+        for token in (tree.tokens() if tree else a_generic_expression.value):
             if isinstance(token, BaseKeyword):
 
                 self._log(ERROR, "Incorrect keyword '{0}' received.".format(token))
@@ -537,7 +565,7 @@ class IntermediateCode:
                 self._expression(field_width_expression)
                 self._emiter.emit_procedure_call_parameter_separator()
 
-                decimal_field_width_expression = actual_parameter.decimal_paces.value
+                decimal_field_width_expression = actual_parameter.decimal_places
                 self._expression(decimal_field_width_expression)
                 self._emiter.emit_procedure_call_parameter_separator()
 
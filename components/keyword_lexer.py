@@ -0,0 +1,128 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+from lark import Token, UnexpectedCharacters
+from lark.lexer import Lexer
+import re
+
+
+class _LexerState:
+
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+    def __copy__(self):
+        return _LexerState(self.text)
+
+
+class KeywordLexer(Lexer):
+    """
+    lexer for DeftPascalParser, given to lark as its lexer option in place of the contextual lexer. built from the
+    terminals of the grammar.
+    keywords are left out of the regular expression: an identifier is scanned once and looked up, case folded, in a
+    dictionary of keywords. whitespace and comments are skipped with a single pattern made of the ignored terminals.
+    when the parser state is known, a keyword the parser does not accept there is an identifier and text shared by
+    several terminals (+ and -) becomes the terminal the parser accepts, as with the contextual lexer.
+    """
+
+    # lark passes the lexer state and the parser state to lex
+    __future_interface__ = True
+
+    def __init__(self, lexer_conf):
+        flags = lexer_conf.g_regex_flags
+        terminals = sorted(lexer_conf.terminals, key=lambda x: (-x.priority, -x.pattern.max_width, -len(x.pattern.value), x.name))
+        ignore = [t for t in terminals if t.name in lexer_conf.ignore]
+        ignore_names = {t.name for t in ignore}
+        self._skip = re.compile("(?:{0})*".format("|".join(t.pattern.to_regexp() for t in ignore)), flags)
+
+        # string terminals matched in full by a regular expression terminal are keywords of that terminal
+        self._keywords = {}
+        strings = [t for t in terminals if t.pattern.type == "str"]
+        for terminal in terminals:
+            if terminal.pattern.type != "re" or terminal.name in ignore_names:
+                continue
+            pattern = re.compile(terminal.pattern.to_regexp(), flags)
+            for string in strings:
+                if string.priority <= terminal.priority and pattern.fullmatch(string.pattern.value):
+                    if "i" not in string.pattern.flags:
+                        raise ValueError("case sensitive keyword {0} is not supported".format(string.name))
+                    self._keywords.setdefault(string.pattern.value.casefold(), string.name)
+                    self._identifier = terminal.name
+        keywords = set(self._keywords.values())
+
+        # terminals of the same text are matched by the first one and told apart by the parser state
+        self._alternatives = {}
+        first_of_text = {}
+        scanned = []
+        for terminal in terminals:
+            if terminal.name in ignore_names or terminal.name in keywords:
+                continue
+            if terminal.pattern.type == "str":
+                first = first_of_text.setdefault((terminal.pattern.value, frozenset(terminal.pattern.flags)), terminal.name)
+                if first != terminal.name:
+                    self._alternatives.setdefault(first, [first]).append(terminal.name)
+                    continue
+            scanned.append(terminal)
+        self._pattern = re.compile("|".join("(?P<{0}>{1})".format(t.name, t.pattern.to_regexp()) for t in scanned), flags)
+
+    def make_lexer_state(self, text):
+        return _LexerState(text)
+
+    def lex(self, lexer_state, parser_state=None):
+        """
+        yields the tokens of the text of lexer_state. parser_state is read before each token that depends on it: the
+        terminals accepted in its position are in the states of its parse configuration.
+        """
+        text = lexer_state.text
+        skip = self._skip.match
+        match = self._pattern.match
+        keywords = self._keywords
+        alternatives = self._alternatives
+        identifier = self._identifier
+        states = parser_state.parse_conf.states if parser_state else None
+        line = 1
+        line_start = 0
+        position = 0
+        length = len(text)
+        while True:
+            skipped_end = skip(text, position).end()
+            if skipped_end > position:
+                newlines = text.count("\n", position, skipped_end)
+                if newlines:
+                    line += newlines
+                    line_start = text.rfind("\n", position, skipped_end) + 1
+                position = skipped_end
+            if position >= length:
+                return
+
+            found = match(text, position)
+            if not found:
+                allowed = {n for n in states[parser_state.position] if n.isupper()} if parser_state else None
+                raise UnexpectedCharacters(text, position, line, position - line_start + 1, allowed=allowed,
+                                           state=parser_state.position if parser_state else None)
+            end = found.end()
+            name = found.lastgroup
+            value = found.group()
+            if name == identifier:
+                keyword = keywords.get(value.casefold())
+                if keyword:
+                    if parser_state is None:
+                        name = keyword
+                    else:
+                        accepted = states[parser_state.position]
+                        if keyword in accepted or identifier not in accepted:
+                            name = keyword
+            elif name in alternatives and parser_state is not None:
+                accepted = states[parser_state.position]
+                for alternative in alternatives[name]:
+                    if alternative in accepted:
+                        name = alternative
+                        break
+            yield Token(name, value, position, line, position - line_start + 1, line, end - line_start + 1, end)
+            position = end
@@ -0,0 +1,83 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+
+class FormalParameter:
+    """
+    a parameter in the declaration of a procedure: its name and its type.
+    """
+
+    __slots__ = ("_name", "_type")
+
+    def __init__(self, a_name, a_type):
+        self._name = a_name
+        self._type = a_type
+
+    def __str__(self):
+        return "{0}({1}|{2})".format(self.__class__.__name__, self._name, self._type)
+
+    def __repr__(self):
+        return "{0}({1}|{2})".format(self.__class__.__name__, self._name, self._type)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def type(self):
+        return self._type
+
+
+class ActualParameter:
+    """
+    a parameter passed in a procedure call: the expression of its value and, for write and writeln, the expressions
+    of its field width and of its decimal places. ( value : field_width : decimal_places )
+    """
+
+    __slots__ = ("_value", "_field_width", "_decimal_places")
+
+    def __init__(self, a_value, a_field_width=None, a_decimal_places=None):
+        self._value = a_value
+        self._field_width = a_field_width
+        self._decimal_places = a_decimal_places
+
+    def __str__(self):
+        return "{0}({1}:{2}:{3})".format(self.__class__.__name__, self._value, self._field_width,
+                                         self._decimal_places)
+
+    def __repr__(self):
+        return "{0}({1}:{2}:{3})".format(self.__class__.__name__, self._value, self._field_width,
+                                         self._decimal_places)
+
+    @property
+    def name(self):
+        return str(self._value)
+
+    @property
+    def value(self):
+        return self._value
+
+    @property
+    def type(self):
+        return self._value.native_type if self._value is not None else None
+
+    @property
+    def field_width(self):
+        return self._field_width
+
+    @property
+    def decimal_places(self):
+        return self._decimal_places
+
+    @property
+    def cardinality(self):
+        """
+        1 for a value alone, 2 with a field width, 3 with a field width and decimal places.
+        """
+        if self._decimal_places is not None:
+            return 3
+        return 2 if self._field_width is not None else 1
@@ -0,0 +1,226 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+from components.source_files import read_source
+from components.diagnostics import Diagnostic
+from bisect import bisect_right
+import os
+import re
+
+# strings and comments are matched as well so that a directive is only recognised outside of them
+_SCANNER_ = re.compile(r"(?P<string>'[^'\n]*')"
+                       r"|(?P<comment>\(\*.*?\*\))"
+                       r"|(?P<directive>\{\$(?P<name>[A-Za-z]+)[ \t]*(?P<argument>[^}]*)\})"
+                       r"|(?P<brace>\{[^}]*\})",
+                       re.DOTALL)
+
+_CONDITIONALS_ = {"IFDEF", "IFNDEF", "ELSE", "ENDIF"}
+
+
+class LineMap:
+    """
+    maps the lines of a preprocessed text back to the file and line they came from.
+    each segment is a run of lines copied from one file: it starts at out_line and matches source_line of file_name.
+    """
+
+    def __init__(self, segments=None):
+        self._segments = segments or [(1, None, 1)]
+        self._starts = [segment[0] for segment in self._segments]
+
+    @property
+    def segments(self):
+        return list(self._segments)
+
+    def locate(self, line):
+        """
+        returns (file_name, line) of the line of the preprocessed text. file_name is None for the main source when
+        it was given without a name.
+        """
+        out_line, file_name, source_line = self._segments[bisect_right(self._starts, line) - 1]
+        return file_name, source_line + line - out_line
+
+
+class PreprocessedSource:
+
+    def __init__(self, text, line_map=None, errors=None):
+        self.text = text
+        self.line_map = line_map or LineMap()
+        self.errors = errors or []
+
+
+class _Expansion:
+    """
+    the result of preprocessing one file: its text, line map segments relative to the start of the text, the symbols
+    defined at its end, its errors and the (path, modification time, size) of every file it read.
+    """
+
+    def __init__(self):
+        self.pieces = []
+        self.lines = 0
+        self.segments = []
+        self.defines = None
+        self.errors = []
+        self.dependencies = []
+
+    @property
+    def text(self):
+        return "".join(self.pieces)
+
+    def append(self, text):
+        self.pieces.append(text)
+        self.lines += text.count("\n")
+
+    def at_line_start(self):
+        return not self.pieces or self.pieces[-1].endswith("\n") or not self.pieces[-1]
+
+
+class Preprocessor:
+    """
+    expands {$I file} / {$INCLUDE file} and evaluates {$DEFINE}, {$UNDEF}, {$IFDEF}, {$IFNDEF}, {$ELSE} and {$ENDIF}.
+    directives and the text of an inactive branch are replaced by their line breaks, so lines of the same file keep
+    their numbers. an include starts on a line of its own.
+    the expansion of every include is cached and reused while the files it read are unchanged and it is entered with
+    the same symbols defined.
+    """
+
+    def __init__(self, include_paths=None, defines=None):
+        self._include_paths = list(include_paths or [])
+        self._defines = frozenset(name.upper() for name in defines or [])
+        self._cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def process(self, a_program, file_name=None):
+        """
+        returns the PreprocessedSource of a_program. file_name is used to find includes relative to the program and
+        in messages.
+        """
+        expansion = self._expand(a_program, file_name, self._defines, [])
+        segments = [(out_line + 1, name, source_line) for out_line, name, source_line in expansion.segments]
+        return PreprocessedSource(expansion.text, LineMap(segments), expansion.errors)
+
+    @staticmethod
+    def _error(file_name, line, msg):
+        location = " in '{0}'".format(file_name) if file_name else ""
+        return Diagnostic("preprocessor error at line {0}{1}: {2}".format(line, location, msg), "ERROR", "preprocessor",
+                          file_name, line)
+
+    def _resolve(self, include_name, file_name):
+        directory = os.path.dirname(file_name) if file_name else os.getcwd()
+        names = [include_name]
+        if not os.path.splitext(include_name)[1]:
+            names.append(include_name + ".pas")
+        for folder in [directory] + self._include_paths:
+            for name in names:
+                candidate = os.path.join(folder, name)
+                if os.path.isfile(candidate):
+                    return os.path.abspath(candidate)
+        return None
+
+    @staticmethod
+    def _stamp(path):
+        status = os.stat(path)
+        return path, status.st_mtime_ns, status.st_size
+
+    def _include(self, path, defines, stack):
+        key = (path, defines)
+        cached = self._cache.get(key)
+        if cached:
+            try:
+                if all(self._stamp(dependency[0]) == dependency for dependency in cached.dependencies):
+                    self.hits += 1
+                    return cached
+            except OSError:
+                pass
+        self.misses += 1
+        stamp = self._stamp(path)
+        expansion = self._expand(read_source(path), path, defines, stack + [path])
+        expansion.dependencies.insert(0, stamp)
+        self._cache[key] = expansion
+        return expansion
+
+    def _expand(self, text, file_name, defines, stack):
+        expansion = _Expansion()
+        defines = set(defines)
+        # one entry per open conditional: [branch is active, enclosing branch is active, line of the directive]
+        conditions = []
+        active = True
+        position = 0
+        line = 1
+        expansion.segments.append((0, file_name, 1))
+
+        def copy(end):
+            chunk = text[position:end]
+            expansion.append(chunk if active else "\n" * chunk.count("\n"))
+            return line + chunk.count("\n")
+
+        for found in _SCANNER_.finditer(text):
+            if not found.group("directive"):
+                continue
+            name = found.group("name").upper()
+            argument = found.group("argument").strip()
+            if name in ["I", "INCLUDE"] and argument in ["+", "-"]:
+                # {$I+} and {$I-} switch io checking in turbo pascal and are not includes
+                continue
+            if name not in _CONDITIONALS_ and name not in ["I", "INCLUDE", "DEFINE", "UNDEF"]:
+                continue
+
+            directive_line = copy(found.start())
+            position = found.end()
+            # the line breaks of a directive written over several lines are kept, as for an inactive branch
+            line_breaks = found.group().count("\n")
+            expansion.append("\n" * line_breaks)
+            line = directive_line + line_breaks
+            symbol = argument.split()[0].upper() if argument.split() else ""
+
+            if name in ["IFDEF", "IFNDEF"]:
+                conditions.append([active and ((symbol in defines) == (name == "IFDEF")), active, directive_line])
+                active = conditions[-1][0]
+            elif name == "ELSE":
+                if conditions:
+                    conditions[-1][0] = conditions[-1][1] and not conditions[-1][0]
+                    active = conditions[-1][0]
+                else:
+                    expansion.errors.append(self._error(file_name, directive_line, "{$ELSE} without {$IFDEF}"))
+            elif name == "ENDIF":
+                if conditions:
+                    active = conditions.pop()[1]
+                else:
+                    expansion.errors.append(self._error(file_name, directive_line, "{$ENDIF} without {$IFDEF}"))
+            elif not active:
+                continue
+            elif name == "DEFINE":
+                defines.add(symbol)
+            elif name == "UNDEF":
+                defines.discard(symbol)
+            else:
+                include_name = argument.strip("'\"")
+                path = self._resolve(include_name, file_name)
+                if not path:
+                    expansion.errors.append(self._error(file_name, directive_line, "include file '{0}' not found".format(include_name)))
+                    continue
+                if path in stack:
+                    expansion.errors.append(self._error(file_name, directive_line, "include file '{0}' includes itself".format(include_name)))
+                    continue
+                included = self._include(path, frozenset(defines), stack)
+                if not expansion.at_line_start():
+                    expansion.append("\n")
+                start = expansion.lines
+                expansion.segments += [(start + out_line, name, source_line) for out_line, name, source_line in included.segments]
+                expansion.append(included.text)
+                if not expansion.at_line_start():
+                    expansion.append("\n")
+                expansion.segments.append((expansion.lines, file_name, line))
+                expansion.errors += included.errors
+                expansion.dependencies += included.dependencies
+                defines = set(included.defines)
+
+        copy(len(text))
+        for _, _, condition_line in conditions:
+            expansion.errors.append(self._error(file_name, condition_line, "{$IFDEF} without {$ENDIF}"))
+        expansion.defines = frozenset(defines)
+        return expansion
@@ -0,0 +1,69 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+import locale
+import mmap
+import os
+
+# artefacts are written in large blocks, which matters on network mounted workspaces
+_WRITE_BUFFER_SIZE_ = 1024 * 1024
+
+
+def read_source(file_name, encoding=None):
+    """
+    returns the content of file_name as a str.
+    the file is memory mapped and decoded once, straight from the mapping, instead of being copied into a buffer
+    first. line endings are translated to '\n' as open() does in text mode.
+    """
+    encoding = encoding or locale.getpreferredencoding(False)
+    with open(file_name, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            with memoryview(mapping) as view:
+                text = str(view, encoding)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+class ArtefactWriter:
+    """
+    writes the artefacts of a compilation (.ast, .ic, .c) next to each other, named after the input file.
+    when in_memory is set nothing is written and the artefacts are only kept in the contents dictionary.
+    """
+
+    def __init__(self, input_file, output_path=None, overwrite=True, in_memory=False):
+        self._output_path = output_path or os.path.dirname(input_file)
+        self._base_name = os.path.basename(input_file).split(".")[0]
+        self._overwrite = overwrite
+        self._in_memory = in_memory
+        self.contents = {}
+
+    @property
+    def in_memory(self):
+        return self._in_memory
+
+    def file_name(self, extension):
+        return os.path.join(self._output_path, self._base_name + "." + extension)
+
+    def write(self, content, extension):
+        """
+        stores content as the artefact for extension and returns its file name.
+        """
+        output_file = self.file_name(extension)
+        if self._in_memory:
+            self.contents[extension] = content
+            return output_file
+
+        if os.path.isfile(output_file) and not self._overwrite:
+            msg = "file {0} already exists. will not overwrite it."
+            print(msg.format(output_file))
+        else:
+            with open(output_file, "w", buffering=_WRITE_BUFFER_SIZE_) as file:
+                file.write(content)
+        return output_file
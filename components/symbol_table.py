@@ -5,11 +5,42 @@ DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original D
 HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
 """
 
+import sys
+
+# the case folded and interned key of each spelling of an identifier seen so far. a long running process, such as the
+# compile server, sees no end of spellings, so the pool is emptied when it reaches its limit.
+_IDENTIFIER_KEYS_ = {}
+_IDENTIFIER_KEYS_LIMIT_ = 8192
+
+
+def intern_identifier(name):
+    """
+    returns the key of the identifier name: name in lowercase, as pascal identifiers are not case sensitive, and
+    interned, so Counter, COUNTER and counter all give the very same string object. a spelling is only folded again
+    after the pool has been emptied.
+    """
+    result = _IDENTIFIER_KEYS_.get(name)
+    if result is None:
+        if len(_IDENTIFIER_KEYS_) >= _IDENTIFIER_KEYS_LIMIT_:
+            _IDENTIFIER_KEYS_.clear()
+        result = sys.intern(name.lower())
+        _IDENTIFIER_KEYS_[name] = result
+    return result
+
 
 class SymbolTable:
+    """
+    symbols by name in nested levels. only the current level, the innermost, is changed.
+    besides the symbols of each level, every name has the stack of its bindings, one per level where it is declared,
+    the innermost last. a lookup through all the levels is then a single dictionary lookup, whatever the nesting
+    depth, and leaving a level pops the bindings of its own symbols only.
+    symbols are stored and looked up by the key of their name, see intern_identifier, and keep the spelling they were
+    declared with.
+    """
 
     def __init__(self):
         self._symbol_table = {}
+        self._bindings = {}
         self._stack_scope = []
         self._current_level = 0
 
@@ -39,17 +70,18 @@ class SymbolTable:
         """
         The incoming symbol will be appended to the current symbol table level
         """
-        if self.current_level not in self._symbol_table:
-            self._symbol_table[self.current_level] = {}
+        level_dictionary = self._symbol_table.setdefault(self.current_level, {})
+        key = intern_identifier(a_symbol.name)
         #
-        if a_symbol.name in self._symbol_table[self.current_level]:
+        if key in level_dictionary:
             raise KeyError("symbol '{0}' already present at level '{1}-{2}'".format(a_symbol, self.current_level, self.current_scope))
         #
-        element_to_append = {a_symbol.name: a_symbol}
-        self._symbol_table[self.current_level].update(element_to_append)
+        level_dictionary[key] = a_symbol
+        self._bindings.setdefault(key, []).append(a_symbol)
 
 
     def get(self, name, equal_level_only=True):
+        name = intern_identifier(name)
         if self.current_level not in self._symbol_table:
             raise KeyError("no symbols present at level '{0}-{1}'".format(self.current_level, self.current_scope))
         #
@@ -67,71 +99,49 @@ class SymbolTable:
 
 
     def _retrieve_from_level(self, name, level):
-        if level not in self._symbol_table:
-            result = None
-        elif name not in self._symbol_table[level]:
-            result = None
-        else:
-            result = self._symbol_table[level][name]
-        return result
-
-
-    def _recursive_retrieve(self, name, level):
-        result = self._retrieve_from_level(name, level)
-        if not result and level > 0:
-            result = self._recursive_retrieve(name, level - 1)
-        return result
+        level_dictionary = self._symbol_table.get(level)
+        if level_dictionary is None:
+            return None
+        return level_dictionary.get(name)
 
 
     def retrieve(self, name, equal_level_only=True):
+        name = intern_identifier(name)
         if equal_level_only:
             return self._retrieve_from_level(name, self.current_level)
-        else:
-            return self._recursive_retrieve(name, self.current_level)
-        #                 if self.current_level not in self._symbol_table:
-        #                 result = None
-        #             elif name not in self._symbol_table[self.current_level]:
-        #                 result = None
-        #             else:
-        #                 result = self._symbol_table[self.current_level][name]
-        #         else:
-        #             if self.current_level not in self._symbol_table:
-        #                 result = self._get_from_lower_scope(name)
-        #
-        #                 if name not in self._symbol_table[self.current_level]:
-        #
-        #         if self.current_level not in self._symbol_table:
-        #             result = None
-        #         elif name not in self._symbol_table[self.current_level]:
-        #             if equal_level_only:
-        #                 result = None
-        #             else:
-        #                 result = self._get_from_lower_scope(name)
-        #         else:
-        #             result = self._symbol_table[self.current_level][name]
-        #         #
-        #         return result
-        #
+        bindings = self._bindings.get(name)
+        return bindings[-1] if bindings else None
+
 
     def _get_from_lower_scope(self, name):
-        for i in range(self.current_level - 1, -1, -1):
-            if i in self._symbol_table:
-                if name in self._symbol_table[i]:
-                    return self._symbol_table[i][name]
-        return None
+        """
+        get only looks here for a name not declared at the current level, so its innermost binding is below it.
+        """
+        return self.retrieve(name, equal_level_only=False)
 
 
     def purge_all_from_current_scope(self):
+        for name in self._symbol_table.get(self.current_level, ()):
+            self._pop_binding(name)
         self._symbol_table[self.current_level] = {}
 
 
+    def _pop_binding(self, name):
+        bindings = self._bindings[name]
+        bindings.pop()
+        if not bindings:
+            del self._bindings[name]
+
+
     def remove(self, name):
+        name = intern_identifier(name)
         if self.current_level not in self._symbol_table:
             raise KeyError("no symbols present  at level '{0}-{1}'".format(self.current_level, self.current_scope))
         #
         if name not in self._symbol_table[self.current_level]:
             raise KeyError("symbol '{0}' not present at level '{0}-{1}'".format(self.current_level, self.current_scope))
         #
+        self._pop_binding(name)
         return self._symbol_table[self.current_level].pop(name)
 
 
@@ -142,7 +152,9 @@ class SymbolTable:
         if not self.contains(name, equal_level_only=True):
             raise KeyError("symbol '{0}' not present at level '{1}'".format(name, self.current_level))
         else:
+            name = intern_identifier(name)
             self._symbol_table[self.current_level][name] = symbol
+            self._bindings[name][-1] = symbol
 
 
     @property
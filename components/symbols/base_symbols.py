@@ -6,7 +6,7 @@ HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
 """
 
 from lark import Token
-from collections import deque
+from components.compact_ast import Leaf
 import logging
 
 _MODULE_LOGGER_ = logging.getLogger("deft_pascal_reborn")
@@ -14,6 +14,8 @@ _MODULE_LOGGER_ = logging.getLogger("deft_pascal_reborn")
 
 class BaseSymbol:
 
+    __slots__ = ("_name", "_type", "_value", "_frozen")
+
     _precedence_rules = {"OPERATOR_ARITHMETIC_NEGATION": 70,
                          "OPERATOR_ARITHMETIC_NEUTRAL": 70,
                          "OPERATOR_STARSTAR": 60,
@@ -49,6 +51,8 @@ class BaseSymbol:
         self._name = a_name
         self._type = a_type
         self._value = a_value
+        # a frozen symbol is shared by every compilation and cannot be changed, see freeze
+        self._frozen = False
 
     def __str__(self):
         return "{0}('{1}'|{2}|{3})".format(self.category, self.name, self.type, self.value)
@@ -58,7 +62,7 @@ class BaseSymbol:
 
     @classmethod
     def from_token(cls, parser_token):
-        if isinstance(parser_token, Token):
+        if isinstance(parser_token, (Token, Leaf)):
             return cls.from_value(parser_token.value, parser_token.type)
         else:
             raise ValueError("An instance of Token is required as parameter")
@@ -67,6 +71,18 @@ class BaseSymbol:
     def from_value(cls, a_value, a_type_name=None):
         return cls(str(a_value), a_type_name, a_value)
 
+    def freeze(self):
+        """
+        makes the symbol read only and returns it, so a single instance can be shared. the setters of a frozen
+        symbol raise AttributeError.
+        """
+        self._frozen = True
+        return self
+
+    def _check_not_frozen(self):
+        if self._frozen:
+            raise AttributeError("symbol {0} is shared and cannot be changed".format(self))
+
     @property
     def precedence(self):
         return BaseSymbol._precedence_rules[self.type] if self.type in BaseSymbol._precedence_rules else 0
@@ -89,25 +105,32 @@ class BaseSymbol:
 
     @name.setter
     def name(self, new_name):
+        self._check_not_frozen()
         self._name = new_name
 
     @type.setter
     def type(self, new_type):
+        self._check_not_frozen()
         self._type = new_type
 
     @value.setter
     def value(self, new_value):
+        self._check_not_frozen()
         self._value = new_value
 
 
 class BaseIdentifier(BaseSymbol):
 
+    __slots__ = ()
+
     def do_nothing(self):
         pass
 
 
 class BaseOperator(BaseSymbol):
 
+    __slots__ = ("_compatible", "_as_c")
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._compatible = None
@@ -126,6 +149,8 @@ class BaseOperator(BaseSymbol):
 
 class BaseType(BaseSymbol):
 
+    __slots__ = ("_index",)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._index = None
@@ -137,6 +162,9 @@ class BaseType(BaseSymbol):
         return "{0}({1})".format(self.category, self.type)
 
     def __eq__(self, other):
+        # the builtin types are shared, so most comparisons end here
+        if self is other:
+            return True
         if not isinstance(other, BaseType):
             return False
         else:
@@ -148,6 +176,7 @@ class BaseType(BaseSymbol):
 
     @index.setter
     def index(self, new_index):
+        self._check_not_frozen()
         self._index = new_index
 
     @property
@@ -157,97 +186,170 @@ class BaseType(BaseSymbol):
 
 class BaseKeyword(BaseSymbol):
 
+    __slots__ = ()
+
     def do_nothing(self):
         pass
 
 
-class BaseExpression(BaseSymbol):
+# the bottom of the operator stack of ExpressionNode.from_infix, the parentheses that enclose every expression
+_LEFT_PARENTHESES_ = BaseOperator("LEFT_PARENTHESES", 'LEFT_PARENTHESES', "(").freeze()
 
-    def __str__(self):
-        value_str = ""
-        for i in self.value:
-            if i:
-                value_str = value_str + "{0}({1})|".format(i.category, i.name)
-        value_str = value_str.rstrip("|")
-        return "{0}[{1}]".format(self.category, value_str)
+# the unary operators written after their operand
+_POSTFIX_OPERATORS_ = ("OPERATOR_UPARROW",)
 
-    def __repr__(self):
-        value_str = ""
-        for i in self.value:
-            if i:
-                value_str = value_str + "{0}({1})|".format(i.category, i.name)
-        value_str = value_str.rstrip("|")
-        return "{0}[{1}]".format(self.category, value_str)
 
-    def _infix_to_postfix(self):
-        stack = deque()
-        infix_tokens = self.value.copy()
-        postfix_tokens = []
-        lp = BaseOperator("LEFT_PARENTHESES", 'LEFT_PARENTHESES', "(")
-        rp = BaseOperator("RIGHT_PARENTHESES", 'RIGHT_PARENTHESES', ")")
+def _is_parenthesis(token, value):
+    return isinstance(token, BaseOperator) and token.value == value
+
+
+class ExpressionNode:
+    """
+    a node of the typed tree of an expression. an operand node holds a symbol of the expression and no operands. an
+    operator node holds a UnaryOperator and its operand, or a BinaryOperator and its left and right operands.
+    type is the BaseType of the value of the node, worked out once, when the node is built.
+    parentheses holds the pairs of parentheses written around the node, from the innermost one.
+    """
+
+    __slots__ = ("symbol", "operands", "type", "parentheses")
 
-        stack.appendleft(lp)
-        infix_tokens.append(rp)
+    def __init__(self, symbol, operands=(), a_type=None):
+        self.symbol = symbol
+        self.operands = operands
+        self.type = a_type
+        self.parentheses = ()
 
-        while infix_tokens:
-            token = infix_tokens.pop(0)
+    def __repr__(self):
+        return "ExpressionNode({0!r}, {1!r}, {2!r})".format(self.symbol, self.operands, self.type)
+
+    @classmethod
+    def from_infix(cls, expression_list):
+        """
+        builds the tree of the symbols of expression_list, in infix order. the operators are applied in the order
+        of their precedence, and each one is type checked when its node is built.
+        returns None, and stops, at the first operator that is not compatible with the types of its operands.
+        """
+        operators = [_LEFT_PARENTHESES_]
+        operands = []
+        for token in expression_list:
             if not token:
                 pass
 
-            elif token.value == lp.value:
-                stack.appendleft(token)
+            elif _is_parenthesis(token, "("):
+                operators.append(token)
 
-            elif token.value == rp.value:
-
-                while not stack[0].value == lp.value:       # peek at topmost item in the stack
-                    postfix_tokens.append(stack.popleft())
-                stack.popleft()
+            elif _is_parenthesis(token, ")"):
+                while not _is_parenthesis(operators[-1], "("):
+                    if not cls._reduce(operators, operands):
+                        return None
+                left_parenthesis = operators.pop()
+                operands[-1].parentheses += ((left_parenthesis, token),)
 
             elif token.category == "BinaryOperator" or token.category == "UnaryOperator":
-
-                # while stack and self.precedence_rules[stack[0].type] >= self.precedence_rules[token.type]:
-                while stack and stack[0].precedence >= token.precedence:
-                    postfix_tokens.append(stack.popleft())
-                stack.appendleft(token)
+                while not _is_parenthesis(operators[-1], "(") and operators[-1].precedence >= token.precedence:
+                    if not cls._reduce(operators, operands):
+                        return None
+                operators.append(token)
 
             else:
-                postfix_tokens.append(token)
-        return postfix_tokens
+                operands.append(cls(token, (), token if isinstance(token, BaseType) else token.type))
+
+        while len(operators) > 1:
+            if not cls._reduce(operators, operands):
+                return None
+
+        if len(operands) > 1:
+            # operands with no operator between them are kept, in order, under a node with no symbol
+            return cls(None, tuple(operands), operands[-1].type)
+        return operands[-1]
 
-    def _evaluate_to_type(self):
+    @classmethod
+    def _reduce(cls, operators, operands):
         """
-        expression - is a list of tokens.
+        applies the operator on the top of operators to the operands on the top of operands.
+        returns the type of the result, None if the operator is not compatible with the operands.
         """
-        #
-        compatible = True
-        stack = []
-        postfix_expression = self._infix_to_postfix()
-        for token in postfix_expression:
+        operator = operators.pop()
+        right = operands.pop()
+        if operator.category == "UnaryOperator":
+            node = cls(operator, (right,), operator.evaluate_to_type(right.type))
+        else:
+            left = operands.pop()
+            node = cls(operator, (left, right), operator.evaluate_to_type(symbol_right=right.type, symbol_left=left.type))
+        operands.append(node)
+        return node.type
 
-            if isinstance(token, BaseOperator):
-                symbol_right = stack.pop()
-                symbol_right = symbol_right if isinstance(symbol_right, BaseType) else symbol_right.type
+    def tokens(self):
+        """
+        returns the symbols of the expression in the order they are written, parentheses included.
+        """
+        result = []
+        pending = [self]
+        while pending:
+            node = pending.pop()
+            if not isinstance(node, ExpressionNode):
+                result.append(node)
+                continue
+
+            if not node.operands:
+                parts = [node.symbol]
+            elif node.symbol is None:
+                parts = list(node.operands)
+            elif len(node.operands) == 2:
+                parts = [node.operands[0], node.symbol, node.operands[1]]
+            elif node.symbol.type in _POSTFIX_OPERATORS_:
+                parts = [node.operands[0], node.symbol]
+            else:
+                parts = [node.symbol, node.operands[0]]
 
-                if token.category == "UnaryOperator":
-                    # if isinstance(token, operator_symbols.UnaryOperator):
-                    result = token.evaluate_to_type(symbol_right)
+            for left_parenthesis, right_parenthesis in node.parentheses:
+                parts = [left_parenthesis] + parts + [right_parenthesis]
+            pending.extend(reversed(parts))
+        return result
 
-                elif token.category == "BinaryOperator":
-                    # elif isinstance(token, BinaryOperator):
-                    symbol_left = stack.pop()
-                    symbol_left = symbol_left if isinstance(symbol_left, BaseType) else symbol_left.type
-                    result = token.evaluate_to_type(symbol_right=symbol_right, symbol_left=symbol_left)
 
-                if result:
-                    stack.append(result)
+class BaseExpression(BaseSymbol):
 
-                else:
-                    return None
+    __slots__ = ("_tree",)
 
-            elif token:
-                stack.append(token)
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._tree = None
 
-        return stack[-1] if isinstance(stack[-1], BaseType) else stack[-1].type
+    def __str__(self):
+        value_str = ""
+        for i in self.value:
+            if i:
+                value_str = value_str + "{0}({1})|".format(i.category, i.name)
+        value_str = value_str.rstrip("|")
+        return "{0}[{1}]".format(self.category, value_str)
+
+    def __repr__(self):
+        value_str = ""
+        for i in self.value:
+            if i:
+                value_str = value_str + "{0}({1})|".format(i.category, i.name)
+        value_str = value_str.rstrip("|")
+        return "{0}[{1}]".format(self.category, value_str)
+
+    @property
+    def tree(self):
+        """
+        the typed tree of the expression, see ExpressionNode. it is built once, by from_list, or the first time it is
+        asked for. None if the types of the expression are not compatible.
+        """
+        if self._tree is None:
+            self._tree = ExpressionNode.from_infix(self.value)
+        return self._tree
+
+    @property
+    def operand(self):
+        """
+        the symbol of an expression made of a single operand, with or without parentheses. None if the expression
+        has operators.
+        """
+        tree = self.tree
+        return tree.symbol if tree is not None and not tree.operands else None
 
     @classmethod
     def from_list(cls, expression_list):
@@ -256,15 +358,23 @@ class BaseExpression(BaseSymbol):
         :return: an instance of GenericExpression if the expression_list contains compatible_types.
                 The returned GenericExpression is of the type of expression_list evaluation.
         """
-        expression = BaseExpression(None, None, expression_list)
-        result = expression._evaluate_to_type()
-        if result:
-            expression.type = result
-            return expression
+        tree = ExpressionNode.from_infix(expression_list)
+        if tree is not None and tree.type:
+            return cls.from_node(tree, expression_list)
         else:
             _MODULE_LOGGER_.error("incompatible types in expression: {0}".format(expression_list))
             return None
 
+    @classmethod
+    def from_node(cls, node, expression_list):
+        """
+        :return: the expression of expression_list, of the type of node, the tree of expression_list built already.
+                 the tree is not analysed again.
+        """
+        expression = cls(None, node.type, expression_list)
+        expression._tree = node
+        return expression
+
     @property
     def cardinality(self):
         return len(self.value) if self.value else None
@@ -272,6 +382,7 @@ class BaseExpression(BaseSymbol):
     def trim_cardinality_down(self):
         self.value = self.value[:1]
         self.type = self.value[-1].type
+        self._tree = None
 
     @property
     def type(self):
@@ -6,6 +6,7 @@ HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
 """
 
 from components.symbols.base_symbols import BaseExpression
+from components import constant_folding
 import logging
 
 _MODULE_LOGGER_ = logging.getLogger("deft_pascal_reborn")
@@ -13,13 +14,15 @@ _MODULE_LOGGER_ = logging.getLogger("deft_pascal_reborn")
 
 class ConstantExpression(BaseExpression):
 
+    __slots__ = ()
+
     @classmethod
-    def from_list(cls, expression_list):
+    def from_node(cls, node, expression_list):
         """
         :return: None if the expression_list contains incompatible types
         :return: an instance of ConstantExpression if the expression_list contains compatible_types.
         """
-        expression = super().from_list(expression_list)
+        expression = super().from_node(node, expression_list)
         if not expression:
             # scenario - expression has incompatible symbols.
             return None
@@ -30,16 +33,30 @@ class ConstantExpression(BaseExpression):
 
         return expression
 
+    def folded(self, overflows=None):
+        """
+        :return: a ConstantExpression of the literal the expression evaluates to, see constant_folding.fold.
+        :return: the expression itself if it is a single operand or if it cannot be evaluated at compilation.
+        :param overflows: a list that gets the integer operations wrapping around, see constant_folding.fold.
+        :raises ValueError: if the value does not fit the limits of the 6809.
+        """
+        if self.operand is not None:
+            return self
+        literal = constant_folding.fold(self.tree, overflows)
+        return ConstantExpression.from_list([literal]) if literal else self
+
 
 class IntegerExpression(BaseExpression):
 
+    __slots__ = ()
+
     @classmethod
-    def from_list(cls, expression_list):
+    def from_node(cls, node, expression_list):
         """
         :return: None if the expression_list contains incompatible types
         :return: an instance of IntegerExpression if the expression_list contains compatible_types.
         """
-        expression = super().from_list(expression_list)
+        expression = super().from_node(node, expression_list)
         if not expression or expression.type not in ["RESERVED_TYPE_INTEGER"]:
             # scenario - expression has incompatible symbols or it is not of the expected class.
             return None
@@ -49,13 +66,15 @@ class IntegerExpression(BaseExpression):
 
 class BooleanExpression(BaseExpression):
 
+    __slots__ = ()
+
     @classmethod
-    def from_list(cls, expression_list):
+    def from_node(cls, node, expression_list):
         """
         :return: None if the expression_list contains incompatible types
         :return: an instance of BooleanExpression if the expression_list contains compatible_types.
         """
-        expression = super().from_list(expression_list)
+        expression = super().from_node(node, expression_list)
         if not expression or expression.type not in ["RESERVED_TYPE_BOOLEAN"]:
             # scenario - expression has incompatible symbols or it is not of the expected class.
             return None
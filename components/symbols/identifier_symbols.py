@@ -14,12 +14,16 @@ _MODULE_LOGGER = logging.getLogger(__name__)
 
 class Identifier(BaseIdentifier):
 
+    __slots__ = ()
+
     def do_nothing(self):
         pass
 
 
 class TypeIdentifier(BaseIdentifier):
 
+    __slots__ = ()
+
     def __init__(self, a_name, a_type):
         if not (isinstance(a_type, BaseType) or isinstance(a_type, TypeIdentifier)):
             raise ValueError("TypeIdentifier expects an instance of BaseType or TypeIdentifier")
@@ -36,6 +40,8 @@ class TypeIdentifier(BaseIdentifier):
 
 class ConstantIdentifier(BaseIdentifier):
 
+    __slots__ = ()
+
     def __init__(self, a_name, an_expression):
         if not isinstance(an_expression, BaseExpression):
             raise ValueError("ConstantIdentifier expects an instance of BaseExpression")
@@ -72,16 +78,16 @@ class ConstantIdentifier(BaseIdentifier):
          - None if the expression is complex
          - True or False if the expression is simple
         """
-        expression_is_complex = self.value.cardinality > 1
-        if expression_is_complex:
+        operand = self.value.operand
+        if operand is None:
             return None
 
-        if self.value.value[0].category == "ConstantIdentifier":
-            return self.value.value[0].complies_to_type_restrictions()
+        if operand.category == "ConstantIdentifier":
+            return operand.complies_to_type_restrictions()
 
         valid = True
         if self.type == "RESERVED_TYPE_INTEGER":
-            value_to_check = self.value.value[0].value.upper()
+            value_to_check = operand.value.upper()
             if "&B" in value_to_check:     # == "NUMBER_BINARY"
                 valid = 0 <= int(value_to_check.replace("&B", "0b"), 2) <= 65535
             elif "&H" in value_to_check:   # == "NUMBER_HEXADECIMAL"
@@ -91,7 +97,7 @@ class ConstantIdentifier(BaseIdentifier):
             else:
                 valid = (0 <= int(value_to_check) <= 65535) or (-32768 <= int(value_to_check) <= 32767)
         elif self.type in ["RESERVED_TYPE_STRING", "STRING_VALUE"]:
-            valid = self.value.value[0].length <= 80
+            valid = operand.length <= 80
         return valid
 
     def to_literal(self):
@@ -99,14 +105,17 @@ class ConstantIdentifier(BaseIdentifier):
         returns the literal used in a chain of constant expressions
         return None if the constant expression is complex
         """
-        if self.value.value[0].category == "ConstantIdentifier":
-            return self.value.value[0].to_literal()
+        operand = self.value.operand or self.value.value[0]
+        if operand.category == "ConstantIdentifier":
+            return operand.to_literal()
         else:
-            return self.value.value[0]
+            return operand
 
 
 class PointerIdentifier(BaseIdentifier):
 
+    __slots__ = ()
+
     @property
     def is_pointer(self):
         return True
@@ -114,6 +123,8 @@ class PointerIdentifier(BaseIdentifier):
 
 class ProcedureIdentifier(BaseIdentifier):
 
+    __slots__ = ("_argument_list",)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._argument_list = []
@@ -148,6 +159,8 @@ class ProcedureIdentifier(BaseIdentifier):
 
 class InBuiltProcedureWrite(ProcedureIdentifier):
 
+    __slots__ = ()
+
     @classmethod
     def in_built_procedure_write(cls):
 
@@ -188,6 +201,8 @@ class InBuiltProcedureWrite(ProcedureIdentifier):
 
 class ProcedureForwardIdentifier(ProcedureIdentifier):
 
+    __slots__ = ()
+
     @classmethod
     def in_built_procedure_write(cls):
         raise TypeError("in built procedure not compatible with forward procedure type")
@@ -198,6 +213,9 @@ class ProcedureForwardIdentifier(ProcedureIdentifier):
 
 
 class ProcedureExternalIdentifier(ProcedureIdentifier):
+
+    __slots__ = ()
+
     @classmethod
     def in_built_procedure_write(cls):
         raise TypeError("in built procedure not compatible with forward procedure type")
@@ -6,11 +6,14 @@ HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
 """
 
 from components.symbols.base_symbols import BaseSymbol
-from components.symbols.type_symbols import BasicType, StringType
+from components.symbols.type_symbols import RESERVED_TYPES
 
 
+# the types of the literals are the shared builtin types
 class Literal(BaseSymbol):
 
+    __slots__ = ()
+
     @classmethod
     def from_value(cls, a_value, a_type_name=None):
         raise NotImplementedError("Must be implemented by Literal subclasses")
@@ -22,13 +25,15 @@ class Literal(BaseSymbol):
 
 class BooleanLiteral(Literal):
 
+    __slots__ = ()
+
     @classmethod
     def true(cls):
-        return cls('CONSTANT_TRUE', BasicType.reserved_type_boolean(), True)
+        return cls('CONSTANT_TRUE', RESERVED_TYPES[5], True)
 
     @classmethod
     def false(cls):
-        return cls('CONSTANT_FALSE', BasicType.reserved_type_boolean(), False)
+        return cls('CONSTANT_FALSE', RESERVED_TYPES[5], False)
 
     @classmethod
     def from_value(cls, value, a_type_name=None):
@@ -41,9 +46,11 @@ class BooleanLiteral(Literal):
 
 class NilLiteral(Literal):
 
+    __slots__ = ()
+
     @classmethod
     def nil(cls):
-        return cls('CONSTANT_NIL', BasicType.reserved_type_null(), None)
+        return cls('CONSTANT_NIL', RESERVED_TYPES[9], None)
 
     @classmethod
     def from_value(cls, a_value, a_type_name=None):
@@ -56,11 +63,13 @@ class NilLiteral(Literal):
 
 class NumericLiteral(Literal):
 
+    __slots__ = ()
+
     @classmethod
     def from_value(cls, a_value, a_type_name=None):
         valid = False
         if a_type_name in ["INTEGER", "UNSIGNED_DECIMAL", "SIGNED_DECIMAL", "NUMBER_BINARY", "NUMBER_OCTAL", "NUMBER_HEXADECIMAL"]:
-            a_type = BasicType.reserved_type_integer()
+            a_type = RESERVED_TYPES[0]
 
             if "&B" in a_value.upper():  # == "NUMBER_BINARY"
                 valid = 0 <= int(a_value.replace("&B", "").replace("&b", ""), 2) <= 65535
@@ -72,7 +81,7 @@ class NumericLiteral(Literal):
                 valid = (0 <= int(a_value) <= 65535) or (-32768 <= int(a_value) <= 32767)
 
         elif a_type_name in ["REAL", "UNSIGNED_REAL", "SIGNED_REAL"]:
-            a_type = BasicType.reserved_type_real()
+            a_type = RESERVED_TYPES[1]
             valid = True
 
         else:
@@ -97,19 +106,35 @@ class NumericLiteral(Literal):
         if self.type.type == "RESERVED_TYPE_REAL":
             return self.value
 
+    @property
+    def integer_value(self):
+        """
+        the value of an integer literal, in any of the &B, &H and &O forms, as a python int
+        """
+        value = self.value.upper()
+        if "&B" in value:  # == "NUMBER_BINARY"
+            return int(value.replace("&B", ""), 2)
+        if "&H" in value:  # == "NUMBER_HEXADECIMAL"
+            return int(value.replace("&H", ""), 16)
+        if "&O" in value:  # == "NUMBER_OCTAL"
+            return int(value.replace("&O", ""), 8)
+        return int(value)
+
 
 class StringLiteral(Literal):
 
+    __slots__ = ()
+
     @classmethod
     def from_value(cls, a_value, a_type_name=None):
         valid = False
         if isinstance(a_value, str) and a_type_name in ["CHAR", "CHARACTER"]:
-            a_type = BasicType.reserved_type_char()
+            a_type = RESERVED_TYPES[3]
             a_value = a_value.lstrip("'").rstrip("'")
             valid = len(a_value) == 1
 
         elif isinstance(a_value, str) and a_type_name in ["STRING_VALUE"]:
-            a_type = StringType.reserved_type_string()
+            a_type = RESERVED_TYPES[4]
             a_value = a_value.lstrip("'").rstrip("'")
             valid = len(a_value) <= 80
 
@@ -6,21 +6,35 @@ HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
 """
 
 from components.symbols.base_symbols import BaseOperator, BaseType
-from components.symbols.type_symbols import BasicType, StringType, PointerType
+from components.symbols.type_symbols import RESERVED_TYPES
+from array import array
 import logging
 
 
 _MODULE_LOGGER = logging.getLogger(__name__)
 
+# the number of type indexes of the compatibility tables
+_TYPES_ = len(RESERVED_TYPES)
+_POINTER_ = 6
+
+# the cells of a CompatibilityTensor that are not a type index: no result, and the operations on two pointers, whose
+# result comes from the types they point to
+INCOMPATIBLE = -1
+DEREFERENCE = -2
+
 
 class Operator(BaseOperator):
 
+    __slots__ = ()
+
     def do_nothing(self):
         pass
 
 
 class NeutralOperator(Operator):
 
+    __slots__ = ()
+
     @classmethod
     def operator_left_parentheses(cls):
         operator = cls("LEFT_PARENTHESES", 'LEFT_PARENTHESES', "(")
@@ -32,7 +46,55 @@ class NeutralOperator(Operator):
         return operator
 
 
+class CompatibilityTensor:
+    """
+    the result types of the binary operators in a dense table, indexed by operator row, left type index and right
+    type index. an operator gets its row from its _compatible list the first time it is looked up, and operators with
+    the same list share a row. each cell is a type index, INCOMPATIBLE or DEREFERENCE.
+    """
+
+    __slots__ = ("_rows", "_cells")
+
+    def __init__(self):
+        self._rows = {}
+        self._cells = array("b")
+
+    def __len__(self):
+        return len(self._rows)
+
+    def row(self, compatible):
+        """
+        returns the row of compatible, a list of (left, right, result) tuples, adding it to the table if it is new.
+        raises KeyError if compatible has more than one result for a pair of types.
+        """
+        key = tuple(compatible)
+        row = self._rows.get(key)
+        if row is None:
+            cells = array("b", [INCOMPATIBLE]) * (_TYPES_ * _TYPES_)
+            for left, right, result in compatible:
+                if cells[left * _TYPES_ + right] != INCOMPATIBLE:
+                    raise KeyError("unexpected multiple results for types {0} and {1}".format(left, right))
+                if (left, right, result) == (_POINTER_, _POINTER_, _POINTER_):
+                    result = DEREFERENCE
+                cells[left * _TYPES_ + right] = result
+            row = len(self._rows)
+            self._cells.extend(cells)
+            self._rows[key] = row
+        return row
+
+    def lookup(self, row, left, right):
+        """
+        returns the cell of the operator row for the types of indexes left and right.
+        """
+        return self._cells[(row * _TYPES_ + left) * _TYPES_ + right]
+
+
+# the table shared by all the binary operators
+COMPATIBILITY = CompatibilityTensor()
+
+
 class BinaryOperator(Operator):
+
     """
     The _compatible list maps to the types in the following order:
                  LEFT SYMBOL
@@ -53,30 +115,46 @@ class BinaryOperator(Operator):
 
     """
 
+    __slots__ = ("_row",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._row = None
+
+    @property
+    def compatibility_row(self):
+        """
+        the row of the operator in COMPATIBILITY. the _compatible list of the operator must not change once the row
+        is known.
+        """
+        if self._row is None:
+            self._row = COMPATIBILITY.row(self._compatible)
+        return self._row
+
     def _as_type(self, symbol_right, symbol_left):
         """
         Evaluates an operator using the passed symbols as parameter (operands).
-        returns None if the operator is not compatible with the operands
-        otherwise returns a tuple representing the resulting type of the operator execution
+        returns INCOMPATIBLE if the operator is not compatible with the operands
+        otherwise returns the index of the resulting type of the operator execution, or DEREFERENCE for two pointers
         raises an warning if the operand is not an instance of BaseType.
         """
         if not isinstance(symbol_right, BaseType):
             _MODULE_LOGGER.warning("symbol '{0}' is not a BaseType.".format(symbol_right))
-            return None
+            return INCOMPATIBLE
 
         if not isinstance(symbol_left, BaseType):
             _MODULE_LOGGER.warning("symbol '{0}' is not a BaseType.".format(symbol_left))
-            return None
-
-        result = [t for t in self._compatible if t[0] == symbol_left.index and t[1] == symbol_right.index]
-
-        if len(result) > 1:
-            raise KeyError("unexpected multiple results in method")
+            return INCOMPATIBLE
 
-        if not result:
-            return None
+        left = symbol_left.index
+        right = symbol_right.index
+        if left is None or right is None:
+            return INCOMPATIBLE
 
-        return result[0]
+        row = self._row
+        if row is None:
+            row = self.compatibility_row
+        return COMPATIBILITY.lookup(row, left, right)
 
     def is_compatible(self, symbol_right, symbol_left):
         """
@@ -85,8 +163,7 @@ class BinaryOperator(Operator):
         otherwise returns True
         raises and exception if the operand is not an instance of Literal or BaseType.
         """
-        result = self._as_type(symbol_right, symbol_left)
-        return True if result else False
+        return self._as_type(symbol_right, symbol_left) != INCOMPATIBLE
 
     def evaluate_to_type(self, symbol_right, symbol_left):
         """
@@ -101,32 +178,13 @@ class BinaryOperator(Operator):
         Unit tests are adjusted to reflect that.
         """
         result = self._as_type(symbol_right, symbol_left)
-        if result == (6,6,6):    # this is the scenario for pointer operations. a compiler directive could be used to control it. if flexibility is given, OO programing could be considered
+        if result == DEREFERENCE:    # this is the scenario for pointer operations. a compiler directive could be used to control it. if flexibility is given, OO programing could be considered
             assert isinstance(symbol_right.type, BaseType) and isinstance(symbol_left.type, BaseType), "property 'type' for PointerType must be a BaseType. Found '{0}' and '{1}'".format(symbol_left, symbol_right)
             result = self._as_type(symbol_right.type, symbol_left.type)
-        if not result:
-            return None
-        result = result[2]
-        if result == 0:
-            return BasicType.reserved_type_integer()
-        if result == 1:
-            return BasicType.reserved_type_real()
-        if result == 2:
-            return BasicType.reserved_type_set()
-        if result == 3:
-            return BasicType.reserved_type_char()
-        if result == 4:
-            return StringType.reserved_type_string()
-        if result == 5:
-            return BasicType.reserved_type_boolean()
-        if result == 6:
-            return PointerType.reserved_type_pointer()
-        if result == 7:
-            return BasicType.reserved_type_text()
-        if result == 8:
-            return BasicType.reserved_type_array()
-        if result == 9:
-            return BasicType.reserved_type_null()
+            if result == DEREFERENCE:    # pointers to pointers
+                result = _POINTER_
+        # the resulting types are the shared builtin types
+        return None if result == INCOMPATIBLE else RESERVED_TYPES[result]
 
     @classmethod
     def operator_multiply(cls):
@@ -445,6 +503,8 @@ class UnaryOperator(Operator):
      [INT  REAL SET  CHAR  STR  BOOL  POINT  TEXT  ARRAY]
     """
 
+    __slots__ = ()
+
     def _as_type(self, symbol):
         """
         Evaluates an operator using the passed symbol as parameter (operand).
@@ -475,29 +535,10 @@ class UnaryOperator(Operator):
         raises and exception if the operand is not an instance of Literal or BaseType.
         """
         result = self._as_type(symbol)
-        if result == 0:
-            return BasicType.reserved_type_integer()
-        if result == 1:
-            return BasicType.reserved_type_real()
-        if result == 2:
-            return BasicType.reserved_type_set()
-        if result == 3:
-            return BasicType.reserved_type_char()
-        if result == 4:
-            return StringType.reserved_type_string()
-        if result == 5:
-            return BasicType.reserved_type_boolean()
-        if result == 6:
-            return PointerType.reserved_type_pointer()
-        if result == 7:
-            return BasicType.reserved_type_text()
-        if result == 8:
-            return BasicType.reserved_type_array()
-        if result == 9:
-            return BasicType.reserved_type_null()
         if result == -1:    # action triggered by the UPARROW operator which is basically a de-pointer operation
-            result = symbol.type
-        return result
+            return symbol.type
+        # the resulting types are the shared builtin types
+        return None if result is None else RESERVED_TYPES[result]
 
     @classmethod
     def operator_not(cls):
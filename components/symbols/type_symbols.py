@@ -10,6 +10,8 @@ from components.symbols.base_symbols import BaseType
 
 class PointerType(BaseType):
 
+    __slots__ = ()
+
     @classmethod
     def reserved_type_pointer(cls):
         a_type = cls('POINTER', 'RESERVED_TYPE_POINTER', 'POINTER')
@@ -32,6 +34,8 @@ class PointerType(BaseType):
 
 class CustomType(BaseType):
 
+    __slots__ = ()
+
     def do_nothing(self):
         pass
 
@@ -42,6 +46,8 @@ class CustomType(BaseType):
 
 class BasicType(BaseType):
 
+    __slots__ = ()
+
     @classmethod
     def reserved_type_integer(cls):
         a_type = cls('INTEGER', 'RESERVED_TYPE_INTEGER', None)
@@ -120,6 +126,8 @@ class BasicType(BaseType):
 
 class StringType(BaseType):
 
+    __slots__ = ("_dimension",)
+
     def __str__(self):
         return "{0}({1}[{2}])".format(self.category, self.type, self.dimension)
 
@@ -143,6 +151,7 @@ class StringType(BaseType):
 
     @dimension.setter
     def dimension(self, new_dimension):
+        self._check_not_frozen()
         self._dimension = new_dimension
 
     @property
@@ -150,3 +159,30 @@ class StringType(BaseType):
         # return "unsigned char"
         return "char"
 
+
+# the builtin types, frozen and shared by every compilation, by their index in the compatibility tables of the
+# operators
+RESERVED_TYPES = tuple(a_type.freeze() for a_type in (BasicType.reserved_type_integer(),
+                                                      BasicType.reserved_type_real(),
+                                                      BasicType.reserved_type_set(),
+                                                      BasicType.reserved_type_char(),
+                                                      StringType.reserved_type_string(),
+                                                      BasicType.reserved_type_boolean(),
+                                                      PointerType.reserved_type_pointer(),
+                                                      BasicType.reserved_type_text(),
+                                                      BasicType.reserved_type_array(),
+                                                      BasicType.reserved_type_null()))
+
+_STRING_TYPES_ = {}
+
+
+def string_type(dimension):
+    """
+    returns the shared, frozen, StringType of the strings of dimension characters.
+    """
+    dimension = int(str(dimension))
+    result = _STRING_TYPES_.get(dimension)
+    if result is None:
+        result = StringType('STRING', 'RESERVED_TYPE_STRING', 'STRING', dimension).freeze()
+        _STRING_TYPES_[dimension] = result
+    return result
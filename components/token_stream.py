@@ -0,0 +1,169 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+from components.deft_pascal_parser_3 import UnexpectedCharacters
+from array import array
+from bisect import bisect_right
+import re
+
+
+class StreamLexer:
+    """
+    lexer built from the terminals of the parser, so the grammar stays the only place where tokens are defined.
+    it follows the rules of lark's basic lexer: terminals are tried by priority and then by longest possible match,
+    and a keyword is recognised when an identifier matches it completely.
+    """
+
+    def __init__(self, terminals, ignore, regex_flags=0):
+        terminals = sorted(terminals, key=lambda x: (-x.priority, -x.pattern.max_width, -len(x.pattern.value), x.name))
+        self.terminal_names = [terminal.name for terminal in terminals]
+        ids = {name: index for index, name in enumerate(self.terminal_names)}
+
+        self._ignore = array("b", [name in ignore for name in self.terminal_names])
+        self._pattern = re.compile("|".join("(?P<t{0}>{1})".format(ids[terminal.name], terminal.pattern.to_regexp())
+                                            for terminal in terminals).encode("utf-8"), regex_flags)
+
+        # for each regular expression terminal, the string terminals it matches in full, keyed by their text
+        self._keywords = {}
+        strings = [terminal for terminal in terminals if terminal.pattern.type == "str"]
+        for terminal in terminals:
+            if terminal.pattern.type != "re":
+                continue
+            pattern = re.compile(terminal.pattern.to_regexp(), regex_flags)
+            exact, folded = {}, {}
+            for string in strings:
+                if string.priority <= terminal.priority and pattern.fullmatch(string.pattern.value):
+                    table = folded if "i" in string.pattern.flags else exact
+                    key = string.pattern.value.encode("utf-8")
+                    table.setdefault(key.lower() if table is folded else key, ids[string.name])
+            if exact or folded:
+                self._keywords[ids[terminal.name]] = (exact, folded)
+
+    def tokenize(self, source):
+        """
+        returns the TokenStream of source, which can be a str or any bytes like object such as a mmap.
+        """
+        if isinstance(source, str):
+            source = source.encode("utf-8")
+        view = memoryview(source)
+        types = array("H")
+        starts = array("I")
+        lengths = array("I")
+        match = self._pattern.match
+        ignore = self._ignore
+        keywords = self._keywords
+        position = 0
+        end = len(view)
+        while position < end:
+            found = match(view, position)
+            if not found:
+                stream = TokenStream(view, self.terminal_names, types, starts, lengths)
+                line, column = stream.position_of(position)
+                raise UnexpectedCharacters(bytes(view), position, line, column)
+            token_end = found.end()
+            token_type = int(found.lastgroup[1:])
+            if not ignore[token_type]:
+                if token_type in keywords:
+                    exact, folded = keywords[token_type]
+                    text = view[position:token_end].tobytes()
+                    token_type = exact.get(text, folded.get(text.lower(), token_type))
+                types.append(token_type)
+                starts.append(position)
+                lengths.append(token_end - position)
+            position = token_end
+        return TokenStream(view, self.terminal_names, types, starts, lengths)
+
+
+class TokenStream:
+    """
+    the tokens of a source held column wise: the terminal id, start offset and length of each token are stored in
+    arrays over a memoryview of the source. no string is created until the value of a token is asked for.
+    offsets and columns count bytes of the utf-8 encoded source.
+    """
+
+    __slots__ = ("_view", "_terminal_names", "types", "starts", "lengths", "_newlines")
+
+    def __init__(self, view, terminal_names, types, starts, lengths):
+        self._view = view
+        self._terminal_names = terminal_names
+        self.types = types
+        self.starts = starts
+        self.lengths = lengths
+        self._newlines = None
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.types)
+        if not 0 <= index < len(self.types):
+            raise IndexError("token index out of range")
+        return StreamToken(self, index)
+
+    def __iter__(self):
+        for index in range(len(self.types)):
+            yield StreamToken(self, index)
+
+    def type_of(self, index):
+        return self._terminal_names[self.types[index]]
+
+    def value_of(self, index):
+        start = self.starts[index]
+        return str(self._view[start:start + self.lengths[index]], "utf-8")
+
+    def position_of(self, offset):
+        """
+        returns the (line, column) of offset, both starting at 1. the line index is built on first use.
+        """
+        if self._newlines is None:
+            self._newlines = array("I", (found.start() for found in re.finditer(b"\n", self._view)))
+        line = bisect_right(self._newlines, offset - 1)
+        line_start = self._newlines[line - 1] + 1 if line else 0
+        return line + 1, offset - line_start + 1
+
+
+class StreamToken:
+    """
+    view of one token of a TokenStream, with the attributes of a lark Token computed on demand.
+    """
+
+    __slots__ = ("_stream", "_index")
+
+    def __init__(self, stream, index):
+        self._stream = stream
+        self._index = index
+
+    def __repr__(self):
+        return "StreamToken({0!r}, {1!r})".format(self.type, self.value)
+
+    def __str__(self):
+        return self.value
+
+    @property
+    def type(self):
+        return self._stream.type_of(self._index)
+
+    @property
+    def value(self):
+        return self._stream.value_of(self._index)
+
+    @property
+    def start_pos(self):
+        return self._stream.starts[self._index]
+
+    @property
+    def end_pos(self):
+        return self._stream.starts[self._index] + self._stream.lengths[self._index]
+
+    @property
+    def line(self):
+        return self._stream.position_of(self.start_pos)[0]
+
+    @property
+    def column(self):
+        return self._stream.position_of(self.start_pos)[1]
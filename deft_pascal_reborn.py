@@ -5,13 +5,18 @@ DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original D
 HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
 """
 
-from components.deft_pascal_compiler import DeftPascalCompiler
+# the compiler modules import lark, which takes longer than compiling a small program. they are imported where they
+# are used, so the client of the compile server (-server) starts quickly.
+from components.source_files import ArtefactWriter, read_source
+from components.preprocessor import Preprocessor
+from components.compile_client import compile_remote
 
 import argparse
 import logging
 import os
 import subprocess
 import sys
+import time
 
 _MAIN_LOGGER = logging.getLogger(__name__)
 
@@ -29,10 +34,14 @@ class DeftPascalReborn:
             print("\nConfiguration error. Terminating execution.\n")
             sys.exit(1)
         self._compiler = None
+        self._artefacts = ArtefactWriter(self._arguments.input_file,
+                                         output_path=self._arguments.output_path,
+                                         overwrite=self._arguments.overwrite == "Yes",
+                                         in_memory=self._arguments.in_memory == "Yes")
 
     def _initialise_arguments_parser(self):
         parser = argparse.ArgumentParser(description="DEFT PASCAL REBORN. Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler. Copyright (C) 2020- Andre L Ballista. More details at https://github.com/brnomade/deft_pascal_reborn")
-        parser.add_argument("input_file", help="file name of the input file. file extension expected. a full file path can be provided with the file name")
+        parser.add_argument("input_file", help="file name of the input file. file extension expected. a full file path can be provided with the file name. with -batch, a folder or a glob")
         parser.add_argument("compiler_executable", help="file name of the compiler executable. file extension expected. a full file path can be provided with the file name")
         parser.add_argument("-output_path", help="filepath for the output files. if not provided, the path from the input file is used.")
         parser.add_argument("-compiler", choices=['GCC', 'CMOC'], default='GCC', help="compiler to transform the intermediate code into an executable")
@@ -40,6 +49,16 @@ class DeftPascalReborn:
         parser.add_argument("-overwrite", choices=['Yes', 'No'], default='Yes', help="overwrite any output file if they already exist")
         parser.add_argument("-steps", choices=['SYNTAX', 'SEMANTIC', 'INTERMEDIATE', 'BUILD'], default='BUILD', help="compilation steps to perform")
         parser.add_argument("-save_steps", choices=['Yes', 'No'], default='Yes', help="save the result AST to a file in the same location as the output_file")
+        parser.add_argument("-in_memory", choices=['Yes', 'No'], default='No', help="keep the .ast, .ic and .c files in memory instead of writing them. cannot be used with the BUILD step")
+        parser.add_argument("-ast_cache", help="folder where parse trees are cached between runs. if not provided, nothing is cached")
+        parser.add_argument("-ast_cache_size", type=int, default=256, help="size limit of the parse tree cache in megabytes")
+        parser.add_argument("-include_path", action="append", default=[], help="folder searched for {$I} include files after the folder of the including file. can be repeated")
+        parser.add_argument("-define", action="append", default=[], help="symbol defined for {$IFDEF} before the compilation starts. can be repeated")
+        parser.add_argument("-lexer", choices=['LARK', 'KEYWORD'], default='LARK', help="lexer used by the parser. KEYWORD is faster on large sources")
+        parser.add_argument("-max_errors", type=int, default=1, help="number of syntax errors reported before the syntax check stops. with more than 1 the parser recovers from each error and carries on")
+        parser.add_argument("-batch", choices=['Yes', 'No'], default='No', help="compile every .pas file in the input_file folder, or every file matched by the input_file glob (e.g. 'src/**/*.pas'), on parallel processes")
+        parser.add_argument("-j", "--jobs", type=int, help="number of processes used by -batch. if not provided, one per cpu")
+        parser.add_argument("-server", help="socket of the compile server (python -m components.compile_server socket) that compiles the input file. the BUILD step is still run here. -ast_cache is then ignored")
         parser.add_argument("-q", "--quiet", action="count", help="quietness levels")
         parser.add_argument('--version', action='version', version='%(prog)s '+self._glb_app_version)
         return parser.parse_args()
@@ -61,6 +80,9 @@ class DeftPascalReborn:
         # present the settings
         self._present_script_section("SETTINGS")
         print("input file:", self._arguments.input_file)
+        print("batch:", self._arguments.batch)
+        print("jobs:", self._arguments.jobs or os.cpu_count())
+        print("compile server:", self._arguments.server)
         print("compiler executable:", self._arguments.compiler_executable)
         print("output path:", self._arguments.output_path)
         print("backend compiler:", self._arguments.compiler)
@@ -68,13 +90,34 @@ class DeftPascalReborn:
         print("overwrite flag:", self._arguments.overwrite)
         print("steps to perform:", self._arguments.steps)
         print("save intermediate files:", self._arguments.save_steps)
+        print("keep files in memory:", self._arguments.in_memory)
+        print("maximum syntax errors:", self._arguments.max_errors)
+        print("parse tree cache:", self._arguments.ast_cache)
+        print("lexer:", self._arguments.lexer)
+        print("include paths:", self._arguments.include_path)
+        print("defined symbols:", self._arguments.define)
         print("------------------------")
         print("")
 
 
     def _validate_arguments(self):
         msg = "{0} does not exist or cannot be found at {1}"
-        if not os.path.isfile(self._arguments.input_file):
+        if self._arguments.batch == "Yes":
+            from components.batch_compiler import find_sources
+            if self._arguments.server:
+                print("Batch compilation cannot be sent to a compile server")
+                return False
+            if not find_sources([self._arguments.input_file]):
+                print(msg.format("Input files", self._arguments.input_file))
+                return False
+            if self._arguments.in_memory == "Yes":
+                print("Batch compilation writes its files to disk and cannot be used with in_memory")
+                return False
+            if self._arguments.jobs is not None and self._arguments.jobs < 1:
+                print("Number of jobs must be at least 1")
+                return False
+
+        elif not os.path.isfile(self._arguments.input_file):
             print(msg.format("Input file", self._arguments.input_file))
             return False
 
@@ -86,6 +129,14 @@ class DeftPascalReborn:
             if not os.path.isdir(self._arguments.output_path):
                 print(msg.format("Output folder", self._arguments.output_path))
                 return False
+
+        if self._arguments.in_memory == "Yes" and self._arguments.steps == "BUILD":
+            print("The BUILD step needs the C file on disk and cannot be used with in_memory")
+            return False
+
+        if self._arguments.max_errors < 1:
+            print("Maximum syntax errors must be at least 1")
+            return False
         return True
 
     def _adjust_verbosity(self):
@@ -105,33 +156,22 @@ class DeftPascalReborn:
 
 
     def _save_to_file(self, in_memory_buffer, extension):
-        #
-        if not self._arguments.output_path:
-            output_path = os.path.dirname(self._arguments.input_file)
-        else:
-            output_path = self._arguments.output_path
-        #
-        filename = os.path.basename(self._arguments.input_file)
-        filename = filename.split(".")[0] + "." + extension
-        #
-        output_file = os.path.join(output_path, filename)
-        #
-        if os.path.isfile(output_file) and not self._arguments.overwrite:
-            msg = "file {0} already exists. will not overwrite it."
-            print(msg.format(output_file))
-        else:
-            file = open(output_file, "w")
-            file.write(in_memory_buffer)
-            file.close()
-        return output_file
+        return self._artefacts.write(in_memory_buffer, extension)
+
+    @property
+    def artefacts(self):
+        """
+        the .ast, .ic and .c contents by extension, when running with in_memory.
+        """
+        return self._artefacts.contents
 
 
     def _execute_syntax_chek(self, pascal_source):
-        log = self._compiler.check_syntax(pascal_source)
+        log = self._compiler.check_syntax(pascal_source, self._arguments.input_file)
         if log["ERROR"]:
             print(log["ERROR"])
         #
-        if not log["ERROR"] and self._arguments.save_steps:
+        if not log["ERROR"] and self._arguments.save_steps == "Yes":
             self._save_to_file(self._compiler.ast.pretty(), "ast")
         #
         return log
@@ -142,7 +182,7 @@ class DeftPascalReborn:
         if log["ERROR"]:
             print(log["ERROR"])
         #
-        if not log["ERROR"] and self._arguments.save_steps:
+        if not log["ERROR"] and self._arguments.save_steps == "Yes":
             self._save_to_file(self._compiler.intermediate_code, "ic")
         #
         return log
@@ -251,11 +291,127 @@ class DeftPascalReborn:
         return result_err
 
 
+    def _compiler_options(self):
+        """
+        the arguments of DeftPascalCompiler given on the command line.
+        """
+        ast_cache = None
+        if self._arguments.ast_cache:
+            from components.ast_cache import AstCache
+            ast_cache = AstCache(self._arguments.ast_cache, self._arguments.ast_cache_size * 1024 * 1024)
+        lexer = None
+        if self._arguments.lexer == "KEYWORD":
+            from components.keyword_lexer import KeywordLexer
+            lexer = KeywordLexer
+        return dict(cmoc=self._arguments.compiler == "CMOC",
+                    max_errors=self._arguments.max_errors,
+                    ast_cache=ast_cache,
+                    preprocessor=Preprocessor(self._arguments.include_path, self._arguments.define),
+                    lexer=lexer,
+                    severity=self._severity())
+
+    def _severity(self):
+        """
+        the lowest severity of the messages of the compiler, from the verbosity. it also sets the logger level.
+        """
+        # errors are needed to tell whether the compilation failed, so the verbosity never drops them
+        log_level = min(self._adjust_verbosity(), logging.ERROR)
+        logging.getLogger("deft_pascal_reborn").setLevel(log_level)
+        return logging.getLevelName(log_level)
+
+
+    def _execute_batch(self):
+        """
+        compiles the files of the batch on parallel processes and reports each one as soon as it is done.
+        the processes stop at the C code. the BUILD step is run here, on each C file as it arrives.
+        """
+        from components.batch_compiler import compile_files, find_sources
+        start = time.perf_counter()
+        file_names = find_sources([self._arguments.input_file])
+        steps = "INTERMEDIATE" if self._arguments.steps == "BUILD" else self._arguments.steps
+        failed = 0
+        try:
+            results = compile_files(file_names,
+                                    jobs=self._arguments.jobs,
+                                    steps=steps,
+                                    output_path=self._arguments.output_path,
+                                    overwrite=self._arguments.overwrite == "Yes",
+                                    save_steps=self._arguments.save_steps == "Yes",
+                                    **self._compiler_options())
+        except ValueError as error:
+            print(error)
+            return False
+        for result in results:
+            errors = result.diagnostics["ERROR"]
+            if not errors and self._arguments.steps == "BUILD":
+                if "c" not in result.artefacts:
+                    errors = ["no C code generated"]
+                else:
+                    log = self._compile_in_c_compiler(result.artefacts["c"])
+                    errors = [log] if log else []
+            if errors:
+                failed = failed + 1
+            print("{0} {1} ({2:.2f}s)".format("FAILED" if errors else "ok", result.file_name, result.seconds))
+            for error in errors:
+                print("    {0}".format(error))
+        print("{0} files compiled, {1} failed, in {2:.2f}s".format(len(file_names), failed,
+                                                                   time.perf_counter() - start))
+        return failed == 0
+
+
+    def _execute_remote(self, pascal_source):
+        """
+        compiles pascal_source on the compile server and saves the artefacts it sends back.
+        returns the path to the C code, or True when the steps stop before it, or None when the compilation failed.
+        """
+        steps = "INTERMEDIATE" if self._arguments.steps == "BUILD" else self._arguments.steps
+        severity = self._severity()
+        log, contents = compile_remote(self._arguments.server, pascal_source, self._arguments.input_file,
+                                       steps=steps,
+                                       save_steps=self._arguments.save_steps == "Yes",
+                                       cmoc=self._arguments.compiler == "CMOC",
+                                       max_errors=self._arguments.max_errors,
+                                       lexer=self._arguments.lexer,
+                                       include_path=self._arguments.include_path,
+                                       define=self._arguments.define,
+                                       severity=severity)
+        # the messages were raised by the server, they are logged here as the compiler would have logged them
+        logger = logging.getLogger("deft_pascal_reborn")
+        for diagnostic in log.diagnostics:
+            if diagnostic.severity != "ERROR":
+                logger.log(logging.getLevelName(diagnostic.severity), diagnostic)
+        if log["ERROR"]:
+            print(log["ERROR"])
+            return None
+        #
+        path_to_c_code = None
+        for extension, content in contents.items():
+            file_name = self._save_to_file(content, extension)
+            if extension == "c":
+                path_to_c_code = file_name
+        if steps == "INTERMEDIATE":
+            return path_to_c_code
+        return True
+
+
     def execute(self):
         #
-        self._compiler = DeftPascalCompiler(cmoc=self._arguments.compiler == "CMOC")
+        if self._arguments.batch == "Yes":
+            return self._execute_batch()
+        #
+        if self._arguments.server:
+            path_to_c_code = self._execute_remote(read_source(self._arguments.input_file))
+            if path_to_c_code and self._arguments.steps == "BUILD":
+                log = self._compile_in_c_compiler(path_to_c_code)
+                if log:
+                    print(log)
+                    return None
+            return path_to_c_code and True
+        #
+        from components.deft_pascal_compiler import DeftPascalCompiler
+        self._compiler = DeftPascalCompiler(**self._compiler_options())
         #
-        pascal_source = open(self._arguments.input_file, "r").read()
+        pascal_source = read_source(self._arguments.input_file)
         #
         log = self._execute_syntax_chek(pascal_source)
         if log["ERROR"]:
@@ -0,0 +1,113 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+from unittest import TestCase, mock
+
+from components.deft_pascal_parser_3 import DeftPascalParser
+from components.compact_ast import lower
+from components.ast_cache import AstCache
+
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+class TestAstCache(TestCase):
+
+    _PROGRAM = "PROGRAM cached; VAR v1 : INTEGER; BEGIN v1 := 1 + 2; WRITELN('done') END."
+
+    def _ast(self, program=None):
+        ast, error_log = DeftPascalParser().parse_tree(program or self._PROGRAM)
+        self.assertEqual([], error_log)
+        return lower(ast)
+
+    @staticmethod
+    def _entries(directory):
+        return [i for i in os.listdir(directory) if i.endswith(".ast")]
+
+    def test_store_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = AstCache(directory)
+            self.assertIsNone(cache.load(self._PROGRAM))
+            ast = self._ast()
+            cache.store(self._PROGRAM, ast)
+            cached_ast = cache.load(self._PROGRAM)
+            self.assertEqual(ast, cached_ast)
+            self.assertEqual(ast.pretty(), cached_ast.pretty())
+            self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_other_source_is_a_miss(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = AstCache(directory)
+            cache.store(self._PROGRAM, self._ast())
+            self.assertIsNone(cache.load(self._PROGRAM + " "))
+            self.assertEqual((0, 1), (cache.hits, cache.misses))
+
+    def test_entry_of_another_grammar_is_not_used(self):
+        with tempfile.TemporaryDirectory() as directory:
+            AstCache(directory).store(self._PROGRAM, self._ast())
+            with mock.patch.object(DeftPascalParser, "grammar_hash", return_value="another grammar"):
+                self.assertIsNone(AstCache(directory).load(self._PROGRAM))
+
+    def test_corrupt_entry_is_discarded(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = AstCache(directory)
+            cache.store(self._PROGRAM, self._ast())
+            file_name = os.path.join(directory, self._entries(directory)[0])
+            with open(file_name, "rb") as file:
+                content = file.read()
+            with open(file_name, "wb") as file:
+                file.write(content[:len(content) // 2])
+            self.assertIsNone(cache.load(self._PROGRAM))
+            self.assertEqual([], self._entries(directory))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            programs = ["PROGRAM p{0}; BEGIN END.".format(i) for i in range(3)]
+            cache = AstCache(directory)
+            cache.store(programs[0], self._ast(programs[0]))
+            entry_size = os.path.getsize(os.path.join(directory, self._entries(directory)[0]))
+            cache = AstCache(directory, max_bytes=2 * entry_size)
+            cache.store(programs[1], self._ast(programs[1]))
+            os.utime(cache._file_name(programs[0]), (0, 0))
+            self.assertIsNotNone(cache.load(programs[1]))
+            cache.store(programs[2], self._ast(programs[2]))
+            self.assertEqual(2, len(self._entries(directory)))
+            self.assertIsNone(cache.load(programs[0]))
+            self.assertIsNotNone(cache.load(programs[1]))
+            self.assertIsNotNone(cache.load(programs[2]))
+
+    def test_directory_is_listed_only_to_count_and_to_evict(self):
+        with tempfile.TemporaryDirectory() as directory:
+            programs = ["PROGRAM p{0}; BEGIN END.".format(i) for i in range(5)]
+            AstCache(directory).store(programs[0], self._ast(programs[0]))
+            entry_size = os.path.getsize(os.path.join(directory, self._entries(directory)[0]))
+            cache = AstCache(directory, max_bytes=4 * entry_size + entry_size // 2)
+            with mock.patch("components.ast_cache.os.scandir", wraps=os.scandir) as scandir:
+                for program in programs[1:4]:
+                    cache.store(program, self._ast(program))
+                self.assertEqual(1, scandir.call_count)
+                cache.store(programs[4], self._ast(programs[4]))
+                self.assertEqual(2, scandir.call_count)
+            self.assertEqual(4, len(self._entries(directory)))
+
+    def test_entry_stored_again_is_counted_once(self):
+        with tempfile.TemporaryDirectory() as directory:
+            programs = ["PROGRAM p{0}; BEGIN END.".format(i) for i in range(2)]
+            AstCache(directory).store(programs[0], self._ast(programs[0]))
+            entry_size = os.path.getsize(os.path.join(directory, self._entries(directory)[0]))
+            cache = AstCache(directory, max_bytes=3 * entry_size)
+            with mock.patch("components.ast_cache.os.scandir", wraps=os.scandir) as scandir:
+                cache.store(programs[1], self._ast(programs[1]))
+                for _ in range(4):
+                    cache.store(programs[0], self._ast(programs[0]))
+                # only the first store lists the directory, the entries never took more than max_bytes
+                self.assertEqual(1, scandir.call_count)
+            self.assertEqual(sum(os.path.getsize(os.path.join(directory, i)) for i in self._entries(directory)),
+                             cache._size)
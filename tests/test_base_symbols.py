@@ -6,9 +6,13 @@ HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
 """
 
 from unittest import TestCase
-from components.symbols.base_symbols import BaseSymbol, BaseIdentifier, BaseType, BaseKeyword, BaseExpression
-from components.symbols.literals_symbols import Literal
 from lark import Token
+from components.symbols.base_symbols import BaseSymbol, BaseIdentifier, BaseType, BaseKeyword, BaseExpression, \
+    ExpressionNode
+from components.symbols.literals_symbols import Literal, NumericLiteral, BooleanLiteral
+from components.symbols.operator_symbols import BinaryOperator, UnaryOperator, NeutralOperator
+# every symbol module is imported, for test_slots
+from components.symbols import expression_symbols, identifier_symbols, operator_symbols, type_symbols
 
 import logging
 
@@ -105,6 +109,24 @@ class TestBaseSymbol(TestCase):
             symbol = BaseSymbol('test_name', p, 'test_value')
             self.assertIsInstance(symbol.precedence, int)
 
+    def test_freeze(self):
+        symbol = BaseSymbol('test_symbol', 'test_type', 'test_value')
+        self.assertIs(symbol, symbol.freeze())
+        for attribute in ('name', 'type', 'value'):
+            with self.assertRaises(AttributeError):
+                setattr(symbol, attribute, 'new_value')
+        self.assertEqual('test_symbol', symbol.name)
+        self.assertEqual('test_type', symbol.type)
+        self.assertEqual('test_value', symbol.value)
+
+    def test_slots(self):
+        self.assertFalse(hasattr(BaseSymbol('test_symbol'), '__dict__'))
+        classes = [BaseSymbol]
+        for symbol_class in classes:
+            classes.extend(symbol_class.__subclasses__())
+            if symbol_class.__module__.startswith('components.symbols.'):
+                self.assertIn('__slots__', vars(symbol_class), symbol_class)
+
 
 class TestBaseIdentifier(TestCase):
 
@@ -124,6 +146,12 @@ class TestBaseType(TestCase):
         symbol.index = 100
         self.assertEqual(100, symbol.index)
 
+    def test_equality(self):
+        symbol = BaseType("base_type", "BASE_TYPE", "base").freeze()
+        self.assertEqual(symbol, symbol)
+        self.assertEqual(BaseType("base_type", "BASE_TYPE", "base"), symbol)
+        self.assertNotEqual(BaseType("base_type", "OTHER_TYPE", "base"), symbol)
+
 
 class TestKeyword(TestCase):
 
@@ -138,6 +166,43 @@ class TestGenericExpression(TestCase):
         symbol = BaseExpression("generic")
         self.assertIsInstance(symbol, BaseExpression)
 
+    def test_from_list_keeps_tree(self):
+        expression_list = [_number(1), BinaryOperator.operator_plus(), _number(2)]
+        expression = BaseExpression.from_list(expression_list)
+        self.assertEqual("RESERVED_TYPE_INTEGER", expression.type)
+        self.assertIs(type_symbols.RESERVED_TYPES[0], expression.tree.type)
+        self.assertIs(expression_list[1], expression.tree.symbol)
+        self.assertEqual(expression_list, expression.value)
+
+    def test_from_list_incompatible_types(self):
+        expression_list = [_number(1), BinaryOperator.operator_plus(), BooleanLiteral.true()]
+        self.assertIsNone(BaseExpression.from_list(expression_list))
+
+    def test_from_node(self):
+        assignment = BaseExpression.from_list([BaseIdentifier("v", type_symbols.RESERVED_TYPES[0], None),
+                                               BinaryOperator.operator_assignment(),
+                                               _number(1), BinaryOperator.operator_plus(), _number(2)])
+        right_side = assignment.tree.operands[1]
+        expression = BaseExpression.from_node(right_side, [])
+        self.assertIs(right_side, expression.tree)
+        self.assertEqual("RESERVED_TYPE_INTEGER", expression.type)
+
+    def test_from_list_and_from_node_build_the_subclass(self):
+        integer_list = [_number(1), BinaryOperator.operator_plus(), _number(2)]
+        boolean_list = [_number(1), BinaryOperator.operator_less_than(), _number(2)]
+        for expression_class, expression_list in [(expression_symbols.ConstantExpression, integer_list),
+                                                  (expression_symbols.IntegerExpression, integer_list),
+                                                  (expression_symbols.BooleanExpression, boolean_list)]:
+            expression = expression_class.from_list(expression_list)
+            self.assertIs(expression_class, type(expression))
+            self.assertIs(expression_class, type(expression_class.from_node(expression.tree, expression_list)))
+
+    def test_operand(self):
+        one = _number(1)
+        self.assertIs(one, BaseExpression.from_list([one]).operand)
+        self.assertIs(one, BaseExpression.from_list([_left(), one, _right()]).operand)
+        self.assertIsNone(BaseExpression.from_list([UnaryOperator.operator_arithmetic_negation(), one]).operand)
+
     #def test_from_list(self):
     #    symbol = BaseExpression.from_list([1, 2, 3])
     #    self.assertEqual([1,2,3], symbol.value)
@@ -145,3 +210,57 @@ class TestGenericExpression(TestCase):
     #    self.assertEqual('GENERIC_EXPRESSION', symbol.type)
 
 
+
+
+def _number(value):
+    return NumericLiteral.from_value(str(value), "INTEGER")
+
+
+def _left():
+    return NeutralOperator.operator_left_parentheses()
+
+
+def _right():
+    return NeutralOperator.operator_right_parentheses()
+
+
+class TestExpressionNode(TestCase):
+
+    def test_precedence(self):
+        # 1 + 2 * 3
+        plus, multiply = BinaryOperator.operator_plus(), BinaryOperator.operator_multiply()
+        tree = ExpressionNode.from_infix([_number(1), plus, _number(2), multiply, _number(3)])
+        self.assertIs(plus, tree.symbol)
+        self.assertIs(multiply, tree.operands[1].symbol)
+        self.assertIs(type_symbols.RESERVED_TYPES[0], tree.type)
+
+    def test_parentheses(self):
+        # (1 + 2) * 3
+        plus, multiply = BinaryOperator.operator_plus(), BinaryOperator.operator_multiply()
+        expression_list = [_left(), _number(1), plus, _number(2), _right(), multiply, _number(3)]
+        tree = ExpressionNode.from_infix(expression_list)
+        self.assertIs(multiply, tree.symbol)
+        self.assertIs(plus, tree.operands[0].symbol)
+        self.assertEqual(((expression_list[0], expression_list[4]),), tree.operands[0].parentheses)
+
+    def test_types(self):
+        # NOT (1 < 2)
+        tree = ExpressionNode.from_infix([UnaryOperator.operator_not(), _left(), _number(1),
+                                          BinaryOperator.operator_less_than(), _number(2), _right()])
+        self.assertIs(type_symbols.RESERVED_TYPES[5], tree.type)
+        self.assertIs(type_symbols.RESERVED_TYPES[5], tree.operands[0].type)
+        self.assertIs(type_symbols.RESERVED_TYPES[0], tree.operands[0].operands[0].type)
+
+    def test_incompatible_types(self):
+        tree = ExpressionNode.from_infix([_number(1), BinaryOperator.operator_and(), BooleanLiteral.true()])
+        self.assertIsNone(tree)
+
+    def test_tokens(self):
+        # -((1 + 2)) * (3 - 4) DIV 5
+        expression_list = [UnaryOperator.operator_arithmetic_negation(), _left(), _left(), _number(1),
+                           BinaryOperator.operator_plus(), _number(2), _right(), _right(),
+                           BinaryOperator.operator_multiply(), _left(), _number(3), BinaryOperator.operator_minus(),
+                           _number(4), _right(), BinaryOperator.operator_div(), _number(5)]
+        tree = ExpressionNode.from_infix(expression_list)
+        self.assertEqual(expression_list, tree.tokens())
+        self.assertEqual(expression_list, tree.tokens())
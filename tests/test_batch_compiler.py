@@ -0,0 +1,100 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+from unittest import TestCase
+
+from components.batch_compiler import compile_files, find_sources
+
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+class TestBatchCompiler(TestCase):
+
+    _PROGRAMS = {"good1.pas": "PROGRAM good1; VAR v1 : INTEGER; BEGIN v1 := 1 END.",
+                 "good2.pas": "PROGRAM good2; VAR v1 : INTEGER; BEGIN WHILE v1 < 10 DO v1 := v1 + 1 END.",
+                 os.path.join("lib", "good3.pas"): "PROGRAM good3; VAR b1 : BOOLEAN; BEGIN b1 := TRUE END.",
+                 "semantic.pas": "PROGRAM semantic; VAR v1 : INTEGER; BEGIN v2 := 1 END.",
+                 "syntax.pas": "PROGRAM syntax; BEGIN v1 := END.",
+                 "constant.pas": "PROGRAM constant; CONST c1 = 1; BEGIN c1 := 2 END."}
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+        os.mkdir(os.path.join(self._directory.name, "lib"))
+        for name, source in self._PROGRAMS.items():
+            with open(os.path.join(self._directory.name, name), "w") as file:
+                file.write(source)
+        with open(os.path.join(self._directory.name, "notes.txt"), "w") as file:
+            file.write("not a program")
+
+    def _path(self, *names):
+        return os.path.join(self._directory.name, *names)
+
+    def _errors_by_file(self, results):
+        return {os.path.relpath(i.file_name, self._directory.name): [(d.code, str(d)) for d in i.diagnostics["ERROR"]]
+                for i in results}
+
+    def test_find_sources(self):
+        self.assertEqual(sorted(self._path(i) for i in self._PROGRAMS), find_sources([self._directory.name]))
+        self.assertEqual([self._path("good1.pas"), self._path("good2.pas")],
+                         find_sources([self._path("good*.pas"), self._path("good1.pas")]))
+        self.assertEqual([self._path("lib", "good3.pas")], find_sources([self._path("**", "good3.pas")]))
+        self.assertEqual([], find_sources([self._path("missing*.pas")]))
+
+    def test_results(self):
+        results = list(compile_files(find_sources([self._directory.name]), jobs=1, steps="SEMANTIC"))
+        outcome = self._errors_by_file(results)
+        self.assertEqual(len(self._PROGRAMS), len(results))
+        self.assertEqual([], outcome["good1.pas"])
+        self.assertEqual([], outcome[os.path.join("lib", "good3.pas")])
+        self.assertEqual("variable_access", outcome["semantic.pas"][0][0])
+        self.assertEqual("syntax", outcome["syntax.pas"][0][0])
+        self.assertEqual("assignment_statement", outcome["constant.pas"][0][0])
+        self.assertIn("invalid assignment to constant", outcome["constant.pas"][0][1])
+        good = [i for i in results if i.file_name == self._path("good1.pas")][0]
+        self.assertTrue(good.succeeded)
+        self.assertEqual({"ast": self._path("good1.ast"), "ic": self._path("good1.ic")}, good.artefacts)
+        self.assertTrue(os.path.isfile(self._path("good1.ic")))
+        self.assertFalse(os.path.isfile(self._path("syntax.ast")))
+
+    def test_processes_give_the_same_results(self):
+        file_names = find_sources([self._directory.name])
+        with tempfile.TemporaryDirectory() as output_path:
+            results = list(compile_files(file_names * 3, jobs=3, steps="SEMANTIC", output_path=output_path))
+            self.assertTrue(os.path.isfile(os.path.join(output_path, "lib", "good3.ic")))
+        self.assertEqual(len(file_names) * 3, len(results))
+        self.assertEqual(self._errors_by_file(compile_files(file_names, jobs=1, steps="SEMANTIC", save_steps=False)),
+                         self._errors_by_file(results))
+
+    def test_sources_of_the_same_name_keep_their_artefacts(self):
+        os.mkdir(self._path("other"))
+        with open(self._path("other", "good1.pas"), "w") as file:
+            file.write("PROGRAM other; VAR b1 : BOOLEAN; BEGIN b1 := FALSE END.")
+        file_names = [self._path("good1.pas"), self._path("other", "good1.pas")]
+        with tempfile.TemporaryDirectory() as output_path:
+            results = list(compile_files(file_names, jobs=2, steps="SEMANTIC", output_path=output_path))
+            self.assertTrue(all(i.succeeded for i in results))
+            self.assertEqual({os.path.join(output_path, "good1.ic"), os.path.join(output_path, "other", "good1.ic")},
+                             {i.artefacts["ic"] for i in results})
+            with open(os.path.join(output_path, "other", "good1.ic")) as file:
+                self.assertIn("b1", file.read())
+
+    def test_sources_writing_the_same_artefacts(self):
+        with open(self._path("good1.old.pas"), "w") as file:
+            file.write(self._PROGRAMS["good1.pas"])
+        with self.assertRaises(ValueError):
+            compile_files([self._path("good1.pas"), self._path("good1.old.pas")], jobs=1)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            list(compile_files([], steps="BUILD"))
+        with self.assertRaises(ValueError):
+            list(compile_files([], jobs=-1))
@@ -0,0 +1,83 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+from unittest import TestCase
+
+from components.deft_pascal_parser_3 import DeftPascalParser, Token
+from components.compact_ast import Node, Leaf, NODE_CLASSES, lower
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TestCompactAst(TestCase):
+
+    _PROGRAM = "PROGRAM compact; VAR counter : INTEGER; BEGIN counter := 1; FOR counter := 1 TO 10 DO counter := counter + 1 END."
+
+    def _parse(self):
+        ast, error_log = DeftPascalParser().parse_tree(self._PROGRAM)
+        self.assertEqual([], error_log)
+        return ast
+
+    def test_there_is_one_class_per_grammar_rule(self):
+        for rule_name in ["program_heading", "assignment_statement", "closed_for_statement"]:
+            self.assertTrue(issubclass(NODE_CLASSES[rule_name], Node))
+            self.assertEqual(rule_name, NODE_CLASSES[rule_name].data)
+        self.assertEqual("ClosedForStatement", NODE_CLASSES["closed_for_statement"].__name__)
+
+    def test_nodes_and_leaves_have_no_instance_dictionary(self):
+        ast = lower(self._parse())
+        self.assertFalse(hasattr(ast, "__dict__"))
+        self.assertFalse(hasattr(ast.children[0].children[1], "__dict__"))
+
+    def test_lowering_keeps_the_tree(self):
+        ast = self._parse()
+        compact_ast = lower(ast)
+        self.assertEqual(ast.pretty(), compact_ast.pretty())
+        self.assertEqual(len(list(ast.iter_subtrees())), self._count_nodes(compact_ast))
+
+    def test_identifiers_are_interned(self):
+        compact_ast = lower(self._parse())
+        identifiers = [leaf.value for leaf in self._leaves(compact_ast) if leaf.type == "IDENTIFIER" and leaf.value == "counter"]
+        self.assertEqual(5, len(identifiers))
+        for identifier in identifiers:
+            self.assertIs(identifiers[0], identifier)
+
+    def test_identifiers_keep_their_spelling(self):
+        ast, error_log = DeftPascalParser().parse_tree(self._PROGRAM.replace("VAR counter", "VAR Counter"))
+        identifiers = [leaf.value for leaf in self._leaves(lower(ast)) if leaf.type == "IDENTIFIER"]
+        self.assertEqual(1, identifiers.count("Counter"))
+        self.assertEqual(4, identifiers.count("counter"))
+
+    def test_leaf_compares_like_a_token(self):
+        leaf = Leaf("IDENTIFIER", "counter", 1, 5)
+        self.assertEqual(Token("IDENTIFIER", "counter"), leaf)
+        self.assertEqual("counter", leaf)
+        self.assertEqual("counter", str(leaf))
+        self.assertNotEqual(Leaf("STRING_VALUE", "counter"), leaf)
+
+    @staticmethod
+    def _count_nodes(ast):
+        pending = [ast]
+        count = 0
+        while pending:
+            node = pending.pop()
+            count += 1
+            pending.extend(i for i in node.children if isinstance(i, Node))
+        return count
+
+    @staticmethod
+    def _leaves(ast):
+        pending = [ast]
+        while pending:
+            node = pending.pop()
+            for child in node.children:
+                if isinstance(child, Node):
+                    pending.append(child)
+                else:
+                    yield child
@@ -0,0 +1,98 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+from unittest import TestCase
+
+from components.compile_client import compile_remote
+from components.compile_server import CompileServer
+from components.deft_pascal_compiler import DeftPascalCompiler
+
+import logging
+import os
+import socket
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class TestCompileServer(TestCase):
+
+    _PROGRAM = "PROGRAM server;\nVAR v1 : INTEGER;\nBEGIN\n  v1 := 1;\n  v2 := 2\nEND."
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+        self._socket_path = os.path.join(self._directory.name, "server.sock")
+        self._server = CompileServer(self._socket_path)
+        thread = threading.Thread(target=self._server.serve_forever)
+        thread.start()
+        self.addCleanup(self._server.server_close)
+        self.addCleanup(thread.join)
+        self.addCleanup(self._server.shutdown)
+
+    def test_compile(self):
+        program = self._PROGRAM.replace("v2", "v1")
+        result, contents = compile_remote(self._socket_path, program, steps="SEMANTIC")
+        self.assertTrue(result.succeeded)
+        self.assertEqual(["ast", "ic"], sorted(contents))
+        compiler = DeftPascalCompiler()
+        expected = compiler.check_syntax(program).diagnostics + compiler.compile().diagnostics
+        self.assertEqual(compiler.ast.pretty(), contents["ast"])
+        self.assertEqual([(str(i), i.severity, i.code) for i in expected],
+                         [(str(i), i.severity, i.code) for i in result.diagnostics])
+
+    def test_diagnostics(self):
+        result, contents = compile_remote(self._socket_path, self._PROGRAM, steps="SEMANTIC", severity="ERROR")
+        self.assertEqual(1, len(result.diagnostics))
+        error = result.errors[0]
+        self.assertEqual("variable_access", error.code)
+        self.assertEqual((None, 5, 3, 5, 5), error.span)
+        self.assertEqual(["ast"], list(contents))
+        result, contents = compile_remote(self._socket_path, "PROGRAM syntax;\nBEGIN\n  v1 := ;\nEND.")
+        self.assertEqual("syntax", result.errors[0].code)
+        self.assertEqual({}, contents)
+
+    def test_includes(self):
+        with open(os.path.join(self._directory.name, "body.inc"), "w") as file:
+            file.write("  v1 := 1;\n  v2 := 2\n")
+        result, _ = compile_remote(self._socket_path, "PROGRAM spans;\nVAR v1 : INTEGER;\nBEGIN\n{$I body.inc}\nEND.",
+                                   os.path.join(self._directory.name, "main.pas"), steps="SEMANTIC", save_steps=False)
+        self.assertEqual((os.path.join(self._directory.name, "body.inc"), 2, 3, 2, 5), result.errors[0].span)
+
+    def test_compilers_are_kept(self):
+        for _ in range(3):
+            compile_remote(self._socket_path, self._PROGRAM, steps="SYNTAX", lexer="KEYWORD")
+            compile_remote(self._socket_path, self._PROGRAM, steps="SYNTAX")
+        self.assertEqual(2, len(self._server._compilers))
+
+    def test_bad_requests(self):
+        with self.assertRaises(ValueError):
+            compile_remote(self._socket_path, self._PROGRAM, steps="BUILD")
+        with self.assertRaises(ValueError):
+            compile_remote(self._socket_path, self._PROGRAM, optimise=True)
+        with self.assertRaises(ValueError):
+            compile_remote(self._socket_path, self._PROGRAM, lexer="FAST")
+        self.assertTrue(compile_remote(self._socket_path, "PROGRAM ok; BEGIN END.", steps="SYNTAX")[0].succeeded)
+
+    def test_stale_socket_is_replaced(self):
+        socket_path = os.path.join(self._directory.name, "stale.sock")
+        # a socket bound and closed without being removed, as a server that stopped abruptly leaves it
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(socket_path)
+        server = CompileServer(socket_path)
+        server.server_close()
+        self.assertFalse(os.path.exists(socket_path))
+
+    def test_file_that_is_not_a_socket_is_kept(self):
+        file_name = os.path.join(self._directory.name, "program.pas")
+        with open(file_name, "w") as file:
+            file.write(self._PROGRAM)
+        with self.assertRaises(FileExistsError):
+            CompileServer(file_name)
+        with open(file_name) as file:
+            self.assertEqual(self._PROGRAM, file.read())
@@ -0,0 +1,169 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+from unittest import TestCase
+from components import constant_folding
+from components.symbols.base_symbols import ExpressionNode
+from components.symbols.expression_symbols import ConstantExpression
+from components.symbols.identifier_symbols import ConstantIdentifier, Identifier
+from components.symbols.literals_symbols import NumericLiteral, StringLiteral, BooleanLiteral
+from components.symbols.operator_symbols import BinaryOperator, UnaryOperator, NeutralOperator
+from components.symbols.type_symbols import RESERVED_TYPES
+
+
+# the operators of c the emitter writes, as c evaluates them
+_C_OPERATIONS_ = {"&&": lambda left, right: int(left != 0 and right != 0),
+                  "||": lambda left, right: int(left != 0 or right != 0)}
+
+
+def _number(value, a_type_name="INTEGER"):
+    return NumericLiteral.from_value(str(value), a_type_name)
+
+
+def _string(value):
+    return StringLiteral.from_value("'{0}'".format(value), "STRING_VALUE")
+
+
+def _constant(name, expression_list):
+    return ConstantIdentifier(name, ConstantExpression.from_list(expression_list).folded())
+
+
+def _fold(expression_list):
+    return constant_folding.fold(ExpressionNode.from_infix(expression_list))
+
+
+class TestFold(TestCase):
+
+    def test_integer_arithmetic(self):
+        # 2 + 3 * 4 - 20 DIV 3
+        literal = _fold([_number(2), BinaryOperator.operator_plus(), _number(3), BinaryOperator.operator_multiply(),
+                         _number(4), BinaryOperator.operator_minus(), _number(20), BinaryOperator.operator_div(),
+                         _number(3)])
+        self.assertIsInstance(literal, NumericLiteral)
+        self.assertIs(RESERVED_TYPES[0], literal.type)
+        self.assertEqual("8", literal.value)
+
+    def test_div_and_mod_truncate_towards_zero(self):
+        self.assertEqual("-2", _fold([_number(-7), BinaryOperator.operator_div(), _number(3)]).value)
+        self.assertEqual("-1", _fold([_number(-7), BinaryOperator.operator_mod(), _number(3)]).value)
+        self.assertEqual("1", _fold([_number(7), BinaryOperator.operator_mod(), _number(-3)]).value)
+
+    def test_16_bit_wrap_around(self):
+        self.assertEqual("-32768", _fold([_number(32767), BinaryOperator.operator_plus(), _number(1)]).value)
+        self.assertEqual("0", _fold([_number("&HFFFF", "NUMBER_HEXADECIMAL"), BinaryOperator.operator_plus(),
+                                     _number(1)]).value)
+        self.assertEqual("-32768", _fold([UnaryOperator.operator_abs(), _number(-32768)]).value)
+
+    def test_16_bit_overflows_are_reported(self):
+        overflows = []
+        # 30000 + 30000 - 30000
+        literal = constant_folding.fold(ExpressionNode.from_infix([_number(30000), BinaryOperator.operator_plus(),
+                                                                   _number(30000), BinaryOperator.operator_minus(),
+                                                                   _number(30000)]), overflows)
+        self.assertEqual("30000", literal.value)
+        self.assertEqual([(60000, -5536), (-35536, 30000)], overflows)
+        overflows = []
+        self.assertEqual("0", constant_folding.fold(ExpressionNode.from_infix(
+            [_number(2), BinaryOperator.operator_starstar(), _number(16)]), overflows).value)
+        self.assertEqual([(65536, 0)], overflows)
+        overflows = []
+        self.assertEqual("32767", constant_folding.fold(ExpressionNode.from_infix(
+            [_number(32766), BinaryOperator.operator_plus(), _number(1)]), overflows).value)
+        self.assertEqual([], overflows)
+
+    def test_literal_forms(self):
+        literal = _fold([_number("&B1010", "NUMBER_BINARY"), BinaryOperator.operator_plus(),
+                         _number("&O10", "NUMBER_OCTAL"), BinaryOperator.operator_plus(),
+                         _number("&H10", "NUMBER_HEXADECIMAL")])
+        self.assertEqual("34", literal.value)
+
+    def test_relational_and_boolean_operators(self):
+        # NOT (1 < 2) OR (3 = 3)
+        literal = _fold([UnaryOperator.operator_not(), NeutralOperator.operator_left_parentheses(), _number(1),
+                         BinaryOperator.operator_less_than(), _number(2), NeutralOperator.operator_right_parentheses(),
+                         BinaryOperator.operator_or(), NeutralOperator.operator_left_parentheses(), _number(3),
+                         BinaryOperator.operator_equal_to(), _number(3), NeutralOperator.operator_right_parentheses()])
+        self.assertIsInstance(literal, BooleanLiteral)
+        self.assertTrue(literal.value)
+
+    def test_integer_and_or_are_logical(self):
+        self.assertEqual("1", _fold([_number(6), BinaryOperator.operator_and(), _number(3)]).value)
+        self.assertEqual("0", _fold([_number(6), BinaryOperator.operator_and(), _number(0)]).value)
+        self.assertEqual("1", _fold([_number(0), BinaryOperator.operator_or(), _number(-4)]).value)
+
+    def test_folded_value_matches_emitted_operator(self):
+        # the value folded at compilation is the value the c written by the emitter, unfolded, computes at run time
+        for binary_operator in [BinaryOperator.operator_and(), BinaryOperator.operator_or()]:
+            for left, right in [(6, 3), (12, 6), (0, 5), (-1, 0), (0, 0)]:
+                folded = _fold([_number(left), binary_operator, _number(right)]).value
+                self.assertEqual(str(_C_OPERATIONS_[binary_operator.to_c](left, right)), folded,
+                                 "{0} {1} {2}".format(left, binary_operator.to_c, right))
+
+    def test_string_concatenation(self):
+        literal = _fold([_string("AB"), BinaryOperator.operator_plus(), _string("CD")])
+        self.assertIsInstance(literal, StringLiteral)
+        self.assertIs(RESERVED_TYPES[4], literal.type)
+        self.assertEqual("ABCD", literal.value)
+
+    def test_string_limit(self):
+        with self.assertRaises(ValueError):
+            _fold([_string("A" * 80), BinaryOperator.operator_plus(), _string("B")])
+
+    def test_division_by_zero(self):
+        with self.assertRaises(ValueError):
+            _fold([_number(1), BinaryOperator.operator_div(), _number(0)])
+
+    def test_chained_constants(self):
+        c1 = _constant("c1", [_number(2), BinaryOperator.operator_plus(), _number(2)])
+        c2 = _constant("c2", [_number(-1), BinaryOperator.operator_minus(), c1])
+        self.assertEqual("-5", c2.value.operand.value)
+        self.assertEqual("-10", _fold([c2, BinaryOperator.operator_multiply(), _number(2)]).value)
+
+    def test_not_evaluated(self):
+        variable = Identifier("v", RESERVED_TYPES[0], None)
+        self.assertIsNone(_fold([variable, BinaryOperator.operator_plus(), _number(1)]))
+        self.assertIsNone(_fold([_number("1.5", "REAL"), BinaryOperator.operator_plus(), _number("1.5", "REAL")]))
+
+
+class TestFoldOperations(TestCase):
+
+    def test_constant_operations_are_replaced(self):
+        # (10 + 2) * v + 3 * 4
+        variable = Identifier("v", RESERVED_TYPES[0], None)
+        expression_list = [NeutralOperator.operator_left_parentheses(), _number(10), BinaryOperator.operator_plus(),
+                           _number(2), NeutralOperator.operator_right_parentheses(),
+                           BinaryOperator.operator_multiply(), variable, BinaryOperator.operator_plus(), _number(3),
+                           BinaryOperator.operator_multiply(), _number(4)]
+        tree = ExpressionNode.from_infix(expression_list)
+        tokens = constant_folding.fold_operations(tree).tokens()
+        self.assertEqual(["12", "*", "v", "+", "12"], [i.name if i is variable else i.value for i in tokens])
+        # the tree of the expression is not changed
+        self.assertEqual(expression_list, tree.tokens())
+
+    def test_expression_without_constant_operations(self):
+        tree = ExpressionNode.from_infix([Identifier("v", RESERVED_TYPES[0], None), BinaryOperator.operator_plus(),
+                                          _number(1)])
+        self.assertIs(tree, constant_folding.fold_operations(tree))
+
+
+class TestConstantExpressionFolded(TestCase):
+
+    def test_folded(self):
+        expression = ConstantExpression.from_list([_number(2), BinaryOperator.operator_multiply(), _number(3)])
+        folded = expression.folded()
+        self.assertIsInstance(folded, ConstantExpression)
+        self.assertEqual("6", folded.operand.value)
+
+    def test_folded_reports_overflows(self):
+        overflows = []
+        expression = ConstantExpression.from_list([_number(300), BinaryOperator.operator_multiply(), _number(300)])
+        self.assertEqual("24464", expression.folded(overflows).operand.value)
+        self.assertEqual([(90000, 24464)], overflows)
+
+    def test_single_operand_is_not_folded(self):
+        expression = ConstantExpression.from_list([_number(2)])
+        self.assertIs(expression, expression.folded())
@@ -7,9 +7,13 @@ HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
 
 from logging import getLogger, DEBUG
 
-from unittest import TestCase
+from unittest import TestCase, mock
 from components.deft_pascal_compiler import DeftPascalCompiler
+from components.deft_pascal_parser_3 import DeftPascalParser
+from components.ast_cache import AstCache
 from parameterized import parameterized
+import re
+import tempfile
 from tests.declarations_test_suit import TestSuit
 from tests.negative_test_cases import NegativeLanguageTests
 
@@ -174,3 +178,98 @@ class TestCompiler(TestCase):
             compiler.ast()
         self.assertIsInstance(cm.exception, ValueError)
 
+
+    def test_cached_program_is_not_parsed_again(self):
+        source_code = "PROGRAM cached; VAR v1 : INTEGER; BEGIN v1 := 1 END."
+        with tempfile.TemporaryDirectory() as directory:
+            log = DeftPascalCompiler(ast_cache=AstCache(directory)).check_syntax(source_code)
+            self.assertIn("ast cache: 0 hits, 1 misses", log["INFO"])
+            compiler = DeftPascalCompiler(ast_cache=AstCache(directory))
+            with mock.patch.object(DeftPascalParser, "parse_tree") as parse_tree:
+                log = compiler.check_syntax(source_code)
+            parse_tree.assert_not_called()
+            self.assertEqual([], log["ERROR"])
+            self.assertIn("ast cache: 1 hits, 0 misses", log["INFO"])
+            self.assertEqual([], compiler.compile()["ERROR"])
+
+    def test_ast_can_be_compiled_more_than_once(self):
+        source_code = "PROGRAM twice;\n" \
+                      "VAR v1, v2 : INTEGER; s1 : STRING(20); p1 : ^INTEGER;\n" \
+                      "BEGIN\n" \
+                      "  v1 := 10;\n" \
+                      "  FOR v2 := 1 TO 10 DO v1 := v1 + v2;\n" \
+                      "  WHILE v1 > 0 DO v1 := v1 - 1;\n" \
+                      "  REPEAT v1 := v1 + 1 UNTIL v1 = 20;\n" \
+                      "  IF v1 = 0 THEN v1 := 1 ELSE v1 := 2;\n" \
+                      "  writeln('done')\n" \
+                      "END."
+        compiler = DeftPascalCompiler()
+        self.assertEqual([], compiler.check_syntax(source_code)["ERROR"])
+        ast = compiler.ast
+        pretty = ast.pretty()
+        self.assertEqual([], compiler.compile()["ERROR"])
+        first_code = re.sub(" at 0x[0-9a-f]+", "", compiler.intermediate_code)
+        self.assertEqual(pretty, ast.pretty())
+        self.assertEqual([], compiler.compile()["ERROR"])
+        self.assertEqual(first_code, re.sub(" at 0x[0-9a-f]+", "", compiler.intermediate_code))
+        self.assertEqual([], DeftPascalCompiler(cmoc=True).compile(ast)["ERROR"])
+        self.assertEqual(pretty, ast.pretty())
+
+    def test_identifiers_are_not_case_sensitive(self):
+        source_code = "PROGRAM cases;\n" \
+                      "VAR Counter : INTEGER;\n" \
+                      "BEGIN\n" \
+                      "  COUNTER := 1;\n" \
+                      "  counter := Counter + 1;\n" \
+                      "  WriteLn('done')\n" \
+                      "END."
+        compiler = DeftPascalCompiler()
+        self.assertEqual([], compiler.check_syntax(source_code)["ERROR"])
+        self.assertEqual([], compiler.compile()["ERROR"])
+        compiler.check_syntax("PROGRAM twice; VAR counter, COUNTER : INTEGER; BEGIN counter := 1 END.")
+        self.assertEqual(1, len(compiler.compile()["ERROR"]))
+
+    def test_identifiers_keep_their_declared_spelling(self):
+        # an external procedure is called by its c name, which is case sensitive
+        source_code = "PROGRAM external;\n" \
+                      "PROCEDURE DrawLine(x : INTEGER); EXTERNAL;\n" \
+                      "BEGIN\n" \
+                      "  drawline(1);\n" \
+                      "  DRAWLINE(2)\n" \
+                      "END."
+        compiler = DeftPascalCompiler()
+        self.assertEqual([], compiler.check_syntax(source_code)["ERROR"])
+        self.assertEqual([], compiler.compile()["ERROR"])
+        self.assertEqual(3, compiler.intermediate_code.count("ProcedureExternalIdentifier('DrawLine'"))
+
+    def test_constant_overflow_is_reported(self):
+        source_code = "PROGRAM overflow;\n" \
+                      "CONST c1 = 30000 + 30000;\n" \
+                      "      c2 = 30000 + 2767;\n" \
+                      "VAR v1 : INTEGER;\n" \
+                      "BEGIN\n" \
+                      "  v1 := c1\n" \
+                      "END."
+        compiler = DeftPascalCompiler()
+        self.assertEqual([], compiler.check_syntax(source_code)["ERROR"])
+        result = compiler.compile()
+        self.assertEqual([], result["ERROR"])
+        warnings = [i for i in result["WARNING"] if "overflows" in i]
+        self.assertEqual(1, len(warnings))
+        self.assertIn("'c1' overflows 16 bits: 60000 wraps around to -5536", warnings[0])
+        self.assertEqual(2, warnings[0].line)
+
+    def test_variables_named_as_the_system_constants(self):
+        # TRUE, FALSE and NIL are found by the type of their token, which a folded identifier must not reach
+        source_code = "PROGRAM t;\n" \
+                      "VAR constant_true, constant_false, constant_nil : INTEGER;\n" \
+                      "    b : BOOLEAN;\n" \
+                      "BEGIN\n" \
+                      "  constant_true := 1;\n" \
+                      "  constant_false := constant_true + 1;\n" \
+                      "  constant_nil := constant_false;\n" \
+                      "  b := TRUE\n" \
+                      "END."
+        compiler = DeftPascalCompiler()
+        self.assertEqual([], compiler.check_syntax(source_code)["ERROR"])
+        self.assertEqual([], compiler.compile()["ERROR"])
@@ -7,6 +7,14 @@ HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
 
 from unittest import TestCase
 from components.deft_pascal_parser_3 import DeftPascalParser
+from components import deft_pascal_parser_3
+from components.keyword_lexer import KeywordLexer
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+import os
+import sys
+import tempfile
+import types
 from parameterized import parameterized
 from tests.declarations_test_suit import TestSuit
 from tests.negative_test_cases import NegativeLanguageTests
@@ -72,3 +80,176 @@ class TestDeftPascalParser(TestCase):
         with self.assertRaises(ValueError) as cm:
             deft_pascal_parser.ast()
         self.assertIsInstance(cm.exception, ValueError)
+
+
+class TestDeftPascalParserTables(TestCase):
+
+    def test_save_and_load_parse_tables(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = DeftPascalParser.save_tables(directory)
+            self.assertTrue(os.path.isfile(file_name))
+            parser = DeftPascalParser._load_tables(directory)
+            self.assertIsNotNone(parser)
+            parser.parse("PROGRAM tables; BEGIN END.", start=DeftPascalParser._START_RULE)
+
+    def test_corrupt_parse_tables_are_ignored(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, DeftPascalParser._tables_file_name()), "wb") as file:
+                file.write(b"not a pickle")
+            self.assertIsNone(DeftPascalParser._load_tables(directory))
+
+    def test_read_only_location_does_not_prevent_parsing(self):
+        with tempfile.NamedTemporaryFile() as file:
+            # a file cannot be used as a directory, so saving must fail gracefully
+            self.assertIsNone(DeftPascalParser.save_tables(os.path.join(file.name, "tables")))
+
+
+class TestDeftPascalParserSharing(TestCase):
+
+    def test_parsers_share_the_same_lark_instance(self):
+        self.assertIs(DeftPascalParser()._parser.__self__, DeftPascalParser()._parser.__self__)
+
+    def test_parse_tree_does_not_change_the_parser(self):
+        parser = DeftPascalParser()
+        ast, error_log = parser.parse_tree("PROGRAM shared; BEGIN END.")
+        self.assertEqual([], error_log)
+        self.assertIsNotNone(ast)
+        with self.assertRaises(ValueError):
+            parser.ast()
+
+    def test_parse_tree_from_multiple_threads(self):
+        parser = DeftPascalParser()
+        sources = ["PROGRAM p{0}; VAR v{0} : INTEGER; BEGIN v{0} := {0} END.".format(i) for i in range(40)]
+        sources.append("PROGRAM broken; BEGIN v1 := END.")
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(parser.parse_tree, sources))
+        for i, (ast, error_log) in enumerate(results[:-1]):
+            self.assertEqual([], error_log)
+            self.assertEqual("p{0}".format(i), ast.children[0].children[1].value)
+        self.assertIsNone(results[-1][0])
+        self.assertNotEqual([], results[-1][1])
+
+
+class TestDeftPascalParserStandalone(TestCase):
+
+    def test_missing_standalone_parser_is_ignored(self):
+        with mock.patch.object(deft_pascal_parser_3, "_STANDALONE_MODULE_", "components.not_generated_yet"):
+            self.assertIsNone(deft_pascal_parser_3._load_standalone_parser())
+
+    def test_out_of_date_standalone_parser_is_ignored(self):
+        module = types.ModuleType("out_of_date_standalone")
+        module.GRAMMAR_HASH = "generated from another grammar"
+        with mock.patch.dict(sys.modules, {"out_of_date_standalone": module}), \
+                mock.patch.object(deft_pascal_parser_3, "_STANDALONE_MODULE_", "out_of_date_standalone"):
+            self.assertIsNone(deft_pascal_parser_3._load_standalone_parser())
+
+    def test_up_to_date_standalone_parser_is_used(self):
+        module = types.ModuleType("up_to_date_standalone")
+        module.GRAMMAR_HASH = DeftPascalParser.grammar_hash()
+        with mock.patch.dict(sys.modules, {"up_to_date_standalone": module}), \
+                mock.patch.object(deft_pascal_parser_3, "_STANDALONE_MODULE_", "up_to_date_standalone"):
+            self.assertIs(module, deft_pascal_parser_3._load_standalone_parser())
+
+
+class TestDeftPascalParserIncremental(TestCase):
+
+    _PROGRAM = "PROGRAM inc; VAR v1 : INTEGER;\n" \
+               "PROCEDURE p1; BEGIN v1 := 1 END;\n" \
+               "FUNCTION f1(a : INTEGER) : INTEGER; BEGIN f1 := a END;\n" \
+               "BEGIN\n  p1; v1 := f1(2)\nEND.\n"
+
+    @staticmethod
+    def _positions(parser, ast):
+        return [(i.start_pos, i.end_pos, i.line, i.column, i.end_line, i.end_column) for i in parser._positioned(ast)]
+
+    def test_edit_inside_procedure_is_spliced_into_a_new_tree(self):
+        parser = DeftPascalParser()
+        ast, error_log = parser.parse_tree(self._PROGRAM)
+        edited = self._PROGRAM.replace("v1 := 1 END", "v1 := 1;\n  v1 := v1 + 10 END")
+        new_ast, error_log = parser.parse_incremental(self._PROGRAM, ast, edited)
+        self.assertEqual([], error_log)
+        self.assertIsNot(ast, new_ast)
+        full_ast, error_log = parser.parse_tree(edited)
+        self.assertEqual(full_ast, new_ast)
+        self.assertEqual(self._positions(parser, full_ast), self._positions(parser, new_ast))
+        # the subtrees before the declaration are shared
+        self.assertIs(ast.children[0], new_ast.children[0])
+
+    def test_previous_tree_is_not_changed(self):
+        parser = DeftPascalParser()
+        ast, error_log = parser.parse_tree(self._PROGRAM)
+        edited = self._PROGRAM.replace("v1 := 1 END", "v1 := 1;\n  v1 := v1 + 10 END")
+        parser.parse_incremental(self._PROGRAM, ast, edited)
+        previous_ast, error_log = parser.parse_tree(self._PROGRAM)
+        self.assertEqual(previous_ast, ast)
+        self.assertEqual(self._positions(parser, previous_ast), self._positions(parser, ast))
+
+    def test_edit_outside_any_procedure_falls_back_to_a_full_parse(self):
+        parser = DeftPascalParser()
+        ast, error_log = parser.parse_tree(self._PROGRAM)
+        edited = self._PROGRAM.replace("p1; v1", "p1; p1; v1")
+        new_ast, error_log = parser.parse_incremental(self._PROGRAM, ast, edited)
+        self.assertEqual([], error_log)
+        self.assertIsNot(ast, new_ast)
+        self.assertEqual(parser.parse_tree(edited)[0], new_ast)
+
+    def test_syntax_error_inside_procedure_is_reported(self):
+        parser = DeftPascalParser()
+        ast, error_log = parser.parse_tree(self._PROGRAM)
+        edited = self._PROGRAM.replace("v1 := 1 END", "v1 := END")
+        new_ast, error_log = parser.parse_incremental(self._PROGRAM, ast, edited)
+        self.assertIsNone(new_ast)
+        self.assertNotEqual([], error_log)
+
+    def test_syntax_error_inside_procedure_with_another_lexer_is_reported(self):
+        # with a standalone parser shared, the module exceptions are not the ones lark raises for another lexer
+        standalone_errors = {"UnexpectedCharacters": type("UnexpectedCharacters", (Exception,), {}),
+                             "UnexpectedToken": type("UnexpectedToken", (Exception,), {})}
+        with mock.patch.multiple(deft_pascal_parser_3, **standalone_errors):
+            parser = DeftPascalParser(lexer=KeywordLexer)
+            ast, error_log = parser.parse_tree(self._PROGRAM)
+            edited = self._PROGRAM.replace("v1 := 1 END", "v1 := := 1 END")
+            new_ast, error_log = parser.parse_incremental(self._PROGRAM, ast, edited)
+        self.assertIsNone(new_ast)
+        self.assertNotEqual([], error_log)
+
+
+class TestDeftPascalParserRecovery(TestCase):
+
+    _PROGRAM = "PROGRAM recovery;\n" \
+               "VAR v1 : INTEGER;\n" \
+               "    v2 : INTEGER\n" \
+               "    v3 : INTEGER;\n" \
+               "PROCEDURE p1; BEGIN v1 := := 1 END;\n" \
+               "BEGIN\n" \
+               "  v1 := 1 @ 2;\n" \
+               "  v2 := (v1 + 2;\n" \
+               "  v3 := 3\n" \
+               "END.\n"
+
+    def test_default_reports_the_first_error_only(self):
+        ast, error_log = DeftPascalParser().parse_tree(self._PROGRAM)
+        self.assertIsNone(ast)
+        self.assertEqual(1, len(error_log))
+        self.assertTrue(error_log[0].startswith("syntax error at line 4 column 5"))
+
+    def test_recovery_reports_every_error(self):
+        ast, error_log = DeftPascalParser(max_errors=10).parse_tree(self._PROGRAM)
+        self.assertIsNone(ast)
+        self.assertEqual(["syntax error at line 4 column 5",
+                          "syntax error at line 5 column 27",
+                          "syntax error at line 7 column 11. unexpected character found",
+                          "syntax error at line 8 column 16"],
+                         [error.split(":")[0].split(". expected")[0] for error in error_log])
+
+    def test_recovery_stops_at_the_error_cap(self):
+        ast, error_log = DeftPascalParser(max_errors=2).parse_tree(self._PROGRAM)
+        self.assertEqual(2, len(error_log))
+
+    def test_recovery_does_not_change_a_valid_program(self):
+        program = "PROGRAM valid; VAR v1 : INTEGER; BEGIN v1 := 1 END."
+        self.assertEqual(DeftPascalParser().parse_tree(program), DeftPascalParser(max_errors=10).parse_tree(program))
+
+    def test_error_cap_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            DeftPascalParser(max_errors=0)
@@ -0,0 +1,116 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+from unittest import TestCase
+
+from components.deft_pascal_compiler import DeftPascalCompiler
+from components.diagnostics import Diagnostic, CompilationResult, Diagnostics
+from components.preprocessor import Preprocessor
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import os
+import pickle
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+class TestDiagnostics(TestCase):
+
+    _PROGRAM = "PROGRAM diagnostics;\n" \
+               "VAR v1 : INTEGER;\n" \
+               "BEGIN\n" \
+               "  v1 := 1;\n" \
+               "  v2 := 2\n" \
+               "END."
+
+    @staticmethod
+    def _compile(source_code):
+        compiler = DeftPascalCompiler()
+        result = compiler.check_syntax(source_code)
+        if result["ERROR"]:
+            return result
+        return compiler.compile()
+
+    def test_result_is_read_only(self):
+        result = self._compile(self._PROGRAM)
+        self.assertIsInstance(result, CompilationResult)
+        self.assertEqual(["ERROR", "WARNING", "INFO", "DEBUG"], list(result))
+        result["ERROR"].clear()
+        self.assertEqual(1, len(result["ERROR"]))
+        self.assertFalse(result.succeeded)
+        with self.assertRaises(AttributeError):
+            result.errors = ()
+        with self.assertRaises(AttributeError):
+            result.errors[0].line = 1
+        self.assertEqual(result, pickle.loads(pickle.dumps(result)))
+
+    def test_compiler_diagnostics_have_code_and_span(self):
+        error = self._compile(self._PROGRAM).errors[0]
+        self.assertIn("undeclared variable 'v2'", error)
+        self.assertEqual("ERROR", error.severity)
+        self.assertEqual("variable_access", error.code)
+        self.assertEqual((None, 5, 3, 5, 5), error.span)
+
+    def test_syntax_errors_have_code_and_span(self):
+        error = self._compile("PROGRAM syntax;\nBEGIN\n  v1 := ;\nEND.").errors[0]
+        self.assertIsInstance(error, Diagnostic)
+        self.assertEqual("syntax", error.code)
+        self.assertEqual((None, 3, 9, 3, 10), error.span)
+
+    def test_spans_are_in_the_original_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "body.inc"), "w") as file:
+                file.write("  v1 := 1;\n  v2 := 2\n")
+            compiler = DeftPascalCompiler(preprocessor=Preprocessor())
+            self.assertTrue(compiler.check_syntax("PROGRAM spans;\nVAR v1 : INTEGER;\nBEGIN\n{$I body.inc}\nEND.",
+                                                  os.path.join(directory, "main.pas")).succeeded)
+            error = compiler.compile().errors[0]
+        self.assertEqual((os.path.join(directory, "body.inc"), 2, 3, 2, 5), error.span)
+
+    def test_concurrent_compilations_are_independent(self):
+        programs = [self._PROGRAM.replace("v2", "v{0}".format(i)) for i in range(2, 10)] * 4
+        expected = [self._compile(program) for program in programs]
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(self._compile, programs))
+        self.assertEqual(expected, results)
+        for program, result in zip(programs, results):
+            self.assertEqual(1, len(result["ERROR"]))
+            self.assertIn(program.split()[-4], result["ERROR"][0])
+
+    def test_messages_are_formatted_only_when_used(self):
+        formatted = []
+
+        class Symbol:
+            def __format__(self, format_spec):
+                formatted.append(format_spec)
+                return "symbol"
+
+        logger = logging.getLogger("deft_pascal_reborn")
+        level = logger.level
+        logger.setLevel(logging.WARNING)
+        try:
+            diagnostics = Diagnostics(severity="ERROR")
+            diagnostics.debug("[{0}] {1}", "ACTION", Symbol())
+            diagnostics.info("[{0}] {1}", "ACTION", Symbol())
+            self.assertEqual([], formatted)
+            self.assertEqual((), diagnostics.result().diagnostics)
+            diagnostics = Diagnostics(severity="DEBUG")
+            diagnostics.debug("[{0}] {1}", "ACTION", Symbol())
+            self.assertEqual(1, len(formatted))
+            self.assertEqual(["[ACTION] symbol"], diagnostics.result()["DEBUG"])
+        finally:
+            logger.setLevel(level)
+
+    def test_severity_of_the_compiler(self):
+        compiler = DeftPascalCompiler(severity="ERROR")
+        compiler.check_syntax(self._PROGRAM)
+        result = compiler.compile()
+        self.assertEqual(1, len(result.diagnostics))
+        self.assertEqual(1, len(result["ERROR"]))
+        self.assertLess(1, len(self._compile(self._PROGRAM)["DEBUG"]))
@@ -0,0 +1,86 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+from unittest import TestCase
+
+from components.deft_pascal_parser_3 import DeftPascalParser, UnexpectedCharacters
+from components.keyword_lexer import KeywordLexer
+from tests.positive_test_cases import PositiveLanguageTests
+from utils.program_generator import ProgramGenerator
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TestKeywordLexer(TestCase):
+
+    _PROGRAM = "program lexer;\n" \
+               "CONST C1 = &HFF; { a comment }\n" \
+               "Var v1 : integer;\n" \
+               "BEGIN\n" \
+               "  v1 := -C1 + 2 (* another one *);\n" \
+               "  v1 := +v1 - -2\n" \
+               "end.\n"
+
+    @staticmethod
+    def _attributes(tokens):
+        return [(t.type, t.value, t.line, t.column, t.end_line, t.end_column, t.start_pos, t.end_pos) for t in tokens]
+
+    @staticmethod
+    def _lexer():
+        return KeywordLexer(DeftPascalParser._shared_parser().lexer_conf)
+
+    def _assert_same_tree(self, program):
+        expected, expected_errors = DeftPascalParser().parse_tree(program)
+        ast, error_list = DeftPascalParser(lexer=KeywordLexer).parse_tree(program)
+        self.assertEqual(expected_errors, error_list)
+        self.assertEqual(expected, ast)
+        self.assertEqual(self._attributes(expected.scan_values(lambda v: True)),
+                         self._attributes(ast.scan_values(lambda v: True)))
+
+    def test_tokens_match_the_lark_lexer(self):
+        lexer = self._lexer()
+        lark_tokens = DeftPascalParser._shared_parser().lex(self._PROGRAM)
+        self.assertEqual(self._attributes(lark_tokens), self._attributes(lexer.lex(lexer.make_lexer_state(self._PROGRAM))))
+
+    def test_same_tree_as_the_contextual_lexer(self):
+        self._assert_same_tree(self._PROGRAM)
+        for name, function_callable in PositiveLanguageTests.available_tests():
+            with self.subTest(name):
+                self._assert_same_tree(function_callable().replace("{{{0}}}", name))
+
+    def test_same_tree_on_generated_programs(self):
+        for depth in [1, 3]:
+            for seed in range(3):
+                self._assert_same_tree(ProgramGenerator(depth, 3, seed=seed).generate(60))
+
+    def test_given_to_lark_as_its_lexer(self):
+        parser = DeftPascalParser._lexer_parser(KeywordLexer)
+        self.assertIs(KeywordLexer, parser.options.lexer)
+
+    def test_keywords_are_case_insensitive(self):
+        lexer = self._lexer()
+        types = [t.type for t in lexer.lex(lexer.make_lexer_state("begin Begin BEGIN beginning"))]
+        self.assertEqual(3, types.count(types[0]))
+        self.assertEqual("IDENTIFIER", types[3])
+
+    def test_signs_are_told_apart_by_the_parser_state(self):
+        ast, error_list = DeftPascalParser(lexer=KeywordLexer).parse_tree(self._PROGRAM)
+        types = [t.type for t in ast.scan_values(lambda v: True)]
+        self.assertIn("OPERATOR_ARITHMETIC_NEGATION", types)
+        self.assertIn("OPERATOR_ARITHMETIC_NEUTRAL", types)
+        self.assertIn("OPERATOR_PLUS", types)
+        self.assertIn("OPERATOR_MINUS", types)
+
+    def test_unexpected_character(self):
+        lexer = self._lexer()
+        with self.assertRaises(UnexpectedCharacters) as context:
+            list(lexer.lex(lexer.make_lexer_state("BEGIN\n  a := `b\nEND.")))
+        self.assertEqual((2, 8), (context.exception.line, context.exception.column))
+        ast, error_list = DeftPascalParser(lexer=KeywordLexer).parse_tree("PROGRAM x;\nBEGIN\n  a := `b\nEND.")
+        self.assertEqual(1, len(error_list))
@@ -119,6 +119,12 @@ class TestNumericLiteral(TestCase):
     def test_from_value_raises_exception_value_error(self):
         self.assertRaises(ValueError, NumericLiteral.from_value, "INVALID")
 
+    def test_integer_value(self):
+        self.assertEqual(-12, NumericLiteral.from_value("-12", "SIGNED_DECIMAL").integer_value)
+        self.assertEqual(5, NumericLiteral.from_value("&B101", "NUMBER_BINARY").integer_value)
+        self.assertEqual(255, NumericLiteral.from_value("&hFF", "NUMBER_HEXADECIMAL").integer_value)
+        self.assertEqual(8, NumericLiteral.from_value("&O10", "NUMBER_OCTAL").integer_value)
+
 
 class TestStringLiteral(TestCase):
 
@@ -10,7 +10,7 @@ from unittest.case import TestCase
 
 from components.symbols.literals_symbols import *
 from components.symbols.type_symbols import *
-from components.symbols.operator_symbols import UnaryOperator, BinaryOperator
+from components.symbols.operator_symbols import UnaryOperator, BinaryOperator, CompatibilityTensor, COMPATIBILITY, INCOMPATIBLE, DEREFERENCE
 
 
 class TestBinaryOperator(TestCase):
@@ -205,6 +205,14 @@ class TestBinaryOperator(TestCase):
         operator = BinaryOperator.operator_less_or_equal_to()
         self._perform_compatibility_test_with_types(operator)
 
+    def test_binary_operator_evaluate_to_type_is_shared(self):
+        operator = BinaryOperator.operator_plus()
+        result = operator.evaluate_to_type(BasicType.reserved_type_integer(), BasicType.reserved_type_integer())
+        self.assertIs(RESERVED_TYPES[0], result)
+        self.assertIs(result, operator.evaluate_to_type(RESERVED_TYPES[0], RESERVED_TYPES[0]))
+        operator = BinaryOperator.operator_equal_to()
+        self.assertIs(RESERVED_TYPES[5], operator.evaluate_to_type(RESERVED_TYPES[3], RESERVED_TYPES[3]))
+
 
 class TestUnaryOperator(TestCase):
 
@@ -272,3 +280,49 @@ class TestUnaryOperator(TestCase):
         operator = UnaryOperator.operator_arithmetic_neutral()
         self._perform_compatibility_test_with_types(operator)
 
+
+class TestCompatibilityTensor(TestCase):
+
+    @staticmethod
+    def _binary_operators():
+        return [getattr(BinaryOperator, i)() for i in sorted(vars(BinaryOperator)) if i.startswith("operator_")]
+
+    @staticmethod
+    def _scan(operator, left, right):
+        result = [t[2] for t in operator._compatible if t[0] == left and t[1] == right]
+        return result[0] if result else INCOMPATIBLE
+
+    def test_lookup(self):
+        for operator in self._binary_operators():
+            for left in range(len(RESERVED_TYPES)):
+                for right in range(len(RESERVED_TYPES)):
+                    expected = self._scan(operator, left, right)
+                    if (left, right, expected) == (6, 6, 6):
+                        expected = DEREFERENCE
+                    self.assertEqual(expected, COMPATIBILITY.lookup(operator.compatibility_row, left, right))
+
+    def test_rows(self):
+        tensor = CompatibilityTensor()
+        self.assertEqual(0, tensor.row([(0, 0, 0), (1, 1, 1)]))
+        self.assertEqual(1, tensor.row([(0, 0, 5)]))
+        self.assertEqual(0, tensor.row([(0, 0, 0), (1, 1, 1)]))
+        self.assertEqual(2, len(tensor))
+        self.assertEqual(5, tensor.lookup(1, 0, 0))
+        self.assertEqual(INCOMPATIBLE, tensor.lookup(1, 1, 1))
+        with self.assertRaises(KeyError):
+            tensor.row([(0, 0, 0), (0, 0, 1)])
+
+    def test_pointers(self):
+        operator = BinaryOperator.operator_assignment()
+        integer = BasicType.reserved_type_integer()
+        self.assertIs(RESERVED_TYPES[0], operator.evaluate_to_type(PointerType.for_type(integer),
+                                                                   PointerType.for_type(integer)))
+        self.assertIsNone(operator.evaluate_to_type(PointerType.for_type(integer),
+                                                    PointerType.for_type(BasicType.reserved_type_char())))
+        pointer = PointerType.for_type(PointerType.for_type(integer))
+        self.assertIs(RESERVED_TYPES[6], operator.evaluate_to_type(pointer, pointer))
+
+    def test_custom_types(self):
+        operator = BinaryOperator.operator_equal_to()
+        self.assertFalse(operator.is_compatible(CustomType("custom"), BasicType.reserved_type_integer()))
+        self.assertIsNone(operator.evaluate_to_type(CustomType("custom"), CustomType("custom")))
@@ -0,0 +1,42 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+from unittest import TestCase
+from components.parameters import ActualParameter, FormalParameter
+from components.symbols.expression_symbols import IntegerExpression
+from components.symbols.literals_symbols import NumericLiteral
+from components.symbols.type_symbols import RESERVED_TYPES
+
+
+def _integer(value):
+    return IntegerExpression.from_list([NumericLiteral.from_value(str(value), "INTEGER")])
+
+
+class TestFormalParameter(TestCase):
+
+    def test_name_and_type(self):
+        parameter = FormalParameter("p1", RESERVED_TYPES[0])
+        self.assertEqual("p1", parameter.name)
+        self.assertIs(RESERVED_TYPES[0], parameter.type)
+
+
+class TestActualParameter(TestCase):
+
+    def test_value_alone(self):
+        value = _integer(1)
+        parameter = ActualParameter(value)
+        self.assertIs(value, parameter.value)
+        self.assertIs(value.native_type, parameter.type)
+        self.assertEqual(1, parameter.cardinality)
+
+    def test_field_width_and_decimal_places(self):
+        field_width, decimal_places = _integer(8), _integer(2)
+        self.assertEqual(2, ActualParameter(_integer(1), field_width).cardinality)
+        parameter = ActualParameter(_integer(1), field_width, decimal_places)
+        self.assertEqual(3, parameter.cardinality)
+        self.assertIs(field_width, parameter.field_width)
+        self.assertIs(decimal_places, parameter.decimal_places)
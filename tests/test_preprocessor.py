@@ -0,0 +1,119 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+from unittest import TestCase
+
+from components.preprocessor import Preprocessor
+from components.deft_pascal_parser_3 import DeftPascalParser
+
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+class TestPreprocessor(TestCase):
+
+    def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self._folder.cleanup)
+
+    def _write(self, name, content):
+        file_name = os.path.join(self._folder.name, name)
+        with open(file_name, "w") as file:
+            file.write(content)
+        return file_name
+
+    def test_source_without_directives_is_unchanged(self):
+        program = "PROGRAM plain; { a comment }\nBEGIN\nEND.\n"
+        source = Preprocessor().process(program)
+        self.assertEqual(program, source.text)
+        self.assertEqual([], source.errors)
+        self.assertEqual((None, 3), source.line_map.locate(3))
+
+    def test_include_is_expanded_and_mapped(self):
+        include = self._write("defs.inc", "CONST\n  C1 = 1;\n")
+        main = self._write("main.pas", "PROGRAM inc;\n{$I defs.inc}\nBEGIN\nEND.\n")
+        source = Preprocessor().process("PROGRAM inc;\n{$I defs.inc}\nBEGIN\nEND.\n", main)
+        self.assertEqual("PROGRAM inc;\nCONST\n  C1 = 1;\n\nBEGIN\nEND.\n", source.text)
+        self.assertEqual((main, 1), source.line_map.locate(1))
+        self.assertEqual((os.path.abspath(include), 2), source.line_map.locate(3))
+        self.assertEqual((main, 3), source.line_map.locate(5))
+
+    def test_conditionals_keep_line_numbers(self):
+        program = "{$DEFINE A}\n{$IFDEF A}\nyes\n{$ELSE}\nno\n{$ENDIF}\n{$IFNDEF A}\nnot\n{$ENDIF}\nend"
+        source = Preprocessor().process(program)
+        self.assertEqual(program.count("\n"), source.text.count("\n"))
+        self.assertEqual(["yes", "end"], source.text.split())
+        self.assertEqual(["no", "not", "end"], Preprocessor().process(program.replace("{$DEFINE A}", "")).text.split())
+        self.assertEqual(["yes", "end"], Preprocessor(defines=["a"]).process(program.replace("{$DEFINE A}", "")).text.split())
+        self.assertEqual(["no", "not", "end"], Preprocessor().process(program.replace("{$DEFINE A}", "{$DEFINE A}{$UNDEF A}")).text.split())
+
+    def test_directives_in_comments_and_strings_are_ignored(self):
+        program = "(* {$I missing.inc} *) '{$DEFINE A}' {$I+} {$IFDEF A}x{$ENDIF}"
+        source = Preprocessor().process(program)
+        self.assertEqual([], source.errors)
+        self.assertEqual("(* {$I missing.inc} *) '{$DEFINE A}' {$I+} ", source.text)
+
+    def test_errors(self):
+        main = self._write("main.pas", "")
+        self._write("self.inc", "{$I self.inc}")
+        errors = Preprocessor().process("{$I nowhere.inc}\n{$ENDIF}\n{$I self.inc}\n{$IFDEF A}\n", main).errors
+        self.assertEqual(4, len(errors))
+        self.assertIn("line 1 in '{0}': include file 'nowhere.inc' not found".format(main), errors[0])
+        self.assertIn("line 2", errors[1])
+        self.assertIn("includes itself", errors[2])
+        self.assertIn("line 4", errors[3])
+
+    def test_unchanged_include_comes_from_the_cache(self):
+        self._write("inner.inc", "C2 = 2;\n")
+        self._write("outer.inc", "CONST C1 = 1;\n{$I inner.inc}")
+        main = self._write("main.pas", "")
+        preprocessor = Preprocessor()
+        first = preprocessor.process("{$I outer.inc}\n", main).text
+        self.assertEqual(first, preprocessor.process("{$I outer.inc}\n", main).text)
+        self.assertEqual((1, 2), (preprocessor.hits, preprocessor.misses))
+
+        # a change to a nested include invalidates the includes around it
+        self._write("inner.inc", "C2 = 22;\n")
+        os.utime(os.path.join(self._folder.name, "inner.inc"), ns=(0, 0))
+        self.assertIn("C2 = 22;", preprocessor.process("{$I outer.inc}\n", main).text)
+        self.assertEqual((1, 4), (preprocessor.hits, preprocessor.misses))
+
+        # the expansion depends on the symbols defined when the include is entered
+        preprocessor.process("{$DEFINE X}{$I outer.inc}\n", main)
+        self.assertEqual((1, 6), (preprocessor.hits, preprocessor.misses))
+
+    def test_syntax_error_points_at_the_include(self):
+        include = self._write("body.inc", "BEGIN\n  v1 := ;\nEND.\n")
+        main = self._write("main.pas", "")
+        parser = DeftPascalParser(preprocessor=Preprocessor())
+        ast, error_list = parser.parse_tree("PROGRAM inc;\nVAR v1 : INTEGER;\n{$I body.inc}", main)
+        self.assertIsNone(ast)
+        self.assertEqual(1, len(error_list))
+        self.assertTrue(error_list[0].startswith("syntax error at line 2 column 9 in '{0}'".format(os.path.abspath(include))))
+
+    def test_syntax_error_after_a_directive_over_several_lines(self):
+        main = self._write("main.pas", "")
+        program = "PROGRAM multi;\n{$DEFINE\n  DEBUG}\n{$IFDEF DEBUG\n  the symbol is defined}\nVAR v1 : INTEGER;\n{$ENDIF}\n" \
+                  "BEGIN\n  v1 := ;\nEND.\n"
+        source = Preprocessor().process(program, main)
+        self.assertEqual(program.count("\n"), source.text.count("\n"))
+        self.assertEqual((main, 9), source.line_map.locate(9))
+        parser = DeftPascalParser(preprocessor=Preprocessor())
+        ast, error_list = parser.parse_tree(program, main)
+        self.assertIsNone(ast)
+        self.assertTrue(error_list[0].startswith("syntax error at line 9 column 9 in '{0}'".format(main)))
+
+    def test_include_over_several_lines_is_mapped(self):
+        include = self._write("defs.inc", "CONST\n  C1 = 1;\n")
+        main = self._write("main.pas", "")
+        source = Preprocessor().process("PROGRAM inc;\n{$I\n  defs.inc}\nBEGIN\nEND.\n", main)
+        lines = source.text.split("\n")
+        self.assertEqual((os.path.abspath(include), 2), source.line_map.locate(lines.index("  C1 = 1;") + 1))
+        self.assertEqual((main, 4), source.line_map.locate(lines.index("BEGIN") + 1))
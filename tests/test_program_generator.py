@@ -0,0 +1,46 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+from unittest import TestCase
+
+from utils.program_generator import ProgramGenerator
+from components.deft_pascal_parser_3 import DeftPascalParser
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TestProgramGenerator(TestCase):
+
+    def test_generated_programs_parse(self):
+        parser = DeftPascalParser()
+        for depth in [1, 2, 4]:
+            for expression_length in [1, 3]:
+                for seed in range(3):
+                    program = ProgramGenerator(depth, expression_length, seed=seed).generate(40)
+                    ast, error_list = parser.parse_tree(program)
+                    self.assertEqual([], error_list, program)
+
+    def test_size(self):
+        program = ProgramGenerator(seed=1).generate(500)
+        self.assertGreaterEqual(program.count("\n"), 500)
+        self.assertLess(program.count("\n"), 600)
+
+    def test_same_seed_gives_same_program(self):
+        self.assertEqual(ProgramGenerator(seed=7).generate(50), ProgramGenerator(seed=7).generate(50))
+        self.assertNotEqual(ProgramGenerator(seed=7).generate(50), ProgramGenerator(seed=8).generate(50))
+
+    def test_depth_one_is_flat(self):
+        program = ProgramGenerator(depth=1, seed=3).generate(200)
+        self.assertEqual(1, program.count("BEGIN"))
+        for keyword in ["IF", "WHILE", "FOR", "REPEAT"]:
+            self.assertNotIn(keyword + " ", program)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            ProgramGenerator(depth=0)
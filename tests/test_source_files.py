@@ -0,0 +1,57 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+from unittest import TestCase
+
+from components.source_files import ArtefactWriter, read_source
+
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+class TestSourceFiles(TestCase):
+
+    def test_read_source(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "program.pas")
+            with open(file_name, "wb") as file:
+                file.write(b"PROGRAM p;\r\nBEGIN\r\nEND.\r\n")
+            self.assertEqual("PROGRAM p;\nBEGIN\nEND.\n", read_source(file_name, "utf-8"))
+
+    def test_read_empty_source(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "empty.pas")
+            open(file_name, "w").close()
+            self.assertEqual("", read_source(file_name))
+
+    def test_write_artefacts(self):
+        with tempfile.TemporaryDirectory() as directory:
+            writer = ArtefactWriter(os.path.join(directory, "program.pas"))
+            file_name = writer.write("int main() {}", "c")
+            self.assertEqual(os.path.join(directory, "program.c"), file_name)
+            with open(file_name) as file:
+                self.assertEqual("int main() {}", file.read())
+            self.assertEqual({}, writer.contents)
+
+    def test_existing_artefact_is_kept_without_overwrite(self):
+        with tempfile.TemporaryDirectory() as directory:
+            writer = ArtefactWriter(os.path.join(directory, "program.pas"), overwrite=False)
+            with open(writer.file_name("ic"), "w") as file:
+                file.write("previous")
+            writer.write("new", "ic")
+            with open(writer.file_name("ic")) as file:
+                self.assertEqual("previous", file.read())
+
+    def test_in_memory_artefacts_are_not_written(self):
+        with tempfile.TemporaryDirectory() as directory:
+            writer = ArtefactWriter(os.path.join(directory, "program.pas"), output_path=directory, in_memory=True)
+            writer.write("program\n", "ast")
+            self.assertEqual({"ast": "program\n"}, writer.contents)
+            self.assertEqual([], os.listdir(directory))
@@ -8,7 +8,8 @@ HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
 from unittest import TestCase
 
 from components.symbols.base_symbols import BaseSymbol
-from components.symbol_table import SymbolTable
+from components.symbol_table import SymbolTable, intern_identifier
+from components import symbol_table
 
 import logging
 
@@ -166,3 +167,66 @@ class TestSymbolTable(TestCase):
             table.decrease_level()
             self.assertIsInstance(cm.exception, ValueError)
 
+
+    def test_inner_declaration_hides_outer_one_until_its_level_ends(self):
+        outer = BaseSymbol('new_symbol', 'any_type', 'outer')
+        inner = BaseSymbol('new_symbol', 'any_type', 'inner')
+        table = SymbolTable()
+        table.increase_level("level_1")
+        table.append(outer)
+        for i in range(2, 33):
+            table.increase_level("level_{0}".format(i))
+        self.assertIs(outer, table.retrieve('new_symbol', equal_level_only=False))
+        table.append(inner)
+        self.assertIs(inner, table.retrieve('new_symbol', equal_level_only=False))
+        self.assertIs(inner, table.get('new_symbol'))
+        table.decrease_level()
+        self.assertIs(outer, table.retrieve('new_symbol', equal_level_only=False))
+        self.assertIsNone(table.retrieve('new_symbol', equal_level_only=True))
+        while table.current_level > 1:
+            table.decrease_level()
+        self.assertIs(outer, table.retrieve('new_symbol', equal_level_only=True))
+
+    def test_remove_replace_and_purge_are_seen_through_all_levels(self):
+        symbol_1 = BaseSymbol('new_symbol_1', 'any_type', 'any_value')
+        symbol_2 = BaseSymbol('new_symbol_2', 'any_type', 'any_value')
+        replacement = BaseSymbol('new_symbol_1', 'any_type', 'other_value')
+        table = SymbolTable()
+        table.increase_level("level_1")
+        table.append(symbol_1)
+        table.increase_level("level_2")
+        table.append(BaseSymbol('new_symbol_1', 'any_type', 'any_value'))
+        table.append(symbol_2)
+        table.remove('new_symbol_1')
+        self.assertIs(symbol_1, table.retrieve('new_symbol_1', equal_level_only=False))
+        table.purge_all_from_current_scope()
+        self.assertFalse(table.contains('new_symbol_2', equal_level_only=False))
+        table.decrease_level()
+        table.replace('new_symbol_1', replacement)
+        self.assertIs(replacement, table.retrieve('new_symbol_1', equal_level_only=False))
+        self.assertEqual(['new_symbol_1'], table.instances_of(BaseSymbol))
+
+
+    def test_names_are_not_case_sensitive(self):
+        symbol = BaseSymbol('Counter', 'any_type', 'any_value')
+        table = SymbolTable()
+        table.increase_level("level_1")
+        table.append(symbol)
+        self.assertIs(symbol, table.retrieve('COUNTER'))
+        self.assertIs(symbol, table.get('counter', equal_level_only=False))
+        # the symbol keeps the spelling it was declared with
+        self.assertEqual('Counter', table.remove('cOUNTER').name)
+
+
+class TestInternIdentifier(TestCase):
+
+    def test_identifiers_are_case_folded(self):
+        key = intern_identifier("Counter")
+        self.assertEqual("counter", key)
+        self.assertIs(key, intern_identifier("COUNTER"))
+
+    def test_pool_is_bounded(self):
+        for i in range(symbol_table._IDENTIFIER_KEYS_LIMIT_ + 10):
+            intern_identifier("Name{0}".format(i))
+        self.assertLessEqual(len(symbol_table._IDENTIFIER_KEYS_), symbol_table._IDENTIFIER_KEYS_LIMIT_)
+        self.assertEqual("name1", intern_identifier("NAME1"))
@@ -0,0 +1,71 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+from unittest import TestCase
+
+from components.deft_pascal_parser_3 import DeftPascalParser, UnexpectedCharacters
+from components import deft_pascal_parser_3, token_stream
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import logging
+import mmap
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+class TestTokenStream(TestCase):
+
+    _PROGRAM = "PROGRAM stream;\n" \
+               "CONST C1 = &HFF; { a comment }\n" \
+               "VAR v1 : INTEGER;\n" \
+               "BEGIN\n" \
+               "  v1 := -C1 + 2 (* another one *)\n" \
+               "END.\n"
+
+    @staticmethod
+    def _attributes(tokens):
+        return [(t.type, t.value, t.line, t.column, t.start_pos, t.end_pos) for t in tokens]
+
+    def test_tokens_match_the_lark_lexer(self):
+        lark_tokens = DeftPascalParser._shared_parser().lex(self._PROGRAM)
+        self.assertEqual(self._attributes(lark_tokens), self._attributes(DeftPascalParser.tokenize(self._PROGRAM)))
+
+    def test_tokens_are_stored_in_arrays(self):
+        stream = DeftPascalParser.tokenize(self._PROGRAM)
+        self.assertEqual(len(stream), len(stream.types))
+        self.assertEqual(len(stream), len(stream.starts))
+        self.assertEqual(len(stream), len(stream.lengths))
+        self.assertEqual("RESERVED_STRUCTURE_PROGRAM", stream[0].type)
+        self.assertEqual(".", stream[-1].value)
+
+    def test_keywords_are_case_insensitive(self):
+        stream = DeftPascalParser.tokenize("begin End ending")
+        self.assertEqual(["RESERVED_STRUCTURE_BEGIN", "RESERVED_STRUCTURE_END", "IDENTIFIER"], [t.type for t in stream])
+
+    def test_memory_mapped_source(self):
+        with tempfile.TemporaryFile() as file:
+            file.write(self._PROGRAM.encode("utf-8"))
+            file.flush()
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as source:
+                stream = DeftPascalParser.tokenize(source)
+                self.assertEqual(self._attributes(DeftPascalParser.tokenize(self._PROGRAM)), self._attributes(stream))
+                del stream
+
+    def test_unexpected_character(self):
+        with self.assertRaises(UnexpectedCharacters) as cm:
+            DeftPascalParser.tokenize("PROGRAM stream;\nBEGIN ~ END.")
+        self.assertEqual((2, 7), (cm.exception.line, cm.exception.column))
+
+    def test_lexer_is_built_once(self):
+        with mock.patch.object(deft_pascal_parser_3, "_STREAM_LEXER_", None), \
+                mock.patch.object(token_stream, "StreamLexer", wraps=token_stream.StreamLexer) as stream_lexer:
+            with ThreadPoolExecutor(4) as executor:
+                streams = list(executor.map(DeftPascalParser.tokenize, [self._PROGRAM] * 8))
+        self.assertEqual(1, stream_lexer.call_count)
+        self.assertTrue(all(self._attributes(i) == self._attributes(streams[0]) for i in streams))
@@ -7,7 +7,7 @@ HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
 
 from unittest.case import TestCase
 
-from components.symbols.type_symbols import PointerType, CustomType, BasicType, StringType
+from components.symbols.type_symbols import PointerType, CustomType, BasicType, StringType, RESERVED_TYPES, string_type
 
 
 class TestPointerType(TestCase):
@@ -112,3 +112,25 @@ class TestStringType(TestCase):
         symbol.dimension = 1
         self.assertEqual(1, symbol.dimension)
 
+    def test_string_type(self):
+        symbol = string_type(20)
+        self.assertEqual(StringType.reserved_type_string().name, symbol.name)
+        self.assertEqual(20, symbol.dimension)
+        self.assertIs(symbol, string_type("20"))
+        self.assertIsNot(symbol, string_type(80))
+        with self.assertRaises(AttributeError):
+            symbol.dimension = 1
+
+
+class TestReservedTypes(TestCase):
+
+    def test_index(self):
+        self.assertEqual(list(range(10)), [i.index for i in RESERVED_TYPES])
+        self.assertEqual(StringType.reserved_type_string(), RESERVED_TYPES[4])
+        self.assertEqual(PointerType.reserved_type_pointer(), RESERVED_TYPES[6])
+
+    def test_frozen(self):
+        for symbol in RESERVED_TYPES:
+            for attribute in ("name", "type", "value", "index"):
+                with self.assertRaises(AttributeError):
+                    setattr(symbol, attribute, None)
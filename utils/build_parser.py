@@ -0,0 +1,58 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+# Build step for the parser.
+# Pre-generates the LALR parse tables for DeftPascalParser so the compiler does not need to analyse the grammar on start.
+# With -standalone it also generates a parser module that does not depend on lark at all.
+# Run it from the project root after any change to the grammar or to the lark version:
+#     python -m utils.build_parser [-standalone]
+
+from components.deft_pascal_parser_3 import DeftPascalParser, _PREBUILT_TABLES_PATH_
+
+import argparse
+import os
+import sys
+
+_STANDALONE_FILE_ = os.path.join(os.path.dirname(_PREBUILT_TABLES_PATH_), "deft_pascal_standalone.py")
+
+
+def build_parse_tables(output_path=_PREBUILT_TABLES_PATH_):
+    file_name = DeftPascalParser.save_tables(output_path)
+    if file_name:
+        print("parse tables saved to {0}".format(file_name))
+    else:
+        print("parse tables could not be saved to {0}".format(output_path))
+    return file_name
+
+
+def build_standalone_parser(output_file=_STANDALONE_FILE_):
+    """
+    generates a standalone python module from the grammar in DeftPascalParser.
+    the grammar hash is recorded in the module so DeftPascalParser can discard it once the grammar changes.
+    """
+    from lark.tools.standalone import gen_standalone
+    temp_file = output_file + ".tmp"
+    with open(temp_file, "w") as file:
+        gen_standalone(DeftPascalParser._compile_grammar(), out=file, compress=True)
+        file.write('\nGRAMMAR_HASH = "{0}"\n'.format(DeftPascalParser.grammar_hash()))
+    os.replace(temp_file, output_file)
+    print("standalone parser saved to {0}".format(output_file))
+    return output_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pre-generate the Deft Pascal parser artefacts")
+    parser.add_argument("-output_path", default=_PREBUILT_TABLES_PATH_, help="folder where the parse tables are saved")
+    parser.add_argument("-standalone", action="store_true", help="also generate the standalone parser module")
+    arguments = parser.parse_args()
+    if arguments.standalone:
+        build_standalone_parser()
+    return 0 if build_parse_tables(arguments.output_path) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
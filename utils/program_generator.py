@@ -0,0 +1,218 @@
+"""
+PROJECT.......: Deft Pascal Reborn
+COPYRIGHT.....: Copyright (C) 2020- Andre L Ballista
+DESCRIPTION...: Pascal compiler for TRS80 color computer based on the original Deft Pascal compiler
+HOME PAGE.....: https://github.com/brnomade/deft_pascal_reborn
+"""
+
+# Random program generator driven by the grammar of DeftPascalParser.
+# Programs are derived from the grammar rules themselves, so they are syntactically valid but mean nothing.
+#     python -m utils.program_generator [lines] [depth] [expression_length] [seed]
+
+from components.deft_pascal_parser_3 import DeftPascalParser
+
+import random
+import sys
+
+# terminals defined by a regular expression need sample values. terminals defined by a string are written as is.
+_SAMPLES_ = {"IDENTIFIER": ["v{0}".format(i) for i in range(32)],
+             "CHARACTER": ["'a'", "'Z'", "'0'", "' '"],
+             "STRING_VALUE": ["'hello'", "'deft pascal'", "'A1'"],
+             "UNSIGNED_DECIMAL": ["0", "1", "7", "42", "255", "32767"],
+             "UNSIGNED_REAL": ["0.5", "3.14", "1.0E10", "2.5e-3"],
+             "NUMBER_HEXADECIMAL": ["&HFF", "&h1A", "$7FFF"],
+             "NUMBER_OCTAL": ["&O17", "&o777"],
+             "NUMBER_BINARY": ["&B101", "&b1"]}
+
+# a line break follows these terminals
+_LINE_ENDS_ = {"_SEMICOLON",
+               "RESERVED_STRUCTURE_BEGIN",
+               "RESERVED_STATEMENT_REPEAT",
+               "RESERVED_STATEMENT_THEN",
+               "RESERVED_STATEMENT_DO",
+               "RESERVED_STATEMENT_ELSE"}
+
+# the chains of operands of an expression. every other rule that refers to itself is a list when its name ends in
+# _list or _sequence, or else a prefix or suffix repeated now and then (signs, NOT, ** and ^)
+_EXPRESSION_RULES_ = {"_simple_expression", "_constant_simple_expression"}
+
+_START_RULE_ = "_program"
+
+# the statement sequence of the program body grows until the program has the requested lines
+_GROWTH_RULE_ = "_statement_sequence"
+
+
+class ProgramGenerator:
+    """
+    derives random programs from the grammar.
+    depth limits how many times a rule can be nested in itself, so depth 1 gives flat statements, expressions without
+    parentheses and no procedures. nesting is the probability of picking an alternative that can nest, such as a
+    compound statement or a parenthesised expression, when a flat one is allowed too. expression_length is the number
+    of terms of an expression and list_length the largest number of items of any other list.
+    empty alternatives are only used when nothing else is allowed.
+    """
+
+    def __init__(self, depth=3, expression_length=3, list_length=3, nesting=0.05, seed=None):
+        if depth < 1 or expression_length < 1 or list_length < 1:
+            raise ValueError("depth, expression_length and list_length must be at least 1")
+        self._depth = depth
+        self._expression_length = expression_length
+        self._list_length = list_length
+        self._nesting = nesting
+        self._random = random.Random(seed)
+        self._rules = {}
+        self._terminals = set()
+        self._load_grammar()
+        self._reach = self._reachable()
+        self._completable_cache = {}
+        self._choice_cache = {}
+        self._blocked_cache = {}
+        # for each rule: the alternatives that do not refer to the rule and the ones that do
+        self._alternatives = {}
+        for name, expansions in self._rules.items():
+            base = [e for e in expansions if name not in e]
+            recursive = [e for e in expansions if name in e]
+            self._alternatives[name] = (base, recursive)
+
+    def _load_grammar(self):
+        parser = DeftPascalParser._recovery_parser()
+        terminals = {t.name: t.pattern for t in parser.terminals}
+        for rule in parser.rules:
+            self._rules.setdefault(rule.origin.name, []).append(tuple(s.name for s in rule.expansion))
+            for symbol in rule.expansion:
+                if symbol.is_term:
+                    pattern = terminals[symbol.name]
+                    if pattern.type == "str":
+                        self._terminals.add(symbol.name)
+                    elif symbol.name not in _SAMPLES_:
+                        raise ValueError("no sample value for terminal {0}".format(symbol.name))
+        self._patterns = {name: pattern.value for name, pattern in terminals.items()}
+
+    def _reachable(self):
+        """
+        returns for each rule the rules it can eventually expand into.
+        """
+        reach = {name: {s for e in expansions for s in e if s in self._rules} for name, expansions in self._rules.items()}
+        changed = True
+        while changed:
+            changed = False
+            for name, names in reach.items():
+                extended = names.union(*[reach[n] for n in names])
+                if extended != names:
+                    reach[name] = extended
+                    changed = True
+        return reach
+
+    def _completable(self, blocked):
+        """
+        returns the rules that can be derived without going through any of the blocked rules.
+        """
+        result = self._completable_cache.get(blocked)
+        if result is None:
+            result = set()
+            changed = True
+            while changed:
+                changed = False
+                for name, expansions in self._rules.items():
+                    if name not in result and name not in blocked and \
+                            any(all(s in result or s not in self._rules for s in e) for e in expansions):
+                        result.add(name)
+                        changed = True
+            self._completable_cache[blocked] = result
+        return result
+
+    def generate(self, lines=100):
+        """
+        returns the text of a program with at least the given number of lines.
+        """
+        self._lines = 0
+        self._target = lines
+        self._ancestors = {}
+        self._blocked = frozenset()
+        self._tokens = []
+        self._derive(_START_RULE_)
+        return " ".join(self._tokens).replace("\n ", "\n") + "\n"
+
+    def _repetitions(self, name):
+        if name == _GROWTH_RULE_ and self._ancestors.get("_block") == 1 and self._ancestors[name] == 1:
+            return None
+        if name in _EXPRESSION_RULES_:
+            return self._expression_length - 1
+        if name.endswith("_list") or name.endswith("_sequence"):
+            return self._random.randint(0, self._list_length - 1)
+        return 1 if self._random.random() < 0.1 else 0
+
+    def _choose(self, name, expansions):
+        key = (name, self._blocked)
+        choices = self._choice_cache.get(key)
+        if choices is None:
+            # rules already nested depth times are blocked, and so is any alternative that cannot avoid them.
+            # an alternative nests when it can lead back to its own rule
+            completable = self._completable(self._blocked)
+            allowed = [e for e in expansions if all(s in completable or s not in self._rules for s in e)]
+            allowed = [e for e in allowed if e] or allowed
+            nested = [e for e in allowed if any(s == name or name in self._reach.get(s, ()) for s in e)]
+            flat = [e for e in allowed if e not in nested]
+            choices = self._choice_cache[key] = (flat, nested)
+        flat, nested = choices
+        if nested and (not flat or self._random.random() < self._nesting):
+            return self._random.choice(nested)
+        return self._random.choice(flat)
+
+    def _derive(self, name):
+        if name not in self._rules:
+            self._emit(name)
+            return
+        count = self._ancestors[name] = self._ancestors.get(name, 0) + 1
+        if count == self._depth:
+            outer_blocked = self._blocked
+            self._blocked = self._blocked_cache.get((outer_blocked, name))
+            if self._blocked is None:
+                self._blocked = self._blocked_cache[(outer_blocked, name)] = outer_blocked.union([name])
+        base, recursive = self._alternatives[name]
+        # a rule referring to itself is expanded as its base alternative with the recursive part repeated
+        repetitions = self._repetitions(name) if recursive and base else 0
+        expansion = self._choose(name, base or recursive)
+        if repetitions == 0:
+            for symbol in expansion:
+                self._derive(symbol)
+        else:
+            step = self._random.choice(recursive)
+            position = step.index(name)
+            prefix, suffix = step[:position], step[position + 1:]
+            for symbol in prefix * (repetitions or 0):
+                self._derive(symbol)
+            for symbol in expansion:
+                self._derive(symbol)
+            done = 0
+            while (repetitions is None and self._lines < self._target) or done < (repetitions or 0):
+                for symbol in suffix:
+                    self._derive(symbol)
+                done += 1
+        if count == self._depth:
+            self._blocked = outer_blocked
+        self._ancestors[name] -= 1
+
+    def _emit(self, terminal):
+        if terminal in self._terminals:
+            value = self._patterns[terminal].upper()
+        else:
+            value = self._random.choice(_SAMPLES_[terminal])
+        if terminal == "RESERVED_STRUCTURE_END":
+            self._new_line()
+        self._tokens.append(value)
+        if terminal in _LINE_ENDS_:
+            self._new_line()
+
+    def _new_line(self):
+        if self._tokens and self._tokens[-1] != "\n":
+            self._tokens.append("\n")
+            self._lines += 1
+
+
+def main(lines=100, depth=3, expression_length=3, seed=None):
+    print(ProgramGenerator(depth, expression_length, seed=seed).generate(lines), end="")
+
+
+if __name__ == "__main__":
+    main(*[int(i) for i in sys.argv[1:5]])